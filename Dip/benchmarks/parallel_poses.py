@@ -0,0 +1,87 @@
+"""
+Pose throughput of one video against the number of worker processes.
+
+    python benchmarks/parallel_poses.py --video input_videos/video.mp4 --processes 1 2 4
+    python benchmarks/parallel_poses.py --simulate-ms 25 25 --processes 1 2 4
+
+Prints frames per second and the speedup over one worker for each process count. With
+--simulate-ms, no model is loaded: a generated clip goes through an estimator that keeps a
+core busy for the given detector and pose times per frame, which shows how the pipeline
+itself scales on the machine.
+"""
+import argparse
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from dip_validator.cli import load_config
+from dip_validator.parallel import run_parallel_poses
+from dip_validator.pose import PoseEstimator, PoseResult
+
+class BusyEstimator(PoseEstimator):
+    """Spends fixed CPU time per detection and per pose, with one person filling the frame."""
+    def __init__(self, det_s: float, pose_s: float):
+        self.det_s = det_s
+        self.pose_s = pose_s
+
+    @staticmethod
+    def spin(seconds: float):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def detect_people(self, frame):
+        self.spin(self.det_s)
+        return np.array([[0.0, 0.0, float(frame.shape[1]), float(frame.shape[0])]])
+
+    def estimate_crop(self, frame, bbox, conf_threshold):
+        self.spin(self.pose_s)
+        return PoseResult(keypoints=np.zeros((17, 2), dtype=np.float32),
+                          confidences=np.full(17, 0.9, dtype=np.float32), bbox=bbox)
+
+# Module-level so that spawned workers can unpickle it
+def busy_factory(config):
+    det_ms, pose_ms = config['benchmark']['simulate_ms']
+    return BusyEstimator(det_ms / 1000, pose_ms / 1000)
+
+def write_clip(path: str, num_frames: int):
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (640, 360))
+    for i in range(num_frames):
+        out.write(np.full((360, 640, 3), (i * 7) % 255, dtype=np.uint8))
+    out.release()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--video", default=None, help="Video to run the configured models on")
+    parser.add_argument("--config", default="configs/default.yaml", help="Path to config file")
+    parser.add_argument("--simulate-ms", type=float, nargs=2, metavar=("DETECT", "POSE"), default=None,
+                        help="No models: busy detector and pose times per frame, in ms")
+    parser.add_argument("--frames", type=int, default=300, help="Length of the generated clip (--simulate-ms)")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="Worker counts")
+    args = parser.parse_args()
+    if (args.video is None) == (args.simulate_ms is None):
+        parser.error("give exactly one of --video and --simulate-ms")
+
+    config = load_config(args.config)
+    kwargs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if args.simulate_ms is not None:
+            video = os.path.join(tmp, "clip.mp4")
+            write_clip(video, args.frames)
+            config['benchmark'] = {"simulate_ms": args.simulate_ms}
+            kwargs['estimator_factory'] = busy_factory
+
+        print(f"{'processes':>10}{'frames':>10}{'wall s':>10}{'fps':>10}{'speedup':>10}  bottleneck")
+        base_fps = None
+        for processes in args.processes:
+            result = run_parallel_poses(video, config, processes, **kwargs)
+            # Model loading in the workers is included in the wall time
+            fps = result.stats['fps']
+            base_fps = base_fps or fps
+            print(f"{processes:>10}{len(result.poses):>10}{result.stats['wall_s']:>10.2f}{fps:>10.1f}"
+                  f"{fps / base_fps:>10.2f}  {result.stats['bottleneck']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cost of each post-pose stage against clip length, on synthetic dips.
+
+    python benchmarks/post_pose.py --frames 10000 100000 1000000
+
+Prints, per stage and clip length, the time per frame and the peak memory traced
+while the stage runs. Flat columns mean linear time and memory.
+"""
+import argparse
+import time
+import tracemalloc
+from dip_validator.synthetic import synthetic_dip
+from dip_validator.phases import compute_depth_signal, smooth_signal, detect_bottom_frame, segment_phases
+from dip_validator.refinement import refine_landmarks, smooth_landmarks_temporal
+from dip_validator.rules import evaluate_dip
+
+def run_stages(clip, trace_memory: bool):
+    results = {}
+
+    def measure(name, fn):
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if trace_memory:
+            tracemalloc.stop()
+        results[name] = (elapsed, peak)
+        return value
+
+    poses = measure("arrays_to_poses", clip.poses)
+    depth = measure("compute_depth_signal", lambda: compute_depth_signal(poses))
+    smoothed = measure("smooth_signal", lambda: smooth_signal(depth))
+    bottom = detect_bottom_frame(smoothed)
+    measure("segment_phases", lambda: segment_phases(smoothed, bottom))
+    raw_l = measure("refine_landmarks", lambda: [refine_landmarks(p, "left") for p in poses])
+    raw_r = [refine_landmarks(p, "right") for p in poses]
+    refined_l = measure("smooth_landmarks_temporal", lambda: smooth_landmarks_temporal(raw_l))
+    refined_r = smooth_landmarks_temporal(raw_r)
+    measure("evaluate_dip", lambda: evaluate_dip(refined_l, refined_r, bottom))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, nargs="+", default=[10000, 100000, 1000000], help="Clip lengths")
+    parser.add_argument("--noise-px", type=float, default=1.0, help="Keypoint noise")
+    parser.add_argument("--dropout", type=float, default=0.02, help="Fraction of frames without a pose")
+    parser.add_argument("--no-memory", action="store_true", help="Skip memory tracing (it slows Python code down)")
+    args = parser.parse_args()
+
+    print(f"{'stage':<28}{'frames':>10}{'total s':>10}{'us/frame':>10}{'peak MB':>10}{'B/frame':>10}")
+    for num_frames in args.frames:
+        clip = synthetic_dip(num_frames=num_frames, noise_px=args.noise_px, dropout=args.dropout)
+        for name, (elapsed, peak) in run_stages(clip, not args.no_memory).items():
+            print(f"{name:<28}{num_frames:>10}{elapsed:>10.3f}{elapsed / num_frames * 1e6:>10.2f}"
+                  f"{peak / 1e6:>10.1f}{peak / num_frames:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Batch re-scoring throughput against the per-clip judge, on synthetic dips.
+
+    python benchmarks/rescore.py --clips 10000 --seconds 10
+
+Scores the clips with score_batch in batches of --batch-size (as `rescore` does) and a
+sample of them with the per-clip dip_depth judge, and prints the time for all clips and
+the clips per second of each.
+"""
+import argparse
+import os
+import time
+import numpy as np
+from dip_validator.batch import pad_clips, score_batch
+from dip_validator.cli import load_config
+from dip_validator.judges import AnalysisContext, DipDepthJudge
+from dip_validator.synthetic import synthetic_dip
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "configs", "default.yaml")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clips", type=int, default=10000, help="Number of clips")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of each clip")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Clips per score_batch call")
+    parser.add_argument("--per-clip-sample", type=int, default=200, help="Clips scored with the per-clip judge")
+    args = parser.parse_args()
+
+    config = load_config(CONFIG_PATH)
+    rng = np.random.default_rng(0)
+    clips = [synthetic_dip(num_frames=int(args.seconds * 30), depth_px=rng.uniform(-20, 30), noise_px=1.0,
+                           dropout=0.02, seed=i) for i in range(args.clips)]
+
+    start = time.perf_counter()
+    valid = 0
+    for i in range(0, len(clips), args.batch_size):
+        chunk = clips[i:i + args.batch_size]
+        keypoints, confidences, lengths = pad_clips([c.keypoints for c in chunk], [c.confidences for c in chunk])
+        valid += int(score_batch(keypoints, confidences, lengths, config, fps=[c.fps for c in chunk])["valid"].sum())
+    batch_s = time.perf_counter() - start
+
+    sample = clips[:args.per_clip_sample]
+    start = time.perf_counter()
+    judge = DipDepthJudge()
+    for clip in sample:
+        judge.evaluate(AnalysisContext(clip.poses(), clip.meta, config))
+    per_clip_s = (time.perf_counter() - start) / max(len(sample), 1)
+
+    print(f"{len(clips)} clips of {args.seconds:g} s, {valid} VALID")
+    print(f"{'method':<12}{'total s':>10}{'clips/s':>12}")
+    print(f"{'score_batch':<12}{batch_s:>10.2f}{len(clips) / batch_s:>12.0f}")
+    print(f"{'per clip':<12}{per_clip_s * len(clips):>10.2f}{1 / per_clip_s:>12.0f}  (from {len(sample)} clips)")
+
+if __name__ == "__main__":
+    main()
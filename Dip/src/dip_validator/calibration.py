@@ -0,0 +1,241 @@
+import argparse
+import copy
+import csv
+import glob
+import itertools
+import math
+import os
+import random
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
+from .pose import PoseResult, load_pose_cache
+from .phases import smooth_signal, detect_bottom_frame
+from .rules import evaluate_dip
+from .judges import AnalysisContext
+
+# Tunable parameters and the config section they live in
+PARAM_SECTIONS = {
+    "elbow_offset_ratio": "landmarks",
+    "deltoid_offset_ratio": "landmarks",
+    "ema_alpha": "landmarks",
+    "smoothing_window": "phases",
+    "smoothing_polyorder": "phases",
+    "bottom_window": "phases",
+    "min_confidence": "decision"
+}
+
+Clip = Tuple[str, List[Optional[PoseResult]], Dict[str, Any]]
+
+def load_ground_truth(csv_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads referee verdicts from a CSV with columns `video`, `result` (VALID/INVALID)
+    and optionally `margin_px`. Videos are matched by basename without extension.
+    """
+    truth = {}
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            name = os.path.splitext(os.path.basename(row['video']))[0]
+            margin = row.get('margin_px')
+            truth[name] = {
+                "valid": row['result'].strip().upper() == "VALID",
+                "margin_px": float(margin) if margin not in (None, "") else None
+            }
+    return truth
+
+def load_clips(poses_dir: str, names: Optional[List[str]] = None) -> List[Clip]:
+    """Loads cached poses from <poses_dir>/<video>/keypoints.npz (written by the CLI)."""
+    clips = []
+    for path in sorted(glob.glob(os.path.join(poses_dir, "*", "keypoints.npz"))):
+        name = os.path.basename(os.path.dirname(path))
+        if names is None or name in names:
+            poses, meta = load_pose_cache(path)
+            clips.append((name, poses, meta))
+    return clips
+
+def parameter_grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Full cartesian product of the listed values."""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+def random_parameter_sets(space: Dict[str, Any], samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Random search: list values are sampled uniformly, `{min, max}` ranges are sampled
+    uniformly (as integers when both bounds are integers).
+    """
+    rng = random.Random(seed)
+    param_sets = []
+    for _ in range(samples):
+        params = {}
+        for key, values in space.items():
+            if isinstance(values, dict):
+                lo, hi = values['min'], values['max']
+                params[key] = rng.randint(lo, hi) if isinstance(lo, int) and isinstance(hi, int) else rng.uniform(lo, hi)
+            else:
+                params[key] = rng.choice(values)
+        param_sets.append(params)
+    return param_sets
+
+def apply_params(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a copy of the config with parameters set. Keys are bare names or `section.name`."""
+    config = copy.deepcopy(config)
+    for key, value in params.items():
+        section, _, name = key.rpartition(".")
+        section = section or PARAM_SECTIONS.get(name)
+        if section is None:
+            raise ValueError(f"Unknown parameter: {key}")
+        config.setdefault(section, {})[name] = value
+    return config
+
+def _landmark_key(params: Dict[str, Any]) -> Tuple:
+    return tuple(sorted((k, v) for k, v in params.items() if PARAM_SECTIONS.get(k.rpartition(".")[2]) == "landmarks"))
+
+def calibration_tasks(param_sets: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """
+    Splits parameter sets into pool tasks: sets are grouped by landmark parameters (each
+    task refines its clips once), and groups are cut into chunks so that about `workers`
+    tasks exist even when a sweep has a single group.
+    """
+    groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for params in param_sets:
+        groups.setdefault(_landmark_key(params), []).append(params)
+    chunk = max(1, math.ceil(len(param_sets) / max(1, workers)))
+    return [group[i:i + chunk] for group in groups.values() for i in range(0, len(group), chunk)]
+
+# Per-process state, set once by the pool initializer so clips are not pickled per task
+_WORKER: Dict[str, Any] = {}
+
+def _init_worker(clips: List[Clip], config: Dict[str, Any], truth: Dict[str, Dict[str, Any]]):
+    _WORKER.update(clips=clips, config=config, truth=truth)
+
+def _score(decisions: Dict[str, Any], truth: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    correct, false_valid, false_invalid, margin_errors = 0, 0, 0, []
+    for name, decision in decisions.items():
+        expected = truth[name]
+        if decision.valid == expected['valid']:
+            correct += 1
+        elif decision.valid:
+            false_valid += 1
+        else:
+            false_invalid += 1
+        if expected['margin_px'] is not None:
+            margin = decision.deciding_margin_px
+            margin_errors.append(abs(margin - expected['margin_px']))
+    n = len(decisions)
+    return {
+        "accuracy": correct / n if n else 0.0,
+        "false_valid": false_valid,
+        "false_invalid": false_invalid,
+        "margin_mae_px": float(np.mean(margin_errors)) if margin_errors else None,
+        "clips": n
+    }
+
+def evaluate_parameter_group(param_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Scores parameter sets that share the same landmark parameters.
+
+    Refinement (the expensive stage) runs once per clip for the whole group; only
+    smoothing, bottom detection and the decision are repeated per parameter set.
+    """
+    clips, base_config, truth = _WORKER['clips'], _WORKER['config'], _WORKER['truth']
+    decisions = [dict() for _ in param_sets]
+    configs = [apply_params(base_config, params) for params in param_sets]
+
+    for name, poses, meta in clips:
+        context = AnalysisContext(poses, meta, configs[0])
+        left_refined, right_refined = context.signal("refined_landmarks")
+        depth = context.signal("depth_signal")
+        for decided, config in zip(decisions, configs):
+            smoothed = smooth_signal(depth, window=config['phases']['smoothing_window'],
+                                     polyorder=config['phases']['smoothing_polyorder'])
+            decided[name] = evaluate_dip(
+                left_refined, right_refined, detect_bottom_frame(smoothed),
+                window_half_size=config['phases']['bottom_window'],
+                min_confidence=config['decision']['min_confidence'],
+                interpolate=config['decision'].get('subframe_interpolation', True)
+            )
+
+    return [{"params": params, **_score(decided, truth)} for params, decided in zip(param_sets, decisions)]
+
+def run_calibration(
+    clips: List[Clip],
+    truth: Dict[str, Dict[str, Any]],
+    config: Dict[str, Any],
+    param_sets: List[Dict[str, Any]],
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Evaluates every parameter set against the ground truth across a process pool.
+
+    Returns:
+        Results sorted by accuracy (descending), then margin error (ascending).
+    """
+    clips = [clip for clip in clips if clip[0] in truth]
+
+    if workers == 1:
+        _init_worker(clips, config, truth)
+        results = [r for task in calibration_tasks(param_sets, 1) for r in evaluate_parameter_group(task)]
+    else:
+        tasks = calibration_tasks(param_sets, workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(clips, config, truth)) as pool:
+            results = [r for task_results in pool.map(evaluate_parameter_group, tasks) for r in task_results]
+
+    results.sort(key=lambda r: (-r['accuracy'], r['margin_mae_px'] if r['margin_mae_px'] is not None else float('inf')))
+    return results
+
+def write_results(results: List[Dict[str, Any]], path: str) -> str:
+    keys = sorted({k for r in results for k in r['params']})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(keys + ["accuracy", "false_valid", "false_invalid", "margin_mae_px", "clips"])
+        for r in results:
+            writer.writerow([r['params'].get(k) for k in keys] +
+                            [round(r['accuracy'], 4), r['false_valid'], r['false_invalid'],
+                             None if r['margin_mae_px'] is None else round(r['margin_mae_px'], 3), r['clips']])
+    return path
+
+def main(argv: Optional[List[str]] = None):
+    from .cli import load_config
+
+    parser = argparse.ArgumentParser(prog="dip_validator calibrate", description="Parameter sweep over cached poses")
+    parser.add_argument("--poses-dir", default="output", help="Directory with <video>/keypoints.npz")
+    parser.add_argument("--truth", required=True, help="CSV with video,result[,margin_px]")
+    parser.add_argument("--space", required=True, help="YAML mapping parameter -> list of values or {min, max}")
+    parser.add_argument("--config", default="configs/default.yaml", help="Base config")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid", help="Search strategy")
+    parser.add_argument("--samples", type=int, default=100, help="Parameter sets for random search")
+    parser.add_argument("--seed", type=int, default=0, help="Random search seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", default="calibration.csv", help="Results CSV")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        space = load_config(args.space)
+        truth = load_ground_truth(args.truth)
+        clips = load_clips(args.poses_dir, names=list(truth))
+        if not clips:
+            raise ValueError(f"No cached poses in {args.poses_dir} match {args.truth}")
+
+        if args.search == "grid":
+            param_sets = parameter_grid(space)
+        else:
+            param_sets = random_parameter_sets(space, args.samples, seed=args.seed)
+
+        print(f"Calibrating {len(param_sets)} parameter sets on {len(clips)} clips...")
+        start = time.perf_counter()
+        results = run_calibration(clips, truth, config, param_sets, workers=args.workers)
+        print(f"Done in {time.perf_counter() - start:.1f}s")
+
+        for r in results[:10]:
+            mae = "n/a" if r['margin_mae_px'] is None else f"{r['margin_mae_px']:.2f}px"
+            print(f"accuracy={r['accuracy']:.3f} margin_mae={mae} {r['params']}")
+        print(f"Results saved: {write_results(results, args.out)}")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,21 +1,107 @@
 import argparse
+import importlib
 import sys
 import os
+import time
 import cv2
 import yaml
 import numpy as np
-from typing import List, Optional, Dict, Any
-from dip_validator.video_io import load_video, save_video
-from dip_validator.pose import PoseEstimator, PoseResult
-from dip_validator.phases import compute_depth_signal, smooth_signal, detect_bottom_frame, segment_phases
-from dip_validator.refinement import refine_landmarks, smooth_landmarks_temporal, RefinedLandmarks
-from dip_validator.rules import evaluate_dip, DipDecision
-from dip_validator.reporting import generate_report
+from typing import List, Optional, Dict, Any, Tuple, Callable
+from dip_validator.video_io import load_video, save_video, probe_video
+from dip_validator.pose import (PoseEstimator, PoseResult, MODEL_MODES, save_pose_cache, load_pose_cache,
+                                scale_pose, interpolate_poses)
+from dip_validator.refinement import RefinedLandmarks
+from dip_validator.rules import DipDecision, IncrementalDipEvaluator
+from dip_validator.reporting import generate_report, write_report, save_trace_columns, ResultsStore
+from dip_validator.judges import AnalysisContext, load_judges, run_judges, judges_report
+from dip_validator.overlay import SpriteCache, PHASE_COLORS
+from dip_validator.scheduler import QualityScheduler, QualityPlan, apply_plan
+from dip_validator.pipeline import run_pose_pipeline
+from dip_validator.parallel import run_parallel_poses
+from dip_validator.manifest import Manifest, stage_key
+from dip_validator.motion import MotionGate, create_motion_gate
+
+# Subcommands: `python -m dip_validator <command> ...` -> "module[:function]" (default
+# function: main); anything else is analysed as a video
+COMMANDS = {
+    "calibrate": "dip_validator.calibration",
+    "review": "dip_validator.review",
+    "multiview": "dip_validator.multiview",
+    "submit": "dip_validator.jobqueue:submit_main",
+    "worker": "dip_validator.jobqueue",
+    "query": "dip_validator.query",
+    "rescore": "dip_validator.batch"
+}
 
 def load_config(config_path: str) -> Dict[str, Any]:
     with open(config_path, 'r') as f:
         return yaml.safe_load(f)
 
+def estimate_video_poses(
+    frames: List[np.ndarray],
+    estimator: PoseEstimator,
+    conf_thresh: float,
+    evaluator: Optional[IncrementalDipEvaluator] = None,
+    settle_params: Optional[Dict[str, Any]] = None,
+    stride: int = 1,
+    scale: float = 1.0,
+    gate: Optional[MotionGate] = None
+) -> Tuple[List[Optional[PoseResult]], Optional[int]]:
+    """
+    Runs pose estimation frame by frame.
+    
+    If an evaluator is given, inference stops as soon as the VALID verdict is settled
+    (see IncrementalDipEvaluator.is_settled) and the remaining frames are left as None.
+    
+    With stride > 1 only every stride-th frame (and the last) goes through the model and
+    the frames in between are interpolated; evaluator must then be None. With scale < 1
+    frames are downscaled before inference and the results mapped back. With a motion
+    gate (instead of a stride, without an evaluator), frames without motion are skipped
+    and completed by MotionGate.finish.
+    
+    Returns:
+        Tuple of per-frame results and the early-exit frame index (None if all frames were analysed).
+    """
+    def estimate(frame):
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return scale_pose(estimator.estimate_poses([frame], conf_threshold=conf_thresh)[0], 1.0 / scale)
+
+    def refill(i, nearest):
+        # Out-of-order frame: track the lifter from the nearest estimated frame
+        estimator.reset(boxes[nearest])
+        result = estimate(frames[i])
+        boxes[i] = estimator.prev_bbox
+        return result
+
+    num_frames = len(frames)
+    results = []
+    skipped = []
+    boxes = [None] * num_frames  # Tracked lifter box after each estimated frame
+    for i, frame in enumerate(frames):
+        if gate is not None:
+            skipped.append(gate.update(frame))
+        else:
+            skipped.append(stride > 1 and i % stride != 0 and i != num_frames - 1)
+        if skipped[-1]:
+            results.append(None)
+            continue
+        results.append(estimate(frame))
+        if gate is not None:
+            boxes[i] = estimator.prev_bbox
+        if (i + 1) % 20 == 0 or (i + 1) == num_frames:
+            print(f"\rPose estimation: {(i + 1) / num_frames * 100:.1f}%", end="", flush=True)
+        if evaluator is not None:
+            evaluator.update(results[-1])
+            if i + 1 < num_frames and evaluator.is_settled(**(settle_params or {})):
+                print(f"\rPose estimation: verdict settled at frame {i}, skipping {num_frames - i - 1} frames", end="")
+                return results + [None] * (num_frames - i - 1), i
+    if gate is not None:
+        results = gate.finish(results, refill)
+    elif stride > 1:
+        results = interpolate_poses(results, skipped)
+    return results, None
+
 def create_landmarks_trace(landmarks: List[Optional[RefinedLandmarks]]) -> List[Dict[str, Any]]:
     """Creates a serializable trace of landmark data."""
     trace = []
@@ -27,7 +113,8 @@ def create_landmarks_trace(landmarks: List[Optional[RefinedLandmarks]]) -> List[
                 "elbow": [round(lm.elbow_tip[0], 2), round(lm.elbow_tip[1], 2)],
                 "margin_px": round(lm.deltoid_apex[1] - lm.elbow_tip[1], 2),
                 "deltoid_conf": round(lm.deltoid_confidence, 2),
-                "elbow_conf": round(lm.elbow_confidence, 2)
+                "elbow_conf": round(lm.elbow_confidence, 2),
+                "interpolated": lm.interpolated
             })
     return trace
 
@@ -39,8 +126,14 @@ def generate_overlay_video(
     bottom_idx: int,
     config: Dict[str, Any]
 ) -> List[np.ndarray]:
-    """Generates frames with analysis overlay."""
+    """
+    Generates frames with analysis overlay.
+    
+    Text is alpha-composited from sprites rasterised once (SpriteCache); only the
+    per-frame geometry is drawn with OpenCV.
+    """
     overlay_frames = []
+    sprites = SpriteCache()
     num_frames = len(frames)
     width = frames[0].shape[1]
     bottom_win = config['phases']['bottom_window']
@@ -60,24 +153,26 @@ def generate_overlay_video(
             cv2.circle(canvas, e_pt, 6, (255, 0, 0), -1)
             
             margin_val = lm.deltoid_apex[1] - lm.elbow_tip[1]
-            if abs(i - bottom_idx) <= bottom_win:
+            if i == decision.bottom_frame_index:
+                # The verdict's frame shows the margin it was decided on (the sub-frame peak)
+                margin_val = decision.deciding_margin_px
+            if abs(i - bottom_idx) <= bottom_win or i == decision.bottom_frame_index:
                 color = (0, 255, 0) if margin_val >= 0 else (0, 0, 255)
                 cv2.line(canvas, d_pt, (d_pt[0], e_pt[1]), color, 2)
                 if show_margin:
-                    cv2.putText(canvas, f"{margin_val:+.1f}px", (d_pt[0] + 10, (d_pt[1] + e_pt[1]) // 2), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                    sprites.draw_glyphs(canvas, f"{margin_val:+.1f}px", (d_pt[0] + 10, (d_pt[1] + e_pt[1]) // 2),
+                                        0.6, color, 2)
         
         # 2. Draw Phase
         phase = phases.get(i, "unknown")
-        p_colors = {"bottom": (0, 255, 255), "descending": (0, 165, 255), "ascending": (0, 255, 0)}
-        color = p_colors.get(phase, (255, 255, 255))
-        cv2.putText(canvas, f"PHASE: {phase.upper()}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+        color = PHASE_COLORS.get(phase, (255, 255, 255))
+        sprites.draw_text(canvas, f"PHASE: {phase.upper()}", (10, 30), 1, color, 2)
         
         # 3. Draw Decision
         if i >= bottom_idx:
             res_txt = "VALID" if decision.valid else "INVALID"
             res_col = (0, 255, 0) if decision.valid else (0, 0, 255)
-            cv2.putText(canvas, res_txt, (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.5, res_col, 3)
+            sprites.draw_text(canvas, res_txt, (10, 70), 1.5, res_col, 3)
             
         overlay_frames.append(canvas)
         if (i + 1) % 50 == 0 or (i + 1) == num_frames:
@@ -106,85 +201,313 @@ def save_debug_images(
                 cv2.imwrite(os.path.join(output_dir, "debug_pose.jpg"), debug_pose)
                 break
 
-def main():
-    parser = argparse.ArgumentParser(description="Dip Validator CLI")
-    parser.add_argument("video_path", help="Path to input video")
-    parser.add_argument("--output-dir", default="output", help="Output directory")
-    parser.add_argument("--config", default="configs/default.yaml", help="Path to config file")
-    args = parser.parse_args()
+def create_estimator(config: Dict[str, Any]) -> PoseEstimator:
+    """PoseEstimator for the config's pose section."""
+    mode = MODEL_MODES.get(config['pose']['model'], "balanced")
+    return PoseEstimator(device=config['pose']['device'], mode=mode,
+                         lifter_weights=config['pose'].get('lifter_selection'))
+
+def analyze_video(
+    video_path: str,
+    output_dir: str,
+    config: Dict[str, Any],
+    judge_names: Optional[List[str]] = None,
+    early_exit: bool = False,
+    estimator: Optional[PoseEstimator] = None,
+    camera: Optional[str] = None,
+    results_db: Optional[str] = None,
+    plan: Optional[QualityPlan] = None,
+    scheduler: Optional[QualityScheduler] = None,
+    force: bool = False,
+    checkpoint: Optional[Callable[[], None]] = None
+) -> str:
+    """
+    Runs the full pipeline on one video and writes its outputs to <output_dir>/<video name>/.
     
-    try:
-        config = load_config(args.config)
-        video_basename = os.path.splitext(os.path.basename(args.video_path))[0]
-        video_output_dir = os.path.join(args.output_dir, video_basename)
-        os.makedirs(video_output_dir, exist_ok=True)
+    Args:
+        video_path: Path to input video.
+        output_dir: Output directory.
+        config: Loaded config.
+        judge_names: Judges to run (default: config judges.enabled).
+        early_exit: Stop pose inference once a VALID verdict is settled (also config early_exit.enabled).
+        estimator: Warm PoseEstimator to reuse (created from the config if omitted).
+        camera: Camera label stored with the result.
+        results_db: SQLite results store to append the decision to (also config output.results_db).
+        plan: Scheduler settings (model, inference scale, frame stride, overlay); recorded in the report.
+        scheduler: Scheduler to update with this run's stage timings.
+        force: Rebuild every artifact, even those the manifest records as up to date.
+        checkpoint: Called before each stage writes its outputs; raises to abort the run
+            (e.g. a queue worker that lost its job's lease).
         
-        print(f"Processing: {os.path.basename(args.video_path)}")
-        frames, meta = load_video(args.video_path)
+    Returns:
+        str: Path to the generated JSON report.
+    """
+    if plan is not None:
+        config = apply_plan(config, plan)
+    checkpoint = checkpoint or (lambda: None)
+    stride = config['pose'].get('frame_stride', 1)
+    scale = config['pose'].get('inference_scale', 1.0)
+    
+    video_basename = os.path.splitext(os.path.basename(video_path))[0]
+    video_output_dir = os.path.join(output_dir, video_basename)
+    os.makedirs(video_output_dir, exist_ok=True)
+    
+    print(f"Processing: {os.path.basename(video_path)}")
+    timings = {}
+    index_path = os.path.join(video_output_dir, "frame_index.json")
+    
+    judge_cfg = config.get('judges', {})
+    judge_names = judge_names or judge_cfg.get('enabled', ["dip_depth"])
+    judges = load_judges(judge_names, plugins=judge_cfg.get('plugins'))
+    
+    early_cfg = config.get('early_exit', {})
+    early_exit = early_exit or early_cfg.get('enabled', False)
+    if early_exit and judge_names != ["dip_depth"]:
+        # Other judges (e.g. lockout) need the frames after the dip bottom
+        print("Early exit disabled: only supported with the dip_depth judge alone")
+        early_exit = False
+    if early_exit and stride > 1:
+        print("Early exit disabled: not supported with a frame stride")
+        early_exit = False
+    
+    # Frames without motion skip pose estimation (not combined with a stride or early exit,
+    # which already decide which frames go through the model)
+    gate = create_motion_gate(config)
+    if gate is not None and (early_exit or stride > 1):
+        print("Motion gate disabled: not supported with early exit or a frame stride")
+        gate = None
+    
+    # Artifacts whose inputs (video content, config sections, upstream stage) are
+    # unchanged since the last run are reused (see manifest.STAGE_INPUTS)
+    incremental = config['output'].get('incremental', True) and not force
+    manifest = Manifest(video_output_dir)
+    pose_key = stage_key(config, "pose", manifest.video_digest(video_path),
+                         {"early_exit": early_cfg if early_exit else False})
+    report_key = stage_key(config, "report", pose_key, {"judges": judge_names})
+    overlay_key = stage_key(config, "overlay", report_key)
+    report_path = os.path.join(video_output_dir, "report.json")
+    report_fresh = incremental and manifest.fresh("report", report_key)
+    overlay_fresh = incremental and manifest.fresh("overlay", overlay_key)
+    results_db = results_db or config['output'].get('results_db')
+    # The results store is not a stage output: its row is written even when nothing is rebuilt
+    if report_fresh and overlay_fresh and not results_db:
+        print(f"Up to date: {report_path}")
+        return report_path
+    pose_fresh = incremental and manifest.fresh("pose", pose_key)
+    
+    # Early exit and frame stride need frame-by-frame control of inference
+    pipelined = config.get('pipeline', {}).get('enabled', False) and not early_exit and stride == 1 and not pose_fresh
+    processes = config.get('pipeline', {}).get('processes', 1) if pipelined else 1
+    if gate is not None and processes > 1:
+        print("Motion gate disabled: not supported with pose worker processes")
+        gate = None
+    
+    # With worker processes, every worker loads its own models
+    if processes == 1 and not pose_fresh:
+        if estimator is None:
+            estimator = create_estimator(config)
+        else:
+            estimator.reset()
+    conf_thresh = config['pose']['confidence_threshold']
+    
+    frames = None
+    if pose_fresh:
+        # 1. Pose Estimation: inputs unchanged, reuse the cached poses (frames are only
+        # decoded again if the overlay needs them)
+        results, meta = load_pose_cache(os.path.join(video_output_dir, "keypoints.npz"))
+        exit_frame = manifest.info("pose", "exit_frame")
+        gate_stats = manifest.info("pose", "motion_gate")
+        num_frames = len(results)
+        print("Poses up to date (keypoints.npz)")
+    elif pipelined:
+        # 1. Decode + Pose Estimation, overlapped across threads (or worker processes)
+        print("Starting pipelined decode and pose estimation...")
+        start = time.perf_counter()
+        if processes > 1:
+            piped = run_parallel_poses(video_path, config, processes, index_path,
+                                       ring_slots=config['pipeline'].get('ring_slots'))
+        else:
+            piped = run_pose_pipeline(video_path, estimator, config, index_path,
+                                      queue_size=config['pipeline'].get('queue_size', 8), gate=gate)
+        frames, meta, results, exit_frame = piped.frames, piped.meta, piped.poses, None
         num_frames = len(frames)
+        timings["pose"] = time.perf_counter() - start
+        print(f"Pose estimation complete ({piped.stats['fps']} fps, bottleneck: {piped.stats['bottleneck']}).")
+    else:
+        start = time.perf_counter()
+        frames, meta = load_video(video_path, index_path=index_path)
+        num_frames = len(frames)
+        timings["decode"] = time.perf_counter() - start
         
         # 1. Pose Estimation
         print("Starting pose estimation...")
-        mode_map = {"rtmpose-s": "lightweight", "rtmpose-m": "balanced", "rtmpose-l": "performance"}
-        mode = mode_map.get(config['pose']['model'], "balanced")
-        estimator = PoseEstimator(device=config['pose']['device'], mode=mode)
-        
-        results = []
-        conf_thresh = config['pose']['confidence_threshold']
-        for i, frame in enumerate(frames):
-            results.append(estimator.estimate_poses([frame], conf_threshold=conf_thresh)[0])
-            if (i + 1) % 20 == 0 or (i + 1) == num_frames:
-                print(f"\rPose estimation: {(i + 1) / num_frames * 100:.1f}%", end="", flush=True)
+        start = time.perf_counter()
+        evaluator, settle_params = None, None
+        if early_exit:
+            evaluator = IncrementalDipEvaluator(
+                window_half_size=config['phases']['bottom_window'],
+                conf_threshold=conf_thresh,
+                elbow_offset_ratio=config['landmarks']['elbow_offset_ratio'],
+                deltoid_offset_ratio=config['landmarks']['deltoid_offset_ratio'],
+                ema_alpha=config['landmarks']['ema_alpha'],
+                smoothing_window=config['phases']['smoothing_window'],
+                smoothing_polyorder=config['phases']['smoothing_polyorder']
+            )
+            settle_params = {
+                "margin_px": early_cfg.get('margin_px', 5.0),
+                "min_confidence": early_cfg.get('min_confidence', 0.6),
+                "ascent_px": early_cfg.get('ascent_px', 10.0),
+                "ascent_frames": early_cfg.get('ascent_frames', 5)
+            }
+        results, exit_frame = estimate_video_poses(frames, estimator, conf_thresh, evaluator, settle_params, stride, scale,
+                                                   gate)
+        timings["pose"] = time.perf_counter() - start
         print("\nPose estimation complete.")
-        
-        # 2. Phase Detection
-        print("Starting phase detection...")
-        depth_signal = compute_depth_signal(results, conf_threshold=conf_thresh)
-        smoothed = smooth_signal(depth_signal, 
-                                 window=config['phases']['smoothing_window'], 
-                                 polyorder=config['phases']['smoothing_polyorder'])
-        bottom_idx = detect_bottom_frame(smoothed)
-        phases = segment_phases(smoothed, bottom_idx, bottom_window=config['phases']['bottom_window'])
-        
-        # 3. Refinement
-        print("Starting landmark refinement...")
-        raw_l, raw_r = [], []
-        ref_params = {
-            "elbow_offset_ratio": config['landmarks']['elbow_offset_ratio'],
-            "deltoid_offset_ratio": config['landmarks']['deltoid_offset_ratio']
+    if not pose_fresh:
+        gate_stats = gate.to_dict() if gate is not None else None
+        if gate_stats:
+            print(f"Motion gate: pose estimated on {gate_stats['estimated']} of {gate_stats['frames']} frames")
+    checkpoint()
+    if not pose_fresh and (config['output'].get('save_keypoints', True) or incremental):
+        # Reused by `calibrate` and by later runs without re-running the pose model
+        save_pose_cache(os.path.join(video_output_dir, "keypoints.npz"), results, meta)
+        manifest.record("pose", pose_key, ["keypoints.npz"], exit_frame=exit_frame, motion_gate=gate_stats)
+    
+    # 2. Phase Detection (signals are computed once and shared by all judges)
+    print("Starting phase detection...")
+    start = time.perf_counter()
+    context = AnalysisContext(results, meta, config)
+    if pipelined:
+        context.provide("raw_landmarks", piped.raw_landmarks)
+    bottom_idx = context.signal("bottom_index")
+    phases = context.signal("phases")
+    
+    # 3. Decision
+    print(f"Running judges: {', '.join(judge_names)}...")
+    verdicts = run_judges(judges, context)
+    decision = verdicts.get("dip_depth")
+    extra = {"judges": judges_report(judges, verdicts, context)} if judge_names != ["dip_depth"] else {}
+    if plan is not None:
+        extra["schedule"] = plan.to_dict()
+    if pipelined:
+        extra["pipeline"] = piped.stats
+    if gate_stats:
+        extra["motion_gate"] = gate_stats
+    # After an early exit only the frames up to the exit went through the pose model
+    analysed_frames = num_frames if exit_frame is None else exit_frame + 1
+    if exit_frame is not None:
+        extra["early_exit"] = {
+            "frame": exit_frame,
+            "analysed_frames": analysed_frames,
+            "unanalysed_frames": [exit_frame + 1, num_frames - 1]
         }
-        for i, r in enumerate(results):
-            raw_l.append(refine_landmarks(r, "left", **ref_params))
-            raw_r.append(refine_landmarks(r, "right", **ref_params))
-        
-        left_refined = smooth_landmarks_temporal(raw_l, alpha=config['landmarks']['ema_alpha'])
-        right_refined = smooth_landmarks_temporal(raw_r, alpha=config['landmarks']['ema_alpha'])
-        
-        # 4. Decision
-        print("Evaluating dip decision...")
-        decision = evaluate_dip(
-            left_refined, right_refined, bottom_idx, 
-            window_half_size=config['phases']['bottom_window'],
-            min_confidence=config['decision']['min_confidence']
-        )
-        
-        # 5. Reporting & Trace
-        trace = create_landmarks_trace(left_refined if decision.selected_side == "left" else right_refined) \
-                if config['output']['save_landmarks_trace'] else None
-        
-        report_path = generate_report(args.video_path, decision, num_frames, meta['fps'], video_output_dir, trace)
-        
-        print(f"\nResult: {'VALID' if decision.valid else 'INVALID'} (Margin: {decision.best_margin_px:.1f}px)")
+    
+    # 4. Reporting & Trace
+    checkpoint()
+    if decision is None:
+        if not report_fresh:
+            report_path = write_report({
+                "video": os.path.basename(video_path),
+                "frames_analyzed": analysed_frames,
+                "fps": round(meta['fps'], 2),
+                **extra
+            }, video_output_dir)
+            manifest.record("report", report_key, ["report.json"])
+        for name, entry in extra["judges"].items():
+            print(f"{name}: {entry['result']}")
         print(f"Report saved: {report_path}")
-        
-        # 6. Overlay & Debug
+        return report_path
+    
+    left_refined, right_refined = context.signal("refined_landmarks")
+    selected_lms = left_refined if decision.selected_side == "left" else right_refined
+    trace = create_landmarks_trace(selected_lms) if config['output']['save_landmarks_trace'] else None
+    
+    if report_fresh:
+        print("Report up to date")
+    else:
+        report_path = generate_report(video_path, decision, analysed_frames, meta['fps'], video_output_dir, trace, extra)
+        manifest.record("report", report_key, ["report.json"])
+    timings["analysis"] = time.perf_counter() - start
+    
+    print(f"\nResult: {'VALID' if decision.valid else 'INVALID'} (Margin: {decision.deciding_margin_px:.1f}px)")
+    print(f"Report saved: {report_path}")
+    
+    # 5. Overlay & Debug
+    checkpoint()
+    overlay_files = []
+    if overlay_fresh:
+        print("Overlay up to date")
+    elif exit_frame is not None and early_cfg.get('skip_overlay', True):
+        print("Overlay skipped (early exit)")
+    elif not config['output'].get('overlay', True):
+        print("Overlay skipped")
+    else:
+        if frames is None:
+            start = time.perf_counter()
+            frames, _ = load_video(video_path, index_path=index_path)
+            timings["decode"] = time.perf_counter() - start
         print("Generating overlay video...")
-        selected_lms = left_refined if decision.selected_side == "left" else right_refined
+        start = time.perf_counter()
         overlay_frames = generate_overlay_video(frames, selected_lms, phases, decision, bottom_idx, config)
         save_video(overlay_frames, os.path.join(video_output_dir, "overlay.mp4"), meta['fps'])
         print(f"\nOverlay saved to {video_output_dir}")
         
         save_debug_images(video_output_dir, frames, overlay_frames, results, bottom_idx, conf_thresh)
+        timings["overlay"] = time.perf_counter() - start
+        overlay_files = [name for name in ("overlay.mp4", "debug_landmarks.jpg", "debug_pose.jpg")
+                         if os.path.exists(os.path.join(video_output_dir, name))]
+    if not overlay_fresh:
+        # Recorded even when skipped, so that an unchanged skip is not re-evaluated
+        manifest.record("overlay", overlay_key, overlay_files)
+    
+    # 6. Results store (meet-wide queries: python -m dip_validator query)
+    if results_db:
+        checkpoint()
+        trace_path = save_trace_columns(trace, os.path.join(video_output_dir, "trace.npz")) if trace else None
+        store = ResultsStore(results_db)
+        store.add(video_path, decision, analysed_frames, meta['fps'], config, camera, timings, report_path, trace_path)
+        store.close()
+    if scheduler is not None and plan is not None:
+        scheduler.observe(plan, num_frames, timings, gate_stats['estimated'] if gate_stats else None)
+    return report_path
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        module, _, function = COMMANDS[argv[0]].partition(":")
+        return getattr(importlib.import_module(module), function or "main")(argv[1:])
+    
+    parser = argparse.ArgumentParser(description="Dip Validator CLI")
+    parser.add_argument("video_path", help="Path to input video")
+    parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument("--config", default="configs/default.yaml", help="Path to config file")
+    parser.add_argument("--judges", default=None, help="Comma-separated judges to run (default: config judges.enabled)")
+    parser.add_argument("--early-exit", action="store_true", help="Stop pose inference once a VALID verdict is settled")
+    parser.add_argument("--motion-gate", action="store_true", help="Skip pose on frames without motion (interpolated)")
+    parser.add_argument("--pipeline", action="store_true", help="Run decode, detection, pose and refinement as overlapping stages")
+    parser.add_argument("--results-db", default=None, help="Append the decision to this SQLite results store")
+    parser.add_argument("--camera", default=None, help="Camera label stored with the result")
+    parser.add_argument("--deadline", type=float, default=None, help="Latency deadline in seconds: pick model, "
+                        "resolution, frame stride and overlay to meet it")
+    parser.add_argument("--force", action="store_true", help="Rebuild all outputs, even those that are up to date")
+    args = parser.parse_args(argv)
+    
+    try:
+        config = load_config(args.config)
+        if args.motion_gate:
+            config.setdefault('motion_gate', {})['enabled'] = True
+        if args.pipeline:
+            config.setdefault('pipeline', {})['enabled'] = True
+        judge_names = [name.strip() for name in args.judges.split(",") if name.strip()] if args.judges else None
+        plan, scheduler = None, None
+        deadline = args.deadline or config.get('scheduler', {}).get('deadline_s')
+        if deadline:
+            scheduler = QualityScheduler(config)
+            plan = scheduler.plan(probe_video(args.video_path)['frame_count'], deadline)
+            print(f"Schedule: {plan.model}, scale {plan.inference_scale}, stride {plan.frame_stride}, "
+                  f"overlay {'on' if plan.overlay else 'off'} (predicted {plan.predicted_s:.1f}s)")
+        analyze_video(args.video_path, args.output_dir, config, judge_names, args.early_exit,
+                      camera=args.camera, results_db=args.results_db, plan=plan, scheduler=scheduler, force=args.force)
         
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
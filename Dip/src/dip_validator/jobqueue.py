@@ -0,0 +1,315 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Callable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_path TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, done, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker TEXT,
+    lease_expires REAL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, lease_expires);
+"""
+
+@dataclass
+class Job:
+    id: int
+    video_path: str
+    output_dir: str
+    options: Dict[str, Any]
+    attempts: int
+    submitted_at: float
+
+class JobQueue:
+    """
+    Analysis job queue in a SQLite file, shared by workers on one or several machines.
+
+    A claimed job is leased to its worker until `lease_expires`; the worker extends the
+    lease with heartbeat() while it runs. A job whose lease has expired (worker killed,
+    machine lost) is claimable again, and counts as a failed attempt. Each transition is
+    a single IMMEDIATE transaction, so two workers can never claim the same job.
+    """
+    def __init__(self, path: str, lease_s: float = 120.0, timeout_s: float = 30.0):
+        self.path = path
+        self.lease_s = lease_s
+        # Rollback journal (not WAL): WAL needs shared memory and does not work on network file systems
+        self.conn = sqlite3.connect(path, timeout=timeout_s, isolation_level=None, check_same_thread=False)
+        self.lock = threading.Lock()  # One connection shared with the heartbeat thread
+        with self.lock:
+            self.conn.executescript(SCHEMA)
+
+    def _transaction(self, fn: Callable[[sqlite3.Cursor], Any]) -> Any:
+        with self.lock:
+            cur = self.conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(cur)
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            cur.execute("COMMIT")
+            return value
+
+    def submit(self, video_path: str, output_dir: str = "output", options: Optional[Dict[str, Any]] = None,
+               max_attempts: int = 3) -> int:
+        """Queues a video for analysis. Returns the job id."""
+        def insert(cur):
+            cur.execute("INSERT INTO jobs (video_path, output_dir, options, max_attempts, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                        (video_path, output_dir, json.dumps(options or {}), max_attempts, time.time()))
+            return cur.lastrowid
+        return self._transaction(insert)
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Leases the oldest queued job (or one whose lease expired) to `worker`.
+
+        Returns:
+            The claimed Job, or None if there is nothing to do.
+        """
+        def take(cur):
+            now = time.time()
+            while True:
+                row = cur.execute(
+                    "SELECT id, video_path, output_dir, options, attempts, max_attempts, status, submitted_at FROM jobs "
+                    "WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                    (now,)).fetchone()
+                if row is None:
+                    return None
+                job_id, video_path, output_dir, options, attempts, max_attempts, status, submitted_at = row
+                if status == 'running' and attempts >= max_attempts:
+                    # The last attempt's worker died: give up on the job
+                    cur.execute("UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                                (now, "lease expired", job_id))
+                    continue
+                cur.execute("UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                            "lease_expires = ?, started_at = ? WHERE id = ?",
+                            (worker, now + self.lease_s, now, job_id))
+                return Job(job_id, video_path, output_dir, json.loads(options), attempts + 1, submitted_at)
+        return self._transaction(take)
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extends the lease. Returns False if the job is no longer leased to this worker."""
+        def extend(cur):
+            cur.execute("UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                        (time.time() + self.lease_s, job_id, worker))
+            return cur.rowcount == 1
+        return self._transaction(extend)
+
+    def complete(self, job_id: int, worker: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Marks the job done. Returns False if the lease was lost (another worker owns it now)."""
+        def finish(cur):
+            cur.execute("UPDATE jobs SET status = 'done', finished_at = ?, result = ?, lease_expires = NULL "
+                        "WHERE id = ? AND worker = ? AND status = 'running'",
+                        (time.time(), json.dumps(result or {}), job_id, worker))
+            return cur.rowcount == 1
+        return self._transaction(finish)
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Records a failed attempt: the job is queued again until it runs out of attempts."""
+        def record(cur):
+            cur.execute("UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                        "finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END, error = ?, lease_expires = NULL "
+                        "WHERE id = ? AND worker = ? AND status = 'running'",
+                        (time.time(), error, job_id, worker))
+            return cur.rowcount == 1
+        return self._transaction(record)
+
+    def get(self, job_id: int) -> Dict[str, Any]:
+        with self.lock:
+            cur = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cur.fetchone()
+            return dict(zip([c[0] for c in cur.description], row)) if row else {}
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self.lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self):
+        self.conn.close()
+
+class LeaseLost(Exception):
+    """Raised by Heartbeat.check() once another worker may own the job."""
+
+class Heartbeat:
+    """Context manager extending a job's lease from a background thread while it runs."""
+    def __init__(self, queue: JobQueue, job: Job, worker: str, interval_s: Optional[float] = None):
+        self.queue = queue
+        self.job = job
+        self.worker = worker
+        self.interval_s = interval_s or queue.lease_s / 3
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            if not self.queue.heartbeat(self.job.id, self.worker):
+                self.lost = True
+                return
+
+    def check(self):
+        """Raises LeaseLost if the lease was lost: the job's outputs must not be written."""
+        if self.lost:
+            raise LeaseLost(f"job {self.job.id}: lease lost")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def run_worker(
+    queue: JobQueue,
+    process: Callable[[Job, Callable[[], None]], Dict[str, Any]],
+    worker: Optional[str] = None,
+    poll_s: float = 2.0,
+    max_jobs: Optional[int] = None,
+    exit_when_idle: bool = False
+) -> int:
+    """
+    Claims and processes jobs until stopped.
+
+    Args:
+        queue: Job queue.
+        process: Runs one job and returns its result (stored with the job). It gets the job
+            and a checkpoint to call before writing outputs, which raises LeaseLost once
+            another worker may own the job. Other exceptions are recorded as failed attempts.
+        worker: Worker id (default: host:pid).
+        poll_s: Wait between claims when the queue is empty.
+        max_jobs: Stop after this many jobs.
+        exit_when_idle: Stop as soon as the queue is empty.
+
+    Returns:
+        Number of jobs processed.
+    """
+    worker = worker or default_worker_id()
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = queue.claim(worker)
+        if job is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_s)
+            continue
+
+        print(f"[{worker}] job {job.id} (attempt {job.attempts}): {job.video_path}")
+        with Heartbeat(queue, job, worker) as heartbeat:
+            try:
+                result = process(job, heartbeat.check)
+            except LeaseLost:
+                # The outputs belong to whichever worker holds the job now
+                print(f"[{worker}] job {job.id}: lease lost, run aborted", file=sys.stderr)
+                result = None
+            except Exception as e:
+                queue.fail(job.id, worker, f"{type(e).__name__}: {e}")
+                print(f"[{worker}] job {job.id} failed: {e}", file=sys.stderr)
+                result = None
+        if result is not None:
+            if heartbeat.lost or not queue.complete(job.id, worker, result):
+                print(f"[{worker}] job {job.id}: lease lost, result discarded", file=sys.stderr)
+        processed += 1
+    return processed
+
+def main(argv: Optional[List[str]] = None):
+    from dip_validator.cli import load_config, create_estimator, analyze_video
+    from dip_validator.scheduler import QualityScheduler, apply_plan
+    from dip_validator.video_io import probe_video
+
+    parser = argparse.ArgumentParser(prog="dip_validator worker", description="Process analysis jobs from a queue")
+    parser.add_argument("--queue", default="jobs.db", help="SQLite queue file (on storage shared by all workers)")
+    parser.add_argument("--config", default="configs/default.yaml", help="Path to config file")
+    parser.add_argument("--worker-id", default=None, help="Worker id (default: host:pid)")
+    parser.add_argument("--max-jobs", type=int, default=None, help="Stop after this many jobs")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Stop when the queue is empty")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        queue_cfg = config.get('queue', {})
+        queue = JobQueue(args.queue, lease_s=queue_cfg.get('lease_s', 120.0))
+        scheduler = QualityScheduler(config)
+        # Loaded once per model: every job reuses the warm models
+        estimators = {config['pose']['model']: create_estimator(config)}
+
+        def process(job: Job, checkpoint: Callable[[], None]) -> Dict[str, Any]:
+            plan = None
+            deadline = job.options.get('deadline_s') or config.get('scheduler', {}).get('deadline_s')
+            if deadline:
+                counts = queue.counts()
+                plan = scheduler.plan(probe_video(job.video_path)['frame_count'], deadline,
+                                      elapsed_s=time.time() - job.submitted_at,
+                                      queue_depth=counts.get('queued', 0), workers=counts.get('running', 1))
+            model = plan.model if plan else config['pose']['model']
+            if model not in estimators:
+                estimators[model] = create_estimator(apply_plan(config, plan))
+            report_path = analyze_video(job.video_path, job.output_dir, config, job.options.get('judges'),
+                                        job.options.get('early_exit', False), estimators[model],
+                                        job.options.get('camera'), job.options.get('results_db'), plan, scheduler,
+                                        checkpoint=checkpoint)
+            return {"report": report_path, **({"schedule": plan.to_dict()} if plan else {})}
+
+        processed = run_worker(queue, process, args.worker_id, queue_cfg.get('poll_s', 2.0),
+                               args.max_jobs, args.exit_when_idle)
+        print(f"Worker stopped after {processed} jobs: {queue.counts()}")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+def submit_main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="dip_validator submit", description="Queue videos for analysis")
+    parser.add_argument("video_paths", nargs="+", help="Videos to analyse")
+    parser.add_argument("--queue", default="jobs.db", help="SQLite queue file")
+    parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument("--judges", default=None, help="Comma-separated judges to run")
+    parser.add_argument("--early-exit", action="store_true", help="Stop pose inference once a VALID verdict is settled")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before a job is marked failed")
+    parser.add_argument("--results-db", default=None, help="SQLite results store the workers append to")
+    parser.add_argument("--camera", default=None, help="Camera label stored with the results")
+    parser.add_argument("--deadline", type=float, default=None, help="Latency deadline from submission, in seconds")
+    args = parser.parse_args(argv)
+
+    # Nothing is queued unless every video exists, so a typo does not leave a partial batch
+    missing = [path for path in args.video_paths if not os.path.isfile(path)]
+    if missing:
+        print(f"Error: video not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    queue = JobQueue(args.queue)
+    options = {
+        "judges": [name.strip() for name in args.judges.split(",") if name.strip()] if args.judges else None,
+        "early_exit": args.early_exit,
+        "camera": args.camera,
+        "results_db": os.path.abspath(args.results_db) if args.results_db else None,
+        "deadline_s": args.deadline
+    }
+    for path in args.video_paths:
+        job_id = queue.submit(os.path.abspath(path), os.path.abspath(args.output_dir), options, args.max_attempts)
+        print(f"Queued job {job_id}: {path}")
+    print(f"Queue: {queue.counts()}")
@@ -0,0 +1,245 @@
+import importlib
+from abc import ABC, abstractmethod
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Tuple, Callable, Type
+from .pose import PoseResult, poses_to_arrays
+from .phases import compute_depth_signal, smooth_signal_with_derivative, detect_bottom_frame, detect_bottom_subframe, segment_phases
+from .refinement import refine_landmarks, smooth_landmarks_temporal
+from .rules import evaluate_dip, DipDecision
+from .reporting import decision_to_dict
+
+# Derived signals shared by all judges, keyed by name. Each builder receives the
+# AnalysisContext and may request other signals through it.
+SIGNALS: Dict[str, Callable[["AnalysisContext"], Any]] = {}
+
+# Registered judge classes, keyed by Judge.name
+JUDGES: Dict[str, Type["Judge"]] = {}
+
+def register_signal(name: str):
+    """Decorator registering a derived-signal builder under `name`."""
+    def wrap(fn):
+        SIGNALS[name] = fn
+        return fn
+    return wrap
+
+def register_judge(cls: Type["Judge"]) -> Type["Judge"]:
+    """Class decorator registering a judge under its `name`."""
+    JUDGES[cls.name] = cls
+    return cls
+
+class AnalysisContext:
+    """
+    Per-clip state shared by every judge: pose results are estimated once and
+    derived signals are computed lazily on first request, then cached.
+    """
+    def __init__(self, poses: List[Optional[PoseResult]], meta: Dict[str, Any], config: Dict[str, Any]):
+        self.poses = poses
+        self.meta = meta
+        self.config = config
+        self._cache: Dict[str, Any] = {}
+
+    def signal(self, name: str) -> Any:
+        if name not in self._cache:
+            if name not in SIGNALS:
+                raise KeyError(f"Unknown signal: {name}")
+            self._cache[name] = SIGNALS[name](self)
+        return self._cache[name]
+
+    def provide(self, name: str, value: Any) -> None:
+        """Seeds a signal computed elsewhere (e.g. by the pose pipeline) so it is not recomputed."""
+        self._cache[name] = value
+
+    def keypoint_coverage(self, keypoints: Tuple[int, ...]) -> float:
+        """Fraction of frames where all the given keypoints are above the confidence threshold."""
+        if not keypoints or not self.poses:
+            return 1.0
+        _, conf = self.signal("keypoint_arrays")
+        thresh = self.config['pose']['confidence_threshold']
+        return float(np.mean(np.all(conf[:, list(keypoints)] > thresh, axis=1)))
+
+@register_signal("keypoint_arrays")
+def _keypoint_arrays(ctx: AnalysisContext):
+    return poses_to_arrays(ctx.poses)
+
+@register_signal("depth_signal")
+def _depth_signal(ctx: AnalysisContext):
+    return compute_depth_signal(ctx.poses, conf_threshold=ctx.config['pose']['confidence_threshold'])
+
+@register_signal("depth_savgol")
+def _depth_savgol(ctx: AnalysisContext):
+    return smooth_signal_with_derivative(ctx.signal("depth_signal"),
+                                         window=ctx.config['phases']['smoothing_window'],
+                                         polyorder=ctx.config['phases']['smoothing_polyorder'])
+
+@register_signal("smoothed_depth")
+def _smoothed_depth(ctx: AnalysisContext):
+    return ctx.signal("depth_savgol")[0]
+
+@register_signal("depth_derivative")
+def _depth_derivative(ctx: AnalysisContext):
+    return ctx.signal("depth_savgol")[1]
+
+@register_signal("bottom_index")
+def _bottom_index(ctx: AnalysisContext):
+    return detect_bottom_frame(ctx.signal("smoothed_depth"))
+
+@register_signal("bottom_subframe")
+def _bottom_subframe(ctx: AnalysisContext):
+    return detect_bottom_subframe(ctx.signal("depth_derivative"), ctx.signal("bottom_index"))
+
+@register_signal("phases")
+def _phases(ctx: AnalysisContext):
+    return segment_phases(ctx.signal("smoothed_depth"), ctx.signal("bottom_index"),
+                          bottom_window=ctx.config['phases']['bottom_window'])
+
+@register_signal("raw_landmarks")
+def _raw_landmarks(ctx: AnalysisContext):
+    ref_params = {
+        "elbow_offset_ratio": ctx.config['landmarks']['elbow_offset_ratio'],
+        "deltoid_offset_ratio": ctx.config['landmarks']['deltoid_offset_ratio']
+    }
+    raw_l = [refine_landmarks(r, "left", **ref_params) for r in ctx.poses]
+    raw_r = [refine_landmarks(r, "right", **ref_params) for r in ctx.poses]
+    return raw_l, raw_r
+
+@register_signal("refined_landmarks")
+def _refined_landmarks(ctx: AnalysisContext):
+    raw_l, raw_r = ctx.signal("raw_landmarks")
+    alpha = ctx.config['landmarks']['ema_alpha']
+    return smooth_landmarks_temporal(raw_l, alpha=alpha), smooth_landmarks_temporal(raw_r, alpha=alpha)
+
+class Judge(ABC):
+    """
+    Base class for lift judges.
+
+    Subclasses declare the COCO keypoints and the derived signals they need, and
+    implement `evaluate` (returning a result object) and `to_dict` (its report view).
+    """
+    name: str = ""
+    keypoints: Tuple[int, ...] = ()
+    signals: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def evaluate(self, context: AnalysisContext) -> Any:
+        ...
+
+    @abstractmethod
+    def to_dict(self, result: Any) -> Dict[str, Any]:
+        ...
+
+@register_judge
+class DipDepthJudge(Judge):
+    """Posterior deltoid below elbow tip (rules.evaluate_dip)."""
+    name = "dip_depth"
+    keypoints = (5, 6, 7, 8, 9, 10)
+    signals = ("bottom_index", "bottom_subframe", "refined_landmarks")
+
+    def evaluate(self, context: AnalysisContext) -> DipDecision:
+        left_refined, right_refined = context.signal("refined_landmarks")
+        decision = evaluate_dip(
+            left_refined, right_refined, context.signal("bottom_index"),
+            window_half_size=context.config['phases']['bottom_window'],
+            min_confidence=context.config['decision']['min_confidence'],
+            interpolate=context.config['decision'].get('subframe_interpolation', True)
+        )
+        fps = context.meta.get('fps', 0)
+        if fps > 0:
+            decision.bottom_time_s = context.signal("bottom_subframe") / fps
+        return decision
+
+    def to_dict(self, result: DipDecision) -> Dict[str, Any]:
+        return decision_to_dict(result)
+
+@dataclass
+class LockoutDecision:
+    valid: bool
+    elbow_angle_deg: float  # Maximum elbow angle after the bottom
+    lockout_frame_index: int
+    selected_side: str
+    warnings: List[str]
+
+@register_judge
+class DipLockoutJudge(Judge):
+    """Arms extended after the bottom: elbow angle reaches `lockout.min_elbow_angle_deg`."""
+    name = "dip_lockout"
+    keypoints = (5, 6, 7, 8, 9, 10)
+    signals = ("keypoint_arrays", "bottom_index")
+
+    ARM = {"left": (5, 7, 9), "right": (6, 8, 10)}
+
+    def evaluate(self, context: AnalysisContext) -> LockoutDecision:
+        kp, conf = context.signal("keypoint_arrays")
+        bottom_idx = context.signal("bottom_index")
+        thresh = context.config['pose']['confidence_threshold']
+        min_angle = context.config.get('lockout', {}).get('min_elbow_angle_deg', 160.0)
+
+        kp, conf = kp[bottom_idx:], conf[bottom_idx:]
+        side_conf = {side: float(conf[:, list(idx)].mean()) if len(conf) else 0.0 for side, idx in self.ARM.items()}
+        side = "left" if side_conf["left"] >= side_conf["right"] else "right"
+        shoulder, elbow, wrist = self.ARM[side]
+
+        upper = kp[:, shoulder] - kp[:, elbow]
+        fore = kp[:, wrist] - kp[:, elbow]
+        norms = np.linalg.norm(upper, axis=1) * np.linalg.norm(fore, axis=1)
+        reliable = np.all(conf[:, [shoulder, elbow, wrist]] > thresh, axis=1) & (norms > 1e-6)
+        if not reliable.any():
+            return LockoutDecision(False, 0.0, bottom_idx, side, ["no_landmarks_for_decision"])
+
+        cos = np.sum(upper[reliable] * fore[reliable], axis=1) / norms[reliable]
+        angles = np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+        best = int(np.argmax(angles))
+        return LockoutDecision(
+            valid=bool(angles[best] >= min_angle),
+            elbow_angle_deg=float(angles[best]),
+            lockout_frame_index=bottom_idx + int(np.flatnonzero(reliable)[best]),
+            selected_side=side,
+            warnings=[]
+        )
+
+    def to_dict(self, result: LockoutDecision) -> Dict[str, Any]:
+        return {
+            "result": "VALID" if result.valid else "INVALID",
+            "elbow_angle_deg": round(result.elbow_angle_deg, 1),
+            "lockout_frame_index": result.lockout_frame_index,
+            "selected_side": result.selected_side,
+            "warnings": result.warnings
+        }
+
+def load_judges(names: List[str], plugins: Optional[List[str]] = None) -> List[Judge]:
+    """
+    Instantiates the requested judges.
+
+    Args:
+        names: Registered judge names.
+        plugins: Modules to import first; importing them registers their judges.
+
+    Returns:
+        List of Judge instances, in the requested order.
+    """
+    for module in plugins or []:
+        importlib.import_module(module)
+    unknown = [n for n in names if n not in JUDGES]
+    if unknown:
+        raise ValueError(f"Unknown judge(s): {', '.join(unknown)}. Available: {', '.join(sorted(JUDGES))}")
+    return [JUDGES[n]() for n in names]
+
+def run_judges(judges: List[Judge], context: AnalysisContext) -> Dict[str, Any]:
+    """
+    Computes the union of the declared signals once and fans out to every judge.
+
+    Returns:
+        Dict mapping judge name to its result object.
+    """
+    for name in dict.fromkeys(s for judge in judges for s in judge.signals):
+        context.signal(name)
+    return {judge.name: judge.evaluate(context) for judge in judges}
+
+def judges_report(judges: List[Judge], verdicts: Dict[str, Any], context: AnalysisContext) -> Dict[str, Any]:
+    """Combined, serializable report section for all judges."""
+    report = {}
+    for judge in judges:
+        entry = judge.to_dict(verdicts[judge.name])
+        entry["keypoint_coverage"] = round(context.keypoint_coverage(judge.keypoints), 2)
+        report[judge.name] = entry
+    return report
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Dict, Any
+from dip_validator.reporting import config_hash
+
+MANIFEST_NAME = "manifest.json"
+
+# Config read by each stage, as sections or section.key paths. A stage's key also
+# covers the key of the stage it reads from (video -> pose -> report -> overlay), so
+# a change upstream rebuilds everything below it.
+STAGE_INPUTS = {
+    "pose": ["pose", "motion_gate"],
+    "report": ["landmarks", "phases", "decision", "judges", "lockout", "output.save_landmarks_trace"],
+    "overlay": ["output.overlay", "output.overlay_show_margin"]
+}
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def config_inputs(config: Dict[str, Any], paths: List[str]) -> Dict[str, Any]:
+    """Values of the given sections / section.key paths (None where missing)."""
+    values = {}
+    for path in paths:
+        section, _, key = path.partition(".")
+        value = config.get(section)
+        values[path] = value.get(key) if key and isinstance(value, dict) else value
+    return values
+
+def stage_key(config: Dict[str, Any], stage: str, upstream: str, extra: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of everything a stage's artifacts depend on."""
+    return config_hash({"upstream": upstream, "config": config_inputs(config, STAGE_INPUTS[stage]), **(extra or {})})
+
+class Manifest:
+    """
+    Input keys of the artifacts in one output directory, stored as manifest.json.
+
+    A stage is up to date when its recorded key matches the key of its current inputs
+    and all the files it wrote are still there.
+    """
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}  # Unreadable manifest: rebuild everything
+
+    def video_digest(self, video_path: str) -> str:
+        """
+        Content hash of the video. Reused while the file's size and modification time
+        are unchanged, so unchanged videos are not read again.
+        """
+        stat = os.stat(video_path)
+        entry = self.entries.get("video")
+        if entry and entry['size'] == stat.st_size and abs(entry['mtime'] - stat.st_mtime) < 1e-3:
+            return entry['sha256']
+        digest = file_digest(video_path)
+        self.entries["video"] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+        return digest
+
+    def fresh(self, stage: str, key: str) -> bool:
+        entry = self.entries.get(stage)
+        return (entry is not None and entry['key'] == key
+                and all(os.path.exists(os.path.join(self.output_dir, name)) for name in entry['files']))
+
+    def info(self, stage: str, name: str, default: Any = None) -> Any:
+        return self.entries.get(stage, {}).get(name, default)
+
+    def record(self, stage: str, key: str, files: List[str], **info: Any) -> None:
+        """Records a stage's key and output files (names relative to the output directory)."""
+        self.entries[stage] = {"key": key, "files": files, **info}
+        self.save()
+
+    def save(self) -> None:
+        # Written to a temporary file first so an interrupted run never leaves half a manifest
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,136 @@
+import cv2
+import numpy as np
+from typing import List, Optional, Dict, Any, Callable
+from .pose import PoseResult, interpolate_poses
+from .phases import compute_depth_signal, smooth_signal, detect_bottom_frame
+
+class MotionGate:
+    """
+    Cheap per-frame test, run in the decode stage, deciding which frames can skip pose
+    estimation: those whose downscaled greyscale image barely differs from the last frame
+    that went through the model (static holds at the top, waiting for the command,
+    standing after lockout).
+
+    Comparing with the last estimated frame rather than the previous one lets slow
+    motion accumulate until it triggers an estimate. Skipped frames are filled by
+    interpolation in finish(), after the frames around the detected bottom have been
+    estimated anyway.
+    """
+    def __init__(
+        self,
+        width: int = 96,
+        pixel_delta: int = 10,
+        min_changed: float = 0.005,
+        max_skip: int = 15,
+        bottom_guard: int = 15,
+        conf_threshold: float = 0.3,
+        smoothing_window: int = 15,
+        smoothing_polyorder: int = 2
+    ):
+        """
+        Args:
+            width: Width of the greyscale thumbnail compared between frames.
+            pixel_delta: Grey-level change counted as a changed thumbnail pixel.
+            min_changed: Fraction of changed pixels below which a frame is skipped.
+            max_skip: Consecutive frames skipped at most before an estimate is forced.
+            bottom_guard: Frames on each side of the detected bottom that are always estimated.
+            conf_threshold, smoothing_window, smoothing_polyorder: Depth signal and
+                smoothing used to locate the bottom (as in the phases section).
+        """
+        self.width = width
+        self.pixel_delta = pixel_delta
+        self.min_changed = min_changed
+        self.max_skip = max_skip
+        self.bottom_guard = bottom_guard
+        self.signal_params = {"conf_threshold": conf_threshold, "window": smoothing_window,
+                              "polyorder": smoothing_polyorder}
+        self.skipped: List[bool] = []
+        self.refilled = 0
+        self.key: Optional[np.ndarray] = None
+        self.run = 0
+
+    def thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height = max(1, round(grey.shape[0] * self.width / grey.shape[1]))
+        return cv2.resize(grey, (self.width, height), interpolation=cv2.INTER_AREA)
+
+    def update(self, frame: np.ndarray) -> bool:
+        """Feeds the next decoded frame; True if it may skip pose estimation."""
+        small = self.thumbnail(frame)
+        skip = (
+            self.key is not None
+            and self.run < self.max_skip
+            and np.mean(cv2.absdiff(small, self.key) > self.pixel_delta) < self.min_changed
+        )
+        if skip:
+            self.run += 1
+        else:
+            self.key, self.run = small, 0
+        self.skipped.append(bool(skip))
+        return bool(skip)
+
+    def finish(self, poses: List[Optional[PoseResult]],
+               estimate: Callable[[int, int], Optional[PoseResult]]) -> List[Optional[PoseResult]]:
+        """
+        Completes the poses of a pass that skipped the frames flagged by update().
+
+        The bottom is located on the interpolated poses; skipped frames within
+        bottom_guard of it, and a skipped last frame (nothing to interpolate towards),
+        are sent to the model in frame order through `estimate(frame_index, nearest)`.
+        `nearest` is the closest frame already estimated: these frames come after the
+        whole pass, so the caller must restart lifter tracking from that frame's box
+        rather than continue from the end of the video. The remaining skipped frames
+        are interpolated (PoseResult.interpolated).
+
+        Returns:
+            Per-frame results.
+        """
+        poses = list(poses)
+        num_frames = len(poses)
+        if not any(self.skipped):
+            return poses
+        depth = compute_depth_signal(interpolate_poses(poses, self.skipped), self.signal_params["conf_threshold"])
+        bottom = detect_bottom_frame(smooth_signal(depth, self.signal_params["window"], self.signal_params["polyorder"]))
+        guard = range(max(0, bottom - self.bottom_guard), min(num_frames, bottom + self.bottom_guard + 1))
+        for i in [*guard, num_frames - 1]:
+            if self.skipped[i]:
+                poses[i] = estimate(i, self.nearest_estimated(i))
+                self.skipped[i] = False
+                self.refilled += 1
+        return interpolate_poses(poses, self.skipped)
+
+    def nearest_estimated(self, i: int) -> int:
+        """Closest frame to i that went through the model (the earlier one on ties)."""
+        for distance in range(1, len(self.skipped)):
+            for j in (i - distance, i + distance):
+                if 0 <= j < len(self.skipped) and not self.skipped[j]:
+                    return j
+        return i
+
+    def to_dict(self) -> Dict[str, Any]:
+        num_frames = len(self.skipped)
+        skipped = sum(self.skipped)
+        return {
+            "frames": num_frames,
+            "estimated": num_frames - skipped,
+            "skipped": skipped,
+            "refilled": self.refilled,
+            "skip_rate": round(skipped / num_frames, 3) if num_frames else 0.0
+        }
+
+def create_motion_gate(config: Dict[str, Any]) -> Optional[MotionGate]:
+    """MotionGate from the config's motion_gate section, or None if disabled."""
+    gate_cfg = config.get('motion_gate', {})
+    if not gate_cfg.get('enabled', False):
+        return None
+    phases_cfg = config.get('phases', {})
+    return MotionGate(
+        width=gate_cfg.get('width', 96),
+        pixel_delta=gate_cfg.get('pixel_delta', 10),
+        min_changed=gate_cfg.get('min_changed', 0.005),
+        max_skip=gate_cfg.get('max_skip', 15),
+        bottom_guard=gate_cfg.get('bottom_guard', 15),
+        conf_threshold=config['pose']['confidence_threshold'],
+        smoothing_window=phases_cfg.get('smoothing_window', 15),
+        smoothing_polyorder=phases_cfg.get('smoothing_polyorder', 2)
+    )
@@ -0,0 +1,241 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from scipy.signal import correlate, correlation_lags
+from typing import List, Optional, Dict, Any, Tuple
+from dip_validator.video_io import load_video
+from dip_validator.pose import PoseEstimator, MODEL_MODES, poses_to_arrays, arrays_to_poses
+from dip_validator.phases import depth_value
+from dip_validator.rules import DipDecision, interpolate_peak
+from dip_validator.judges import AnalysisContext, DipDepthJudge
+from dip_validator.reporting import generate_report
+
+@dataclass
+class ViewAnalysis:
+    """One camera view: its poses, shared signals and depth verdict."""
+    video_path: str
+    context: AnalysisContext
+    decision: DipDecision
+    offset_s: Optional[float] = 0.0  # Time of this view's events minus the reference view's (None: not aligned)
+    pose_time_s: float = 0.0
+
+    @property
+    def usable(self) -> bool:
+        """False when the view has no depth signal to align or judge (no frames, lifter never detected)."""
+        return has_signal(alignment_signal(self.context))
+
+def estimate_view_poses(video_path: str, config: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any], float]:
+    """
+    Decodes one view and runs pose estimation on it (process pool worker).
+    
+    Returns:
+        Keypoint and confidence arrays (see poses_to_arrays), video metadata and pose time in seconds.
+    """
+    frames, meta = load_video(video_path)
+    estimator = PoseEstimator(device=config['pose']['device'], mode=MODEL_MODES.get(config['pose']['model'], "balanced"),
+                              lifter_weights=config['pose'].get('lifter_selection'))
+    start = time.perf_counter()
+    poses = estimator.estimate_poses(frames, conf_threshold=config['pose']['confidence_threshold'])
+    # Arrays pickle far smaller and faster than frames or PoseResult lists
+    keypoints, confidences = poses_to_arrays(poses)
+    return keypoints, confidences, meta, time.perf_counter() - start
+
+def analyze_view(video_path: str, poses, meta: Dict[str, Any], config: Dict[str, Any]) -> ViewAnalysis:
+    context = AnalysisContext(poses, meta, config)
+    return ViewAnalysis(video_path, context, DipDepthJudge().evaluate(context))
+
+def alignment_signal(context: AnalysisContext) -> np.ndarray:
+    """Depth signal with the frames before the first detection held at the first value."""
+    signal = context.signal("depth_signal").astype(np.float64)
+    thresh = context.config['pose']['confidence_threshold']
+    first = next((i for i, pose in enumerate(context.poses) if depth_value(pose, thresh) is not None), 0)
+    signal[:first] = signal[first] if len(signal) else 0.0
+    return signal
+
+def has_signal(signal: np.ndarray) -> bool:
+    return len(signal) > 1 and float(np.ptp(signal)) > 1e-6
+
+def _resample(signal: np.ndarray, fps: float, target_fps: float) -> np.ndarray:
+    if len(signal) == 0:
+        return signal
+    t = np.arange(len(signal)) / fps
+    n = int(np.floor(t[-1] * target_fps)) + 1
+    return np.interp(np.arange(n) / target_fps, t, signal)
+
+def estimate_time_offset(
+    reference: np.ndarray,
+    other: np.ndarray,
+    fps_ref: float,
+    fps_other: float,
+    max_lag_s: Optional[float] = None,
+    min_overlap: float = 0.5
+) -> Optional[float]:
+    """
+    Time offset between two views from the cross-correlation of their depth signals.
+    
+    The signals are resampled to a common rate and scored at every lag with the Pearson
+    correlation of their overlapping parts, which is insensitive to the scale and offset
+    of each view (camera distance, framing) and not biased towards any lag. Lags
+    overlapping less than `min_overlap` of the shorter signal are ignored. The peak is
+    refined with a parabola to sub-frame precision.
+    
+    Returns:
+        Offset in seconds: an event at time t in `reference` happens at t + offset in `other`,
+        or None if no lag can be scored (empty or flat signal).
+    """
+    if fps_other != fps_ref:
+        other = _resample(other, fps_other, fps_ref)
+    a, b = np.asarray(reference, dtype=np.float64), np.asarray(other, dtype=np.float64)
+    if not (has_signal(a) and has_signal(b)):
+        return None
+    
+    # Pearson correlation over the overlapping samples at every lag: the cross term
+    # comes from one FFT correlation, the per-overlap sums from cumulative sums
+    cross = correlate(b, a, mode='full', method='fft')
+    lags = correlation_lags(len(b), len(a), mode='full')
+    n0 = np.maximum(0, -lags)
+    n1 = np.minimum(len(a), len(b) - lags)
+    n = (n1 - n0).astype(np.float64)
+    
+    def window_sums(x, lo, hi):
+        c = np.concatenate(([0.0], np.cumsum(x)))
+        return c[hi] - c[lo]
+    
+    sum_a, sum_aa = window_sums(a, n0, n1), window_sums(a * a, n0, n1)
+    sum_b, sum_bb = window_sums(b, n0 + lags, n1 + lags), window_sums(b * b, n0 + lags, n1 + lags)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = cross - sum_a * sum_b / n
+        var = (sum_aa - sum_a ** 2 / n) * (sum_bb - sum_b ** 2 / n)
+        pearson = cov / np.sqrt(var)
+    
+    usable = (n >= min_overlap * min(len(a), len(b))) & (var > 1e-12)
+    if max_lag_s is not None:
+        usable &= np.abs(lags) <= max_lag_s * fps_ref
+    score = np.where(usable, pearson, -np.inf)
+    if not np.isfinite(score).any():
+        return None
+    
+    best = int(np.argmax(score))
+    lag = float(lags[best])
+    if 0 < best < len(score) - 1 and np.isfinite(score[best - 1]) and np.isfinite(score[best + 1]):
+        lag += interpolate_peak(score[best - 1], score[best], score[best + 1])[0]
+    return lag / fps_ref
+
+def fuse_views(views: List[ViewAnalysis], tolerance_s: Optional[float] = None) -> Tuple[DipDecision, int]:
+    """
+    Issues one decision for all views: the verdict of the usable view with the highest
+    landmark confidence around its bottom, unchanged. The views' margins are not combined,
+    and the time offsets are only used to check that the views agree.
+    
+    Warnings are added when a view is unusable, and when the usable views disagree on the
+    verdict or, once aligned, on the time of the bottom (by more than `tolerance_s`,
+    default one bottom window).
+    
+    Returns:
+        Fused decision and index of the selected view.
+    """
+    usable = [i for i, v in enumerate(views) if v.usable]
+    selected = max(usable or range(len(views)), key=lambda i: views[i].decision.confidence)
+    decision = views[selected].decision
+    warnings = list(decision.warnings)
+    
+    if len(usable) < len(views):
+        warnings.append("unusable_view")
+    if len({views[i].decision.valid for i in usable}) > 1:
+        warnings.append("views_disagree_on_result")
+    
+    bottoms = [views[i].decision.bottom_time_s - views[i].offset_s for i in usable
+               if views[i].decision.bottom_time_s is not None and views[i].offset_s is not None]
+    if tolerance_s is None:
+        fps = views[selected].context.meta.get('fps', 30.0) or 30.0
+        tolerance_s = views[selected].context.config['phases']['bottom_window'] / fps
+    if len(bottoms) > 1 and max(bottoms) - min(bottoms) > tolerance_s:
+        warnings.append("views_disagree_on_bottom")
+    
+    return replace(decision, warnings=warnings), selected
+
+def run_multiview(video_paths: List[str], config: Dict[str, Any], workers: Optional[int] = None) -> Tuple[List[ViewAnalysis], DipDecision, int]:
+    """
+    Estimates pose on every view concurrently (one worker process per view), aligns
+    the views in time against the first usable one and fuses their decisions.
+    """
+    with ProcessPoolExecutor(max_workers=workers or len(video_paths)) as pool:
+        outputs = list(pool.map(estimate_view_poses, video_paths, [config] * len(video_paths)))
+    
+    views = []
+    for path, (keypoints, confidences, meta, pose_time) in zip(video_paths, outputs):
+        view = analyze_view(path, arrays_to_poses(keypoints, confidences), meta, config)
+        view.pose_time_s = pose_time
+        views.append(view)
+    
+    max_lag = config.get('multiview', {}).get('max_offset_s')
+    reference = next((v for v in views if v.usable), views[0])
+    for view in views:
+        if view is not reference:
+            view.offset_s = estimate_time_offset(alignment_signal(reference.context), alignment_signal(view.context),
+                                                 reference.context.meta['fps'], view.context.meta['fps'], max_lag)
+    
+    decision, selected = fuse_views(views)
+    return views, decision, selected
+
+def multiview_report(views: List[ViewAnalysis], selected: int) -> Dict[str, Any]:
+    return {
+        "selected_view": os.path.basename(views[selected].video_path),
+        "views": [{
+            "video": os.path.basename(v.video_path),
+            "usable": v.usable,
+            "offset_s": None if v.offset_s is None else round(v.offset_s, 4),
+            "result": "VALID" if v.decision.valid else "INVALID",
+            "deciding_margin_px": round(v.decision.deciding_margin_px, 2),
+            "best_margin_px": round(v.decision.best_margin_px, 2),
+            "confidence": round(v.decision.confidence, 2),
+            "bottom_frame_index": v.decision.bottom_frame_index,
+            "pose_time_s": round(v.pose_time_s, 2)
+        } for v in views]
+    }
+
+def main(argv: Optional[List[str]] = None):
+    from dip_validator.cli import load_config, create_landmarks_trace
+
+    parser = argparse.ArgumentParser(prog="dip_validator multiview", description="One decision from several views of a lift")
+    parser.add_argument("video_paths", nargs="+", help="Videos of the same attempt (the first usable one is the time reference)")
+    parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument("--config", default="configs/default.yaml", help="Path to config file")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        video_basename = os.path.splitext(os.path.basename(args.video_paths[0]))[0]
+        output_dir = os.path.join(args.output_dir, f"{video_basename}_multiview")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        print(f"Analysing {len(args.video_paths)} views concurrently...")
+        start = time.perf_counter()
+        views, decision, selected = run_multiview(args.video_paths, config)
+        print(f"Views analysed in {time.perf_counter() - start:.1f}s")
+        
+        view = views[selected]
+        trace = None
+        if config['output']['save_landmarks_trace']:
+            left_refined, right_refined = view.context.signal("refined_landmarks")
+            trace = create_landmarks_trace(left_refined if decision.selected_side == "left" else right_refined)
+        report_path = generate_report(view.video_path, decision, len(view.context.poses), view.context.meta['fps'],
+                                      output_dir, trace, {"multiview": multiview_report(views, selected)})
+        
+        for v in views:
+            offset = "not aligned" if v.offset_s is None else f"offset {v.offset_s:+.3f}s"
+            print(f"  {os.path.basename(v.video_path)}: {offset}, confidence {v.decision.confidence:.2f}"
+                  f"{'' if v.usable else ' (unusable)'}")
+        print(f"\nResult: {'VALID' if decision.valid else 'INVALID'} from {os.path.basename(view.video_path)} "
+              f"(Margin: {decision.deciding_margin_px:.1f}px)")
+        print(f"Report saved: {report_path}")
+        
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
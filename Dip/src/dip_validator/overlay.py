@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+PHASE_COLORS = {"bottom": (0, 255, 255), "descending": (0, 165, 255), "ascending": (0, 255, 0)}
+
+@dataclass
+class Sprite:
+    """Pre-rasterised text cropped to the drawn pixels."""
+    bgr: np.ndarray  # (h, w, 3) uint8 text colour
+    mask: np.ndarray  # (h, w) uint8 coverage, 0-255
+    color: np.ndarray  # (h, w, 3) float32, alpha * BGR + 0.5 (premultiplied, rounding folded in)
+    inv_alpha: np.ndarray  # (h, w, 3) float32, 1 - alpha
+    binary: bool  # Coverage is 0/255 only (cv2.LINE_8 text)
+    dx: int  # Offset of the top-left corner from the cv2.putText origin
+    dy: int
+
+def render_text_sprite(
+    text: str,
+    font_scale: float,
+    color: Tuple[int, int, int],
+    thickness: int,
+    font: int = FONT,
+    line_type: int = cv2.LINE_8
+) -> Sprite:
+    """Rasterises text once with cv2.putText into an alpha mask."""
+    (w, h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+    pad = 2 * thickness + 2
+    mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+    org = (pad, pad + h)
+    cv2.putText(mask, text, org, font, font_scale, 255, thickness, line_type)
+
+    ys, xs = np.nonzero(mask)
+    if len(ys) == 0:
+        y0 = y1 = x0 = x1 = 0
+    else:
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+    mask = np.ascontiguousarray(mask[y0:y1, x0:x1])
+    alpha = np.repeat((mask.astype(np.float32) / 255.0)[..., None], 3, axis=2)
+    return Sprite(
+        bgr=np.full(mask.shape + (3,), color, dtype=np.uint8),
+        mask=mask,
+        color=alpha * np.array(color, dtype=np.float32) + 0.5,
+        inv_alpha=1.0 - alpha,
+        binary=bool(np.all((mask == 0) | (mask == 255))),
+        dx=int(x0 - org[0]),
+        dy=int(y0 - org[1])
+    )
+
+def blit(canvas: np.ndarray, sprite: Sprite, org: Tuple[int, int]) -> None:
+    """Composites a sprite into the canvas in place, touching only its ROI."""
+    h, w = sprite.mask.shape
+    x0, y0 = org[0] + sprite.dx, org[1] + sprite.dy
+    # Clip the ROI to the frame
+    cx0, cy0 = max(x0, 0), max(y0, 0)
+    cx1, cy1 = min(x0 + w, canvas.shape[1]), min(y0 + h, canvas.shape[0])
+    if cx0 >= cx1 or cy0 >= cy1:
+        return
+
+    sy, sx = slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0)
+    roi = canvas[cy0:cy1, cx0:cx1]
+    if sprite.binary:
+        # Hard-edged text: a masked copy is the exact composite and runs natively
+        cv2.copyTo(sprite.bgr[sy, sx], sprite.mask[sy, sx], roi)
+        return
+    # Anti-aliased text: roi * (1 - alpha) + alpha * color, in float32 over the ROI only
+    blended = cv2.multiply(roi, sprite.inv_alpha[sy, sx], dtype=cv2.CV_32F)
+    cv2.add(blended, sprite.color[sy, sx], dst=blended)
+    roi[:] = blended
+
+class SpriteCache:
+    """
+    Text sprites rendered on first use and reused on every later frame.
+
+    Fixed labels (phase names, VALID/INVALID) are cached as whole strings; strings that
+    change every frame (margin values) are composed from cached per-character glyphs.
+    """
+    def __init__(self, font: int = FONT):
+        self.font = font
+        self._sprites: Dict[Tuple, Sprite] = {}
+        self._advances: Dict[Tuple, float] = {}
+
+    def sprite(self, text: str, font_scale: float, color: Tuple[int, int, int], thickness: int) -> Sprite:
+        key = (text, font_scale, tuple(color), thickness)
+        if key not in self._sprites:
+            self._sprites[key] = render_text_sprite(text, font_scale, color, thickness, self.font)
+        return self._sprites[key]
+
+    def advance(self, char: str, font_scale: float, thickness: int) -> float:
+        """Sub-pixel horizontal advance of a glyph, matching cv2.putText layout."""
+        key = (char, font_scale, thickness)
+        if key not in self._advances:
+            width = cv2.getTextSize(char * 100, self.font, font_scale, thickness)[0][0]
+            self._advances[key] = (width - thickness) / 100
+        return self._advances[key]
+
+    def draw_text(self, canvas: np.ndarray, text: str, org: Tuple[int, int],
+                  font_scale: float, color: Tuple[int, int, int], thickness: int) -> None:
+        """Equivalent of cv2.putText for text that repeats across frames."""
+        blit(canvas, self.sprite(text, font_scale, color, thickness), org)
+
+    def draw_glyphs(self, canvas: np.ndarray, text: str, org: Tuple[int, int],
+                    font_scale: float, color: Tuple[int, int, int], thickness: int) -> None:
+        """Equivalent of cv2.putText for varying text, composed from cached glyphs."""
+        x = float(org[0])
+        for char in text:
+            blit(canvas, self.sprite(char, font_scale, color, thickness), (int(round(x)), org[1]))
+            x += self.advance(char, font_scale, thickness)
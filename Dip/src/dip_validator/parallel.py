@@ -0,0 +1,280 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+import traceback
+import cv2
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from dip_validator.video_io import open_video, iter_video, video_metadata
+from dip_validator.pose import PoseEstimator, PoseResult, LifterTracker, scale_pose
+from dip_validator.refinement import refine_landmarks
+from dip_validator.pipeline import PipelineResult
+
+class FrameRing:
+    """
+    Fixed number of frame slots in one shared memory block. The decoder writes a frame
+    into a free slot and passes only the slot number to a worker, which reads it in
+    place; the worker hands the slot back once its inference is done.
+    """
+    def __init__(self, slots: int, frame_shape: Tuple[int, ...], name: Optional[str] = None):
+        self.slots = slots
+        self.frame_shape = tuple(frame_shape)
+        size = slots * int(np.prod(self.frame_shape))
+        self.owner = name is None
+        self.shm = SharedMemory(name=name, create=self.owner, size=size)
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        # Views on the buffer must be gone before the mapping can be closed
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _pose_worker(
+    worker_id: int,
+    ring_name: str,
+    slots: int,
+    frame_shape: Tuple[int, ...],
+    config: Dict[str, Any],
+    estimator_factory: Callable[[Dict[str, Any]], PoseEstimator],
+    work: "mp.Queue",
+    free: "mp.Queue",
+    results: "mp.Queue"
+):
+    """
+    Worker process: runs the person detector on ("detect", frame index, slot) items and
+    the pose model on ("pose", frame index, slot, lifter box) items, until it receives None.
+
+    Detection returns every person's box; the lifter is picked in the parent, which sees
+    the boxes of every frame in order. A worker only sees some of the frames, so tracking
+    the lifter there would depend on how the frames happened to be dealt out.
+    """
+    ring = None
+    items, busy = 0, 0.0
+    try:
+        ring = FrameRing(slots, frame_shape, name=ring_name)
+        estimator = estimator_factory(config)
+        conf_thresh = config['pose']['confidence_threshold']
+        scale = config['pose'].get('inference_scale', 1.0)
+        while True:
+            item = work.get()
+            if item is None:
+                break
+            kind, idx, slot = item[:3]
+            start = time.perf_counter()
+            frame = ring.frames[slot]
+            if scale != 1.0:
+                frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            if kind == "detect":
+                boxes = np.asarray(estimator.detect_people(frame), dtype=np.float64).reshape(-1, 4)
+                shape = frame.shape[:2]
+                del frame
+                busy += time.perf_counter() - start
+                results.put(("people", idx, boxes, shape))
+                continue
+            pose = scale_pose(estimator.estimate_crop(frame, item[3], conf_thresh), 1.0 / scale)
+            del frame
+            free.put(slot)
+            busy += time.perf_counter() - start
+            items += 1
+            if pose is None:
+                results.put(("pose", idx, None))
+            else:
+                results.put(("pose", idx, (pose.keypoints, pose.confidences, pose.bbox)))
+    except BaseException:
+        results.put(("error", worker_id, traceback.format_exc()))
+    finally:
+        frame = None  # Release the view on the ring before closing it
+        if ring is not None:
+            ring.close()
+        results.put(("done", worker_id, items, busy))
+
+def _default_factory(config: Dict[str, Any]) -> PoseEstimator:
+    from dip_validator.cli import create_estimator
+    return create_estimator(config)
+
+def run_parallel_poses(
+    video_path: str,
+    config: Dict[str, Any],
+    processes: int,
+    index_path: Optional[str] = None,
+    ring_slots: Optional[int] = None,
+    estimator_factory: Callable[[Dict[str, Any]], PoseEstimator] = _default_factory
+) -> PipelineResult:
+    """
+    Runs pose estimation on one video across several worker processes.
+
+    A decoder thread in this process fills a FrameRing in shared memory, and workers
+    read the frames from it in place. Only slot numbers go to the workers and only
+    keypoints come back, so frames are never pickled. Results arrive out of order and
+    are put back in frame order before refinement. Decoding stays in this process
+    because the frames are kept for the overlay.
+
+    Each frame goes through the workers twice: once for the person detector, then, with
+    the lifter's box, for the pose model. Detection results come back out of order; this
+    process picks the lifter among them in frame order (LifterTracker, as the sequential
+    path does) before queueing the pose. Both models run in parallel, and the poses do
+    not depend on the number of workers.
+
+    Args:
+        video_path: Path to input video.
+        config: Loaded config; each worker builds its own estimator from it.
+        processes: Number of pose worker processes.
+        index_path: Where to persist the frame index (see video_io.load_video).
+        ring_slots: Frames in flight (default: 4 per worker).
+        estimator_factory: Builds each worker's estimator from the config (must be picklable).
+
+    Returns:
+        PipelineResult with frames, metadata, ordered poses, raw landmarks and
+        per-worker statistics.
+    """
+    ref_params = {
+        "elbow_offset_ratio": config['landmarks']['elbow_offset_ratio'],
+        "deltoid_offset_ratio": config['landmarks']['deltoid_offset_ratio']
+    }
+    ring_slots = ring_slots or 4 * processes
+    tracker = LifterTracker(config['pose'].get('lifter_selection'))
+
+    cap = open_video(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_iter = iter_video(cap)
+    first = next(frame_iter, None)
+    if first is None:
+        cap.release()
+        raise ValueError(f"No frames read from video: {video_path}")
+
+    # Spawned, not forked: the parent may already hold ONNX Runtime sessions and threads
+    ctx = mp.get_context("spawn")
+    ring = FrameRing(ring_slots, first[0].shape)
+    work, free, results = ctx.Queue(), ctx.Queue(), ctx.Queue()
+    for slot in range(ring_slots):
+        free.put(slot)
+    workers = [ctx.Process(target=_pose_worker, daemon=True,
+                           args=(i, ring.name, ring_slots, ring.frame_shape, config, estimator_factory, work, free, results))
+               for i in range(processes)]
+
+    frames: List[np.ndarray] = []
+    timestamps: List[float] = []
+    stop = threading.Event()
+    slots: Dict[int, int] = {}
+    decode_stats = {"busy_s": 0.0, "done": False, "errors": []}
+
+    def decode():
+        try:
+            item = first
+            while item is not None and not stop.is_set():
+                frame, timestamp = item
+                while not stop.is_set():
+                    try:
+                        slot = free.get(timeout=0.05)
+                        break
+                    except queue.Empty:
+                        continue
+                else:
+                    return
+                start = time.perf_counter()
+                ring.frames[slot] = frame
+                slots[len(frames)] = slot
+                work.put(("detect", len(frames), slot))
+                frames.append(frame)
+                timestamps.append(timestamp)
+                item = next(frame_iter, None)
+                decode_stats["busy_s"] += time.perf_counter() - start
+        except BaseException as e:
+            decode_stats["errors"].append(e)
+        finally:
+            decode_stats["done"] = True
+
+    decoder = threading.Thread(target=decode, name="decode", daemon=True)
+    poses: Dict[int, Optional[PoseResult]] = {}
+    people: Dict[int, Tuple[np.ndarray, Tuple[int, int]]] = {}
+    next_track = 0  # First frame whose lifter has not been picked yet
+    worker_stats: Dict[int, Tuple[int, float]] = {}
+    track_busy = 0.0
+    stopping = False
+    start = time.perf_counter()
+    try:
+        for w in workers:
+            w.start()
+        decoder.start()
+        while len(worker_stats) < len(workers):
+            if decode_stats["errors"]:
+                raise decode_stats["errors"][0]
+            if not stopping and decode_stats["done"] and next_track == len(frames):
+                # Every frame has its pose queued: the workers stop once they are done
+                for _ in workers:
+                    work.put(None)
+                stopping = True
+            try:
+                msg = results.get(timeout=0.1)
+            except queue.Empty:
+                dead = [w for w in workers if w.exitcode not in (None, 0)]
+                if dead:
+                    raise RuntimeError(f"Pose worker exited with code {dead[0].exitcode}")
+                continue
+            if msg[0] == "people":
+                _, idx, boxes, shape = msg
+                people[idx] = (boxes, shape)
+                track_start = time.perf_counter()
+                while next_track in people:
+                    bbox = tracker.track(*people.pop(next_track))
+                    work.put(("pose", next_track, slots.pop(next_track), bbox))
+                    next_track += 1
+                track_busy += time.perf_counter() - track_start
+            elif msg[0] == "pose":
+                _, idx, arrays = msg
+                poses[idx] = None if arrays is None else PoseResult(*arrays)
+            elif msg[0] == "error":
+                raise RuntimeError(f"Pose worker {msg[1]} failed:\n{msg[2]}")
+            else:
+                worker_stats[msg[1]] = (msg[2], msg[3])
+        decoder.join()
+        if decode_stats["errors"]:
+            raise decode_stats["errors"][0]
+    finally:
+        stop.set()
+        if decoder.is_alive():
+            decoder.join()
+        for w in workers:
+            w.join(timeout=5)
+            if w.is_alive():
+                w.terminate()
+        cap.release()
+        ring.close()
+    wall = time.perf_counter() - start
+
+    ordered = [poses[i] for i in range(len(frames))]
+    raw_l = [refine_landmarks(p, "left", **ref_params) for p in ordered]
+    raw_r = [refine_landmarks(p, "right", **ref_params) for p in ordered]
+    meta = video_metadata(video_path, fps, frames[0].shape, timestamps, index_path)
+
+    pose_busy = max((busy for _, busy in worker_stats.values()), default=0.0)
+    decode_busy = decode_stats["busy_s"] + track_busy
+    return PipelineResult(
+        frames=frames,
+        meta=meta,
+        poses=ordered,
+        raw_landmarks=(raw_l, raw_r),
+        stats={
+            "wall_s": round(wall, 3),
+            "fps": round(len(ordered) / wall, 2) if wall > 0 else 0.0,
+            "processes": processes,
+            "bottleneck": "decode" if decode_busy > pose_busy else "pose",
+            "stages": {
+                "decode": {"items": len(frames), "busy_s": round(decode_stats["busy_s"], 3),
+                           "utilisation": round(decode_stats["busy_s"] / wall, 3) if wall > 0 else 0.0},
+                "track": {"items": len(frames), "busy_s": round(track_busy, 3),
+                          "utilisation": round(track_busy / wall, 3) if wall > 0 else 0.0},
+                **{f"pose[{i}]": {"items": items, "busy_s": round(busy, 3),
+                                  "utilisation": round(busy / wall, 3) if wall > 0 else 0.0}
+                   for i, (items, busy) in sorted(worker_stats.items())}
+            }
+        }
+    )
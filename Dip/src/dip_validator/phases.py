@@ -1,8 +1,40 @@
 import numpy as np
 from scipy.signal import savgol_filter
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from .pose import PoseResult
 
+# Indices for COCO keypoints
+L_SHOULDER, R_SHOULDER = 5, 6
+L_HIP, R_HIP = 11, 12
+
+def depth_value(pose: Optional[PoseResult], conf_threshold: float = 0.3) -> Optional[float]:
+    """
+    Depth proxy for a single frame: mean hip y, falling back to mean shoulder y.
+    
+    Returns:
+        Optional[float]: Depth value, or None if neither hips nor shoulders are confident.
+    """
+    if pose is None:
+        return None
+        
+    kp = pose.keypoints
+    conf = pose.confidences
+    
+    # Try to use hips first (usually more stable depth proxy)
+    hip_y = []
+    if conf[L_HIP] > conf_threshold: hip_y.append(kp[L_HIP, 1])
+    if conf[R_HIP] > conf_threshold: hip_y.append(kp[R_HIP, 1])
+    if hip_y:
+        return float(np.mean(hip_y))
+        
+    # Fallback to shoulders
+    shoulder_y = []
+    if conf[L_SHOULDER] > conf_threshold: shoulder_y.append(kp[L_SHOULDER, 1])
+    if conf[R_SHOULDER] > conf_threshold: shoulder_y.append(kp[R_SHOULDER, 1])
+    if shoulder_y:
+        return float(np.mean(shoulder_y))
+    return None
+
 def compute_depth_signal(poses: List[Optional[PoseResult]], conf_threshold: float = 0.3) -> np.ndarray:
     """
     Computes a 1D depth signal from pose results using hip or shoulder y-coordinates.
@@ -15,41 +47,24 @@ def compute_depth_signal(poses: List[Optional[PoseResult]], conf_threshold: floa
         np.ndarray: 1D array of depth values per frame.
     """
     signal = []
-    
-    # Indices for COCO keypoints
-    L_SHOULDER, R_SHOULDER = 5, 6
-    L_HIP, R_HIP = 11, 12
-    
     for pose in poses:
-        if pose is None:
-            # If no pose, use the last known value or 0 if it's the first frame
-            signal.append(signal[-1] if signal else 0.0)
-            continue
-            
-        kp = pose.keypoints
-        conf = pose.confidences
-        
-        # Try to use hips first (usually more stable depth proxy)
-        hip_y = []
-        if conf[L_HIP] > conf_threshold: hip_y.append(kp[L_HIP, 1])
-        if conf[R_HIP] > conf_threshold: hip_y.append(kp[R_HIP, 1])
-        
-        if hip_y:
-            signal.append(np.mean(hip_y))
-        else:
-            # Fallback to shoulders
-            shoulder_y = []
-            if conf[L_SHOULDER] > conf_threshold: shoulder_y.append(kp[L_SHOULDER, 1])
-            if conf[R_SHOULDER] > conf_threshold: shoulder_y.append(kp[R_SHOULDER, 1])
-            
-            if shoulder_y:
-                signal.append(np.mean(shoulder_y))
-            else:
-                # If neither hips nor shoulders, use last known value
-                signal.append(signal[-1] if signal else 0.0)
-                
+        value = depth_value(pose, conf_threshold)
+        # If no usable keypoints, use the last known value or 0 if it's the first frame
+        signal.append(value if value is not None else (signal[-1] if signal else 0.0))
     return np.array(signal)
 
+def savgol_window(length: int, window: int, polyorder: int) -> int:
+    """
+    Returns the usable Savitzky-Golay window for a signal, or 0 if the signal is too short.
+    batch.batch_savgol uses it too, so batch scoring smooths short clips the same way.
+    """
+    if length >= window:
+        return window
+    # If signal is too short for the window, use the largest odd window that fits
+    if length > polyorder + 1:
+        return length if length % 2 != 0 else length - 1
+    return 0
+
 def smooth_signal(signal: np.ndarray, window: int = 15, polyorder: int = 2) -> np.ndarray:
     """
     Applies Savitzky-Golay filter to smooth the depth signal.
@@ -62,14 +77,28 @@ def smooth_signal(signal: np.ndarray, window: int = 15, polyorder: int = 2) -> n
     Returns:
         np.ndarray: Smoothed signal.
     """
-    if len(signal) < window:
-        # If signal is too short for the window, return it as is or use a smaller window
-        if len(signal) > polyorder + 1:
-            w = len(signal) if len(signal) % 2 != 0 else len(signal) - 1
-            return savgol_filter(signal, w, polyorder)
+    w = savgol_window(len(signal), window, polyorder)
+    if w == 0:
         return signal
+    return savgol_filter(signal, w, polyorder)
+
+def smooth_signal_with_derivative(signal: np.ndarray, window: int = 15, polyorder: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Smooths the depth signal and returns its first derivative from the same local polynomial fits.
+    
+    Args:
+        signal: 1D array of depth values.
+        window: The length of the filter window.
+        polyorder: The order of the polynomial used to fit the samples.
         
-    return savgol_filter(signal, window, polyorder)
+    Returns:
+        Tuple of the smoothed signal and its derivative (depth units per frame).
+    """
+    w = savgol_window(len(signal), window, polyorder)
+    if w == 0:
+        derivative = np.gradient(signal) if len(signal) > 1 else np.zeros(len(signal))
+        return signal, derivative
+    return savgol_filter(signal, w, polyorder), savgol_filter(signal, w, polyorder, deriv=1)
 
 def detect_bottom_frame(smoothed_signal: np.ndarray) -> int:
     """
@@ -85,6 +114,32 @@ def detect_bottom_frame(smoothed_signal: np.ndarray) -> int:
         return 0
     return int(np.argmax(smoothed_signal))
 
+def detect_bottom_subframe(derivative: np.ndarray, bottom_idx: int) -> float:
+    """
+    Locates the bottom at sub-frame precision as the zero crossing of the smoothed
+    derivative (positive while descending, negative while ascending) next to bottom_idx.
+    
+    Args:
+        derivative: 1D Savitzky-Golay derivative of the depth signal.
+        bottom_idx: Integer bottom frame from detect_bottom_frame.
+        
+    Returns:
+        float: Fractional frame index of the bottom.
+    """
+    n = len(derivative)
+    if n < 2 or not 0 <= bottom_idx < n:
+        return float(bottom_idx)
+        
+    # Crossing lies after bottom_idx if still descending there, otherwise before it
+    i = bottom_idx if derivative[bottom_idx] >= 0 else bottom_idx - 1
+    if i < 0 or i + 1 >= n:
+        return float(bottom_idx)
+        
+    d0, d1 = derivative[i], derivative[i + 1]
+    if not (d0 >= 0 > d1):
+        return float(bottom_idx)
+    return float(i + d0 / (d0 - d1))
+
 def segment_phases(smoothed_signal: np.ndarray, bottom_idx: int, bottom_window: int = 5) -> Dict[int, str]:
     """
     Segments the dip into phases: top, descending, bottom, ascending.
@@ -108,8 +163,8 @@ def segment_phases(smoothed_signal: np.ndarray, bottom_idx: int, bottom_window:
     bottom_end = min(num_frames - 1, bottom_idx + bottom_window)
     
     # Compute derivative to detect motion
-    # We use a simple difference for now, but smoothed_signal is already SG-filtered
-    # SG filter can also provide derivatives, but for v1 this is enough.
+    # A simple difference is enough here; smoothed_signal is already SG-filtered
+    # and sub-frame timing uses the SG derivative (smooth_signal_with_derivative).
     diff = np.diff(smoothed_signal, prepend=smoothed_signal[0])
     
     # Threshold for "motionless" to detect top
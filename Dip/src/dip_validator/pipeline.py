@@ -0,0 +1,252 @@
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from dip_validator.video_io import open_video, iter_video, video_metadata
+from dip_validator.pose import PoseEstimator, PoseResult, scale_pose
+from dip_validator.refinement import RefinedLandmarks, refine_landmarks
+from dip_validator.motion import MotionGate
+
+# End-of-stream marker passed down the queues
+_END = object()
+
+@dataclass
+class StageStats:
+    """Work done by one pipeline stage and the occupancy of its input queue."""
+    name: str
+    capacity: int  # Input queue size (0 for the source stage)
+    items: int = 0
+    busy_s: float = 0.0  # Time spent in the stage function
+    queue_total: int = 0  # Sum of input queue lengths, sampled at each item taken
+    queue_max: int = 0
+    samples: int = 0
+
+    def sample(self, inbox: "queue.Queue") -> None:
+        n = inbox.qsize()
+        self.queue_total += n
+        self.queue_max = max(self.queue_max, n)
+        self.samples += 1
+
+    def to_dict(self, wall_s: float) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "busy_s": round(self.busy_s, 3),
+            "utilisation": round(self.busy_s / wall_s, 3) if wall_s > 0 else 0.0,
+            "mean_queue": round(self.queue_total / self.samples, 2) if self.samples else 0.0,
+            "max_queue": self.queue_max,
+            "queue_capacity": self.capacity
+        }
+
+@dataclass
+class PipelineResult:
+    frames: List[np.ndarray]
+    meta: Dict[str, Any]
+    poses: List[Optional[PoseResult]]
+    raw_landmarks: Tuple[List[Optional[RefinedLandmarks]], List[Optional[RefinedLandmarks]]]
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+class _Pipeline:
+    """Threads connected by bounded queues; the first error stops every stage."""
+    def __init__(self):
+        self.stop = threading.Event()
+        self.errors: List[BaseException] = []
+        self.threads: List[threading.Thread] = []
+
+    def put(self, outbox: "queue.Queue", item: Any) -> bool:
+        # Bounded put that gives up once the pipeline is stopping (downstream may be gone)
+        while not self.stop.is_set():
+            try:
+                outbox.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fail(self, error: BaseException) -> None:
+        self.errors.append(error)
+        self.stop.set()
+
+    def source(self, name: str, produce: Callable[[Callable[[Any], bool], StageStats], None],
+               outbox: "queue.Queue", stats: StageStats) -> None:
+        def run():
+            try:
+                produce(lambda item: self.put(outbox, item), stats)
+            except BaseException as e:
+                self.fail(e)
+            finally:
+                self.put(outbox, _END)
+        self.threads.append(threading.Thread(target=run, name=name, daemon=True))
+
+    def stage(self, name: str, fn: Callable[[Any], Any], inbox: "queue.Queue", outbox: "queue.Queue",
+              stats: StageStats) -> None:
+        def run():
+            try:
+                while not self.stop.is_set():
+                    try:
+                        item = inbox.get(timeout=0.05)
+                    except queue.Empty:
+                        continue
+                    if item is _END:
+                        break
+                    stats.sample(inbox)
+                    start = time.perf_counter()
+                    out = fn(item)
+                    stats.busy_s += time.perf_counter() - start
+                    stats.items += 1
+                    if not self.put(outbox, out):
+                        break
+            except BaseException as e:
+                self.fail(e)
+            finally:
+                self.put(outbox, _END)
+        self.threads.append(threading.Thread(target=run, name=name, daemon=True))
+
+    def start(self):
+        for t in self.threads:
+            t.start()
+
+    def join(self):
+        for t in self.threads:
+            t.join()
+
+def run_pose_pipeline(
+    video_path: str,
+    estimator: PoseEstimator,
+    config: Dict[str, Any],
+    index_path: Optional[str] = None,
+    queue_size: int = 8,
+    gate: Optional[MotionGate] = None
+) -> PipelineResult:
+    """
+    Decodes the video and estimates and refines poses in a decode -> detect -> pose ->
+    refine pipeline, one thread per stage connected by bounded queues.
+
+    Stages overlap across frames, so throughput approaches that of the slowest stage
+    rather than the sum of all stages (the ONNX Runtime sessions and OpenCV decode
+    release the GIL). Order is preserved: every stage is a single thread consuming a
+    FIFO queue, which the detector's lifter tracking requires anyway.
+
+    With a motion gate, the decode stage flags frames without motion; they pass through
+    detection and pose untouched and are completed by MotionGate.finish once the
+    stream ends.
+
+    Args:
+        video_path: Path to input video.
+        estimator: PoseEstimator (detector and pose model are used from different threads).
+        config: Loaded config (pose and landmarks sections).
+        index_path: Where to persist the frame index (see video_io.load_video).
+        queue_size: Capacity of each inter-stage queue.
+        gate: MotionGate deciding which frames skip pose estimation.
+
+    Returns:
+        PipelineResult with frames, metadata, poses, raw (not yet EMA-smoothed) landmarks
+        per side, and per-stage statistics.
+    """
+    conf_thresh = config['pose']['confidence_threshold']
+    scale = config['pose'].get('inference_scale', 1.0)
+    ref_params = {
+        "elbow_offset_ratio": config['landmarks']['elbow_offset_ratio'],
+        "deltoid_offset_ratio": config['landmarks']['deltoid_offset_ratio']
+    }
+
+    cap = open_video(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frames: List[np.ndarray] = []
+    timestamps: List[float] = []
+    poses: List[Optional[PoseResult]] = []
+    raw_l: List[Optional[RefinedLandmarks]] = []
+    raw_r: List[Optional[RefinedLandmarks]] = []
+    boxes: List[Optional[Tuple[float, float, float, float]]] = []  # Tracked lifter box after each frame
+
+    def decode(emit, stats):
+        frame_iter = iter_video(cap)
+        while True:
+            start = time.perf_counter()
+            item = next(frame_iter, None)
+            if item is None:
+                return
+            frame, timestamp = item
+            frames.append(frame)
+            timestamps.append(timestamp)
+            skip = gate is not None and gate.update(frame)
+            small = frame if scale == 1.0 else cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            stats.busy_s += time.perf_counter() - start
+            stats.items += 1
+            if not emit((small, skip)):
+                return
+
+    def detect(item):
+        small, skip = item
+        bbox = None if skip else estimator.detect_lifter(small)
+        boxes.append(estimator.prev_bbox)
+        return small, bbox
+
+    def pose(item):
+        small, bbox = item
+        if bbox is None:
+            return None
+        return scale_pose(estimator.estimate_crop(small, bbox, conf_thresh), 1.0 / scale)
+
+    def refill(i, nearest):
+        # Out-of-order frame: track the lifter from the nearest estimated frame
+        small = frames[i] if scale == 1.0 else cv2.resize(frames[i], None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        estimator.reset(boxes[nearest])
+        bbox = estimator.detect_lifter(small)
+        boxes[i] = estimator.prev_bbox
+        return scale_pose(estimator.estimate_crop(small, bbox, conf_thresh), 1.0 / scale)
+
+    def refine(result):
+        return result, refine_landmarks(result, "left", **ref_params), refine_landmarks(result, "right", **ref_params)
+
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(4)]
+    stats = [StageStats("decode", 0), StageStats("detect", queue_size), StageStats("pose", queue_size),
+             StageStats("refine", queue_size)]
+
+    pipe = _Pipeline()
+    pipe.source("decode", decode, queues[0], stats[0])
+    pipe.stage("detect", detect, queues[0], queues[1], stats[1])
+    pipe.stage("pose", pose, queues[1], queues[2], stats[2])
+    pipe.stage("refine", refine, queues[2], queues[3], stats[3])
+
+    start = time.perf_counter()
+    pipe.start()
+    while not pipe.stop.is_set():
+        try:
+            item = queues[3].get(timeout=0.05)
+        except queue.Empty:
+            continue
+        if item is _END:
+            break
+        poses.append(item[0])
+        raw_l.append(item[1])
+        raw_r.append(item[2])
+    pipe.join()
+    cap.release()
+    if pipe.errors:
+        raise pipe.errors[0]
+    if gate is not None:
+        # Skipped frames have no landmarks yet: refine them once filled
+        gated = [i for i, skip in enumerate(gate.skipped) if skip]
+        poses = gate.finish(poses, refill)
+        for i in gated:
+            raw_l[i] = refine_landmarks(poses[i], "left", **ref_params)
+            raw_r[i] = refine_landmarks(poses[i], "right", **ref_params)
+    wall = time.perf_counter() - start
+
+    meta = video_metadata(video_path, fps, frames[0].shape if frames else None, timestamps, index_path)
+    stage_stats = {s.name: s.to_dict(wall) for s in stats}
+    return PipelineResult(
+        frames=frames,
+        meta=meta,
+        poses=poses,
+        raw_landmarks=(raw_l, raw_r),
+        stats={
+            "wall_s": round(wall, 3),
+            "fps": round(len(poses) / wall, 2) if wall > 0 else 0.0,
+            "bottleneck": max(stats, key=lambda s: s.busy_s).name,
+            "stages": stage_stats
+        }
+    )
@@ -1,22 +1,106 @@
 import numpy as np
-from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from dataclasses import dataclass, replace
+from typing import Optional, List, Tuple, Dict, Any
 from rtmlib import Body
 
+# Config pose.model -> rtmlib Body mode
+MODEL_MODES = {"rtmpose-s": "lightweight", "rtmpose-m": "balanced", "rtmpose-l": "performance"}
+
 @dataclass
 class PoseResult:
     """Dataclass to store pose estimation results for a single frame."""
     keypoints: np.ndarray  # (17, 2) - x, y coordinates
     confidences: np.ndarray  # (17,) - per-keypoint confidence
     bbox: Tuple[float, float, float, float]  # (x1, y1, x2, y2)
+    interpolated: bool = False  # Filled in between estimated frames, not from the model
+
+def bbox_iou(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> float:
+    """Intersection over union of two (x1, y1, x2, y2) boxes."""
+    iw = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    ih = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def select_lifter_bbox(
+    bboxes: np.ndarray,
+    frame_shape: Tuple[int, ...],
+    prev_bbox: Optional[Tuple[float, float, float, float]] = None,
+    iou_weight: float = 2.0,
+    size_weight: float = 1.0,
+    center_weight: float = 1.0
+) -> Optional[int]:
+    """
+    Picks the lifter among the detected people.
+    
+    Each box is scored on IoU with the previous frame's lifter box (continuity), its
+    area relative to the largest box (the lifter is filmed up close) and the distance
+    of its centre from the frame centre (the lifter is framed).
+    
+    Args:
+        bboxes: (N, 4) detector boxes (x1, y1, x2, y2).
+        frame_shape: Shape of the frame the boxes refer to.
+        prev_bbox: Lifter box of the previous frame, if any.
+        
+    Returns:
+        Index of the selected box, or None if there are no boxes.
+    """
+    if bboxes is None or len(bboxes) == 0:
+        return None
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    height, width = frame_shape[:2]
+    
+    areas = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+    size = areas / areas.max() if areas.max() > 0 else np.zeros(len(bboxes))
+    
+    centers = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+    dist = np.hypot(centers[:, 0] - width / 2, centers[:, 1] - height / 2)
+    centrality = 1.0 - dist / np.hypot(width / 2, height / 2)
+    
+    score = size_weight * size + center_weight * centrality
+    if prev_bbox is not None:
+        score += iou_weight * np.array([bbox_iou(b, prev_bbox) for b in bboxes])
+    return int(np.argmax(score))
 
-class PoseEstimator:
-    """Wrapper around rtmlib for pose estimation."""
-    def __init__(self, device: str = 'cpu', mode: str = 'balanced'):
+class LifterTracker:
+    """
+    Follows the lifter's box from frame to frame (select_lifter_bbox against the previous
+    box). It holds no model, so the boxes can come from a detector run elsewhere.
+    """
+    def __init__(self, lifter_weights: Optional[Dict[str, float]] = None):
+        self.lifter_weights = lifter_weights or {}
+        self.prev_bbox = None
+
+    def reset(self, bbox: Optional[Tuple[float, float, float, float]] = None):
+        """Forgets the lifter box tracked across frames, or restarts tracking from `bbox`."""
+        self.prev_bbox = bbox
+
+    def track(self, bboxes: np.ndarray, frame_shape: Tuple[int, ...]) -> Tuple[float, float, float, float]:
+        """
+        Picks the lifter among one frame's detector boxes. Frames must be passed in
+        video order: the previous box is tracked.
+        """
+        idx = select_lifter_bbox(bboxes, frame_shape, self.prev_bbox, **self.lifter_weights)
+        if idx is not None:
+            self.prev_bbox = tuple(float(v) for v in np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)[idx])
+        # Missed detection: reuse the previous lifter box, else the whole frame (as rtmlib does)
+        return self.prev_bbox or (0.0, 0.0, float(frame_shape[1]), float(frame_shape[0]))
+
+class PoseEstimator(LifterTracker):
+    """
+    Wrapper around rtmlib for pose estimation.
+    
+    The person detector and the pose model are run separately so that only the
+    lifter's crop goes through RTMPose (select_lifter_bbox), whatever the number of
+    people in frame. Frames passed to estimate_poses are treated as one sequence:
+    call reset() before starting a new video.
+    """
+    def __init__(self, device: str = 'cpu', mode: str = 'balanced', lifter_weights: Optional[Dict[str, float]] = None):
         # mode can be 'lightweight', 'balanced', or 'performance'
         # 'balanced' uses rtmpose-m and yolox-m
         # 'performance' uses rtmpose-l and yolox-l
         # 'lightweight' uses rtmpose-s and yolox-s
+        super().__init__(lifter_weights)
         self.model = Body(
             mode=mode,
             device=device
@@ -35,37 +119,160 @@ class PoseEstimator:
             Returns None for frames where no person is detected.
         """
         results = []
-        for i, frame in enumerate(frames):
-            # rtmlib Body returns (keypoints, scores)
-            # keypoints shape: (N, 17, 2), scores shape: (N, 17)
-            keypoints, scores = self.model(frame)
-            
-            if keypoints is not None and len(keypoints) > 0:
-                # We assume the first detected person is the subject
-                kp = keypoints[0]
-                conf = scores[0]
-                
-                # Check if we have enough confident keypoints
-                if np.mean(conf) < conf_threshold:
-                    results.append(None)
-                    continue
-
-                # Calculate bbox from keypoints as fallback
-                x1, y1 = np.min(kp, axis=0)
-                x2, y2 = np.max(kp, axis=0)
-                bbox = (float(x1), float(y1), float(x2), float(y2))
-                
-                results.append(PoseResult(
-                    keypoints=kp,
-                    confidences=conf,
-                    bbox=bbox
-                ))
-            else:
-                results.append(None)
-                
+        for frame in frames:
+            results.append(self.estimate_crop(frame, self.detect_lifter(frame), conf_threshold))
         return results
 
+    def detect_people(self, frame: np.ndarray) -> np.ndarray:
+        """Runs the person detector: (N, 4) boxes (x1, y1, x2, y2), in any frame order."""
+        return self.model.det_model(frame)
+
+    def detect_lifter(self, frame: np.ndarray) -> Tuple[float, float, float, float]:
+        """
+        Runs the person detector and returns the lifter's box (see select_lifter_bbox).
+        Frames must be passed in video order: the previous box is tracked.
+        """
+        return self.track(self.detect_people(frame), frame.shape)
+
+    def estimate_crop(self, frame: np.ndarray, lifter_bbox: Tuple[float, float, float, float],
+                      conf_threshold: float = 0.3) -> Optional[PoseResult]:
+        """Runs the pose model on the lifter's box only."""
+        # rtmlib RTMPose returns (keypoints, scores)
+        # keypoints shape: (1, 17, 2), scores shape: (1, 17) for a single box
+        keypoints, scores = self.model.pose_model(frame, bboxes=[lifter_bbox])
+        
+        if keypoints is None or len(keypoints) == 0:
+            return None
+        kp = keypoints[0]
+        conf = scores[0]
+        
+        # Check if we have enough confident keypoints
+        if np.mean(conf) < conf_threshold:
+            return None
+
+        # Calculate bbox from keypoints as fallback
+        x1, y1 = np.min(kp, axis=0)
+        x2, y2 = np.max(kp, axis=0)
+        bbox = (float(x1), float(y1), float(x2), float(y2))
+        
+        return PoseResult(
+            keypoints=kp,
+            confidences=conf,
+            bbox=bbox
+        )
+
 def estimate_poses(frames: List[np.ndarray], device: str = 'cpu', mode: str = 'balanced', conf_threshold: float = 0.3) -> List[Optional[PoseResult]]:
     """Convenience function for pose estimation."""
     estimator = PoseEstimator(device=device, mode=mode)
     return estimator.estimate_poses(frames, conf_threshold=conf_threshold)
+
+def poses_to_arrays(poses: List[Optional[PoseResult]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stacks per-frame pose results into dense arrays for vectorized analysis.
+    
+    Args:
+        poses: List of PoseResult objects (or None if no pose was detected).
+        
+    Returns:
+        Tuple of keypoints (T, 17, 2), NaN where no pose, and confidences (T, 17), 0 where no pose.
+    """
+    keypoints = np.full((len(poses), 17, 2), np.nan)
+    confidences = np.zeros((len(poses), 17))
+    for i, pose in enumerate(poses):
+        if pose is not None:
+            keypoints[i] = pose.keypoints
+            confidences[i] = pose.confidences
+    return keypoints, confidences
+
+def arrays_to_poses(keypoints: np.ndarray, confidences: np.ndarray, bboxes: Optional[np.ndarray] = None,
+                    interpolated: Optional[np.ndarray] = None) -> List[Optional[PoseResult]]:
+    """Inverse of poses_to_arrays: frames with NaN keypoints become None."""
+    poses = []
+    for i in range(len(keypoints)):
+        if np.isnan(keypoints[i]).any():
+            poses.append(None)
+            continue
+        if bboxes is not None:
+            bbox = tuple(float(v) for v in bboxes[i])
+        else:
+            x1, y1 = np.min(keypoints[i], axis=0)
+            x2, y2 = np.max(keypoints[i], axis=0)
+            bbox = (float(x1), float(y1), float(x2), float(y2))
+        poses.append(PoseResult(keypoints=keypoints[i], confidences=confidences[i], bbox=bbox,
+                                interpolated=bool(interpolated[i]) if interpolated is not None else False))
+    return poses
+
+def save_pose_cache(path: str, poses: List[Optional[PoseResult]], meta: Dict[str, Any]) -> str:
+    """
+    Stores per-frame pose results so later analyses (e.g. calibration) can skip pose estimation.
+    
+    Args:
+        path: Destination .npz file.
+        poses: List of PoseResult objects (or None if no pose was detected).
+        meta: Video metadata from load_video (fps, width, height).
+        
+    Returns:
+        str: Path to the written file.
+    """
+    keypoints, confidences = poses_to_arrays(poses)
+    bboxes = np.array([p.bbox if p is not None else (np.nan,) * 4 for p in poses], dtype=float).reshape(-1, 4)
+    np.savez_compressed(
+        path,
+        keypoints=keypoints,
+        confidences=confidences,
+        bboxes=bboxes,
+        interpolated=np.array([p is not None and p.interpolated for p in poses], dtype=bool),
+        fps=meta['fps'],
+        width=meta['width'],
+        height=meta['height']
+    )
+    return path
+
+def load_pose_cache(path: str) -> Tuple[List[Optional[PoseResult]], Dict[str, Any]]:
+    """Loads pose results written by save_pose_cache, with the video metadata."""
+    with np.load(path) as data:
+        interpolated = data['interpolated'] if 'interpolated' in data.files else None
+        poses = arrays_to_poses(data['keypoints'], data['confidences'], data['bboxes'], interpolated)
+        meta = {
+            "fps": float(data['fps']),
+            "width": int(data['width']),
+            "height": int(data['height']),
+            "frame_count": len(poses)
+        }
+    return poses, meta
+
+def scale_pose(pose: Optional[PoseResult], factor: float) -> Optional[PoseResult]:
+    """Pose with coordinates multiplied by `factor` (maps results on a resized frame back)."""
+    if pose is None or factor == 1.0:
+        return pose
+    return replace(pose, keypoints=pose.keypoints * factor, bbox=tuple(v * factor for v in pose.bbox))
+
+def interpolate_poses(poses: List[Optional[PoseResult]], fill: List[bool]) -> List[Optional[PoseResult]]:
+    """
+    Fills frames that were not sent to the model by linear interpolation between the
+    nearest estimated poses on each side.
+    
+    Args:
+        poses: Per-frame results; frames to fill are None.
+        fill: True for frames that were skipped (frames the model ran on and found
+            nobody stay None).
+        
+    Returns:
+        List with the skipped frames filled (marked `interpolated`) where both
+        neighbours have a pose; confidences take the lower of the two.
+    """
+    filled = list(poses)
+    estimated = [i for i, skip in enumerate(fill) if not skip]
+    for prev, nxt in zip(estimated, estimated[1:]):
+        a, b = poses[prev], poses[nxt]
+        if nxt - prev < 2 or a is None or b is None:
+            continue
+        conf = np.minimum(a.confidences, b.confidences)
+        for i in range(prev + 1, nxt):
+            t = (i - prev) / (nxt - prev)
+            kp = (1 - t) * a.keypoints + t * b.keypoints
+            x1, y1 = np.min(kp, axis=0)
+            x2, y2 = np.max(kp, axis=0)
+            filled[i] = PoseResult(keypoints=kp, confidences=conf, bbox=(float(x1), float(y1), float(x2), float(y2)),
+                                   interpolated=True)
+    return filled
@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+from dip_validator.reporting import ResultsStore
+
+COLUMNS = ("id", "video", "camera", "result", "deciding_margin_px", "confidence", "selected_side", "warnings")
+
+def format_rows(rows: List[dict], columns) -> str:
+    """Plain-text table."""
+    cells = [[str(c) for c in columns]]
+    for row in rows:
+        cells.append(["" if row[c] is None else f"{row[c]:.2f}" if isinstance(row[c], float) else str(row[c])
+                      for c in columns])
+    widths = [max(len(r[i]) for r in cells) for i in range(len(columns))]
+    return "\n".join("  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="dip_validator query", description="Query the results store")
+    parser.add_argument("--db", default="results.db", help="SQLite results store")
+    parser.add_argument("--result", choices=["VALID", "INVALID", "valid", "invalid"], help="Verdict")
+    parser.add_argument("--max-abs-margin", type=float, default=None, help="Only |margin| <= this (px)")
+    parser.add_argument("--camera", default=None, help="Camera label")
+    parser.add_argument("--config-hash", default=None, help="Config hash")
+    parser.add_argument("--warning", default=None, help="Only results carrying this warning")
+    parser.add_argument("--group-by", default=None, help="Summarise per camera, config_hash, model, selected_side, result or video")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum rows")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args(argv)
+
+    try:
+        store = ResultsStore(args.db)
+        if args.group_by:
+            rows = store.summary(args.group_by)
+            columns = (args.group_by, "attempts", "valid_rate", "avg_confidence", "avg_margin_px")
+        else:
+            rows = store.query(args.result, args.max_abs_margin, args.camera, args.config_hash, args.warning, args.limit)
+            columns = COLUMNS
+        print(json.dumps(rows, indent=2) if args.json else format_rows(rows, columns))
+        store.close()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
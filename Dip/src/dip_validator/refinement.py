@@ -11,6 +11,7 @@ class RefinedLandmarks:
     deltoid_confidence: float
     side: str
     angle_warning: bool
+    interpolated: bool = False  # From an interpolated pose (frame not sent to the model)
 
 def estimate_elbow_tip(pose: PoseResult, side: str, offset_ratio: float = 0.18) -> Tuple[Tuple[float, float], float]:
     """
@@ -117,42 +118,48 @@ def refine_landmarks(
         elbow_confidence=e_conf,
         deltoid_confidence=d_conf,
         side=side,
-        angle_warning=angle_warn
+        angle_warning=angle_warn,
+        interpolated=pose.interpolated
     )
 
-def smooth_landmarks_temporal(landmarks_list: List[Optional[RefinedLandmarks]], alpha: float = 0.4) -> List[Optional[RefinedLandmarks]]:
-    """Apply EMA smoothing to E and D positions across frames."""
-    smoothed_list = []
-    prev_e = None
-    prev_d = None
-    
-    for lm in landmarks_list:
+class TemporalSmoother:
+    """Causal EMA smoother for E and D positions, fed one frame at a time."""
+    def __init__(self, alpha: float = 0.4):
+        self.alpha = alpha
+        self.prev_e = None
+        self.prev_d = None
+
+    def update(self, lm: Optional[RefinedLandmarks]) -> Optional[RefinedLandmarks]:
         if lm is None:
-            smoothed_list.append(None)
-            prev_e = None
-            prev_d = None
-            continue
+            # A gap resets the filter
+            self.prev_e = None
+            self.prev_d = None
+            return None
             
         curr_e = np.array(lm.elbow_tip)
         curr_d = np.array(lm.deltoid_apex)
         
-        if prev_e is None:
+        if self.prev_e is None:
             smooth_e = curr_e
             smooth_d = curr_d
         else:
-            smooth_e = alpha * curr_e + (1 - alpha) * prev_e
-            smooth_d = alpha * curr_d + (1 - alpha) * prev_d
+            smooth_e = self.alpha * curr_e + (1 - self.alpha) * self.prev_e
+            smooth_d = self.alpha * curr_d + (1 - self.alpha) * self.prev_d
             
-        smoothed_list.append(RefinedLandmarks(
+        self.prev_e = smooth_e
+        self.prev_d = smooth_d
+        
+        return RefinedLandmarks(
             elbow_tip=(float(smooth_e[0]), float(smooth_e[1])),
             deltoid_apex=(float(smooth_d[0]), float(smooth_d[1])),
             elbow_confidence=lm.elbow_confidence,
             deltoid_confidence=lm.deltoid_confidence,
             side=lm.side,
-            angle_warning=lm.angle_warning
-        ))
-        
-        prev_e = smooth_e
-        prev_d = smooth_d
-        
-    return smoothed_list
+            angle_warning=lm.angle_warning,
+            interpolated=lm.interpolated
+        )
+
+def smooth_landmarks_temporal(landmarks_list: List[Optional[RefinedLandmarks]], alpha: float = 0.4) -> List[Optional[RefinedLandmarks]]:
+    """Apply EMA smoothing to E and D positions across frames."""
+    smoother = TemporalSmoother(alpha=alpha)
+    return [smoother.update(lm) for lm in landmarks_list]
@@ -1,15 +1,99 @@
+import hashlib
 import json
 import os
-from typing import Dict, Any
+import sqlite3
+import time
+import numpy as np
+from typing import Dict, Any, List, Optional
 from .rules import DipDecision
 
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video TEXT NOT NULL,
+    video_path TEXT,
+    camera TEXT,
+    result TEXT NOT NULL,
+    deciding_margin_px REAL NOT NULL,  -- interpolated_margin_px if available, else best_margin_px
+    margin_px REAL,
+    best_margin_px REAL,
+    interpolated_margin_px REAL,
+    selected_side TEXT,
+    bottom_frame_index INTEGER,
+    bottom_time_s REAL,
+    confidence REAL,
+    warnings TEXT,  -- JSON list
+    frames_analyzed INTEGER,
+    fps REAL,
+    config_hash TEXT,
+    model TEXT,
+    timings TEXT,  -- JSON {stage: seconds}
+    report_path TEXT,
+    trace_path TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_result_margin ON results (result, deciding_margin_px);
+CREATE INDEX IF NOT EXISTS results_camera ON results (camera);
+CREATE INDEX IF NOT EXISTS results_config ON results (config_hash);
+CREATE INDEX IF NOT EXISTS results_video ON results (video);
+CREATE UNIQUE INDEX IF NOT EXISTS results_video_config ON results (video_path, config_hash);
+"""
+
+# Columns rewritten when a video is analysed again with the same config
+RESULTS_COLUMNS = ("video", "video_path", "camera", "result", "deciding_margin_px", "margin_px", "best_margin_px",
+                   "interpolated_margin_px", "selected_side", "bottom_frame_index", "bottom_time_s", "confidence",
+                   "warnings", "frames_analyzed", "fps", "config_hash", "model", "timings", "report_path",
+                   "trace_path", "created_at")
+
+# Columns of the landmark trace sidecar, in landmarks_trace order
+TRACE_COLUMNS = ("frame", "deltoid_x", "deltoid_y", "elbow_x", "elbow_y", "margin_px", "deltoid_conf", "elbow_conf",
+                 "interpolated")
+
+def write_report(report_data: Dict[str, Any], output_dir: str = "output") -> str:
+    """
+    Writes report data as report.json in the output directory.
+    
+    Args:
+        report_data: JSON-serializable report content.
+        output_dir: Directory where the report.json will be saved.
+        
+    Returns:
+        str: Path to the written JSON report.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+        
+    report_path = os.path.join(output_dir, "report.json")
+    with open(report_path, "w") as f:
+        json.dump(report_data, f, indent=2)
+        
+    return report_path
+
+def decision_to_dict(decision: DipDecision) -> Dict[str, Any]:
+    """Serializable view of a DipDecision, as written in report.json."""
+    return {
+        "result": "VALID" if decision.valid else "INVALID",
+        "deciding_margin_px": round(decision.deciding_margin_px, 2),
+        "margin_px": round(decision.margin_px, 2),
+        "best_margin_px": round(decision.best_margin_px, 2),
+        "selected_side": decision.selected_side,
+        "bottom_frame_index": decision.bottom_frame_index,
+        "confidence": round(decision.confidence, 2),
+        "warnings": decision.warnings,
+        **({"interpolated_margin_px": round(decision.interpolated_margin_px, 2)}
+           if decision.interpolated_margin_px is not None else {}),
+        **({"bottom_time_s": round(decision.bottom_time_s, 4)}
+           if decision.bottom_time_s is not None else {})
+    }
+
 def generate_report(
     video_path: str,
     decision: DipDecision,
     num_frames: int,
     fps: float,
     output_dir: str = "output",
-    landmarks_trace: list = None
+    landmarks_trace: list = None,
+    extra: Dict[str, Any] = None
 ) -> str:
     """
     Generates a JSON report for the dip analysis.
@@ -21,32 +105,137 @@ def generate_report(
         fps: Frames per second of the video.
         output_dir: Directory where the report.json will be saved.
         landmarks_trace: Optional list of per-frame landmark data.
+        extra: Optional additional top-level report sections.
         
     Returns:
         str: Path to the generated JSON report.
     """
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
-        
-    report_path = os.path.join(output_dir, "report.json")
-    
     report_data = {
         "video": os.path.basename(video_path),
-        "result": "VALID" if decision.valid else "INVALID",
-        "margin_px": round(decision.margin_px, 2),
-        "best_margin_px": round(decision.best_margin_px, 2),
-        "selected_side": decision.selected_side,
-        "bottom_frame_index": decision.bottom_frame_index,
-        "confidence": round(decision.confidence, 2),
-        "warnings": decision.warnings,
+        **decision_to_dict(decision),
         "frames_analyzed": num_frames,
         "fps": round(fps, 2)
     }
 
+    if extra:
+        report_data.update(extra)
+
     if landmarks_trace is not None:
         report_data["landmarks_trace"] = landmarks_trace
     
-    with open(report_path, "w") as f:
-        json.dump(report_data, f, indent=2)
-        
-    return report_path
+    return write_report(report_data, output_dir)
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Short, stable hash of a config (key order does not matter)."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+def save_trace_columns(landmarks_trace: List[Dict[str, Any]], path: str) -> str:
+    """Writes a landmarks trace as one array per column (TRACE_COLUMNS) in an .npz file."""
+    columns = {
+        "frame": np.array([e['frame'] for e in landmarks_trace], dtype=np.int32),
+        "deltoid_x": np.array([e['deltoid'][0] for e in landmarks_trace], dtype=np.float32),
+        "deltoid_y": np.array([e['deltoid'][1] for e in landmarks_trace], dtype=np.float32),
+        "elbow_x": np.array([e['elbow'][0] for e in landmarks_trace], dtype=np.float32),
+        "elbow_y": np.array([e['elbow'][1] for e in landmarks_trace], dtype=np.float32),
+        "margin_px": np.array([e['margin_px'] for e in landmarks_trace], dtype=np.float32),
+        "deltoid_conf": np.array([e['deltoid_conf'] for e in landmarks_trace], dtype=np.float32),
+        "elbow_conf": np.array([e['elbow_conf'] for e in landmarks_trace], dtype=np.float32),
+        "interpolated": np.array([e.get('interpolated', False) for e in landmarks_trace], dtype=bool)
+    }
+    np.savez_compressed(path, **columns)
+    return path
+
+def load_trace_columns(path: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """Loads the requested columns (default: all) of a trace sidecar; only those are decompressed."""
+    with np.load(path) as data:
+        # Sidecars written before a column existed lack it
+        return {name: data[name] for name in (columns or [c for c in TRACE_COLUMNS if c in data.files])}
+
+class ResultsStore:
+    """
+    Indexed SQLite table of decisions, one row per video and config: analysing a video
+    again with the same config (e.g. nightly re-processing) replaces its row, so the
+    summaries count each attempt once.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            exists = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'results'").fetchone()
+            unique = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'results_video_config'").fetchone()
+            if exists and not unique:
+                # Stores written before rows were unique: keep the newest row of each video and config
+                self.conn.execute("DELETE FROM results WHERE id NOT IN "
+                                  "(SELECT MAX(id) FROM results GROUP BY video_path, config_hash)")
+        self.conn.executescript(RESULTS_SCHEMA)
+
+    def add(
+        self,
+        video_path: str,
+        decision: DipDecision,
+        num_frames: int,
+        fps: float,
+        config: Dict[str, Any],
+        camera: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+        report_path: Optional[str] = None,
+        trace_path: Optional[str] = None
+    ) -> int:
+        """Adds one decision, replacing the row of the same video and config if any. Returns the row id."""
+        hash_ = config_hash(config)
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO results ({', '.join(RESULTS_COLUMNS)}) VALUES ({', '.join('?' * len(RESULTS_COLUMNS))}) "
+                f"ON CONFLICT (video_path, config_hash) DO UPDATE SET "
+                f"{', '.join(f'{c} = excluded.{c}' for c in RESULTS_COLUMNS)}",
+                (os.path.basename(video_path), video_path, camera, "VALID" if decision.valid else "INVALID",
+                 float(decision.deciding_margin_px), decision.margin_px, decision.best_margin_px, decision.interpolated_margin_px,
+                 decision.selected_side, decision.bottom_frame_index, decision.bottom_time_s, decision.confidence,
+                 json.dumps(decision.warnings), num_frames, fps, hash_, config['pose']['model'],
+                 json.dumps({k: round(v, 3) for k, v in (timings or {}).items()}), report_path, trace_path, time.time()))
+            return self.conn.execute("SELECT id FROM results WHERE video_path = ? AND config_hash = ?",
+                                     (video_path, hash_)).fetchone()[0]
+
+    def query(
+        self,
+        result: Optional[str] = None,
+        max_abs_margin: Optional[float] = None,
+        camera: Optional[str] = None,
+        config_hash: Optional[str] = None,
+        warning: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Rows matching all the given filters, newest first."""
+        where, params = [], []
+        if result:
+            where.append("result = ?")
+            params.append(result.upper())
+        if max_abs_margin is not None:
+            where.append("deciding_margin_px BETWEEN ? AND ?")
+            params += [-max_abs_margin, max_abs_margin]
+        if camera:
+            where.append("camera = ?")
+            params.append(camera)
+        if config_hash:
+            where.append("config_hash = ?")
+            params.append(config_hash)
+        if warning:
+            where.append("EXISTS (SELECT 1 FROM json_each(warnings) WHERE value = ?)")
+            params.append(warning)
+        sql = "SELECT * FROM results" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def summary(self, group_by: str) -> List[Dict[str, Any]]:
+        """Attempt count, VALID rate and average confidence / margin per group."""
+        if group_by not in ("camera", "config_hash", "model", "selected_side", "result", "video"):
+            raise ValueError(f"Cannot group by: {group_by}")
+        sql = (f"SELECT {group_by}, COUNT(*) AS attempts, AVG(result = 'VALID') AS valid_rate, "
+               f"AVG(confidence) AS avg_confidence, AVG(deciding_margin_px) AS avg_margin_px "
+               f"FROM results GROUP BY {group_by} ORDER BY {group_by}")
+        return [dict(row) for row in self.conn.execute(sql)]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import sys
+import cv2
+import numpy as np
+from typing import List, Optional, Dict, Any
+from dip_validator.video_io import load_frame_index, get_frames, iter_range, save_video
+
+def draw_trace_entry(frame: np.ndarray, entry: Dict[str, Any]) -> np.ndarray:
+    """Draws the D/E landmarks of one landmarks_trace entry."""
+    canvas = frame.copy()
+    d_pt = (int(entry['deltoid'][0]), int(entry['deltoid'][1]))
+    e_pt = (int(entry['elbow'][0]), int(entry['elbow'][1]))
+    color = (0, 255, 0) if entry['margin_px'] >= 0 else (0, 0, 255)
+    cv2.line(canvas, (0, e_pt[1]), (canvas.shape[1], e_pt[1]), (255, 0, 0), 1)
+    cv2.line(canvas, d_pt, (d_pt[0], e_pt[1]), color, 2)
+    cv2.circle(canvas, d_pt, 6, (0, 255, 0), -1)
+    cv2.circle(canvas, e_pt, 6, (255, 0, 0), -1)
+    cv2.putText(canvas, f"{entry['margin_px']:+.1f}px", (d_pt[0] + 10, (d_pt[1] + e_pt[1]) // 2),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    return canvas
+
+def regenerate_review(video_path: str, report_dir: str, pad: int = 15) -> List[str]:
+    """
+    Rebuilds the bottom-frame image and a clip around the bottom from an existing
+    report, decoding only those frames through the persisted frame index.
+
+    Args:
+        video_path: The analysed video.
+        report_dir: Directory holding report.json (and frame_index.json, built if missing).
+        pad: Frames kept on each side of the bottom in the review clip.
+
+    Returns:
+        Paths of the written files.
+
+    Raises:
+        ValueError: If the report has no depth decision (run without the dip_depth judge).
+    """
+    report_path = os.path.join(report_dir, "report.json")
+    with open(report_path, 'r') as f:
+        report = json.load(f)
+    if 'bottom_frame_index' not in report:
+        raise ValueError(f"No depth decision in {report_path} (was it run without the dip_depth judge?): "
+                         "nothing to review")
+    bottom_idx = report['bottom_frame_index']
+    trace = {entry['frame']: entry for entry in report.get('landmarks_trace', [])}
+
+    index = load_frame_index(video_path, os.path.join(report_dir, "frame_index.json"))
+    paths = []
+
+    bottom = get_frames(video_path, [bottom_idx], index)[bottom_idx]
+    if bottom_idx in trace:
+        bottom = draw_trace_entry(bottom, trace[bottom_idx])
+    paths.append(os.path.join(report_dir, "review_bottom.jpg"))
+    cv2.imwrite(paths[-1], bottom)
+
+    clip = [draw_trace_entry(frame, trace[i]) if i in trace else frame
+            for i, frame in iter_range(video_path, bottom_idx - pad, bottom_idx + pad + 1, index)]
+    paths.append(os.path.join(report_dir, "review_bottom_clip.mp4"))
+    save_video(clip, paths[-1], index.fps)
+    return paths
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="dip_validator review",
+                                     description="Bottom frame and clip from an existing report")
+    parser.add_argument("video_path", help="Path to the analysed video")
+    parser.add_argument("--output-dir", default="output", help="Output directory used for the analysis")
+    parser.add_argument("--pad", type=int, default=15, help="Frames on each side of the bottom")
+    args = parser.parse_args(argv)
+
+    try:
+        video_basename = os.path.splitext(os.path.basename(args.video_path))[0]
+        for path in regenerate_review(args.video_path, os.path.join(args.output_dir, video_basename), args.pad):
+            print(f"Saved: {path}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Tuple
 import numpy as np
-from .refinement import RefinedLandmarks
+from .pose import PoseResult
+from .phases import depth_value, smooth_signal, detect_bottom_frame
+from .refinement import RefinedLandmarks, TemporalSmoother, refine_landmarks
 
 @dataclass
 class DipDecision:
@@ -12,13 +14,37 @@ class DipDecision:
     bottom_frame_index: int # Frame index where best margin occurred
     confidence: float
     warnings: List[str]
+    interpolated_margin_px: Optional[float] = None  # Sub-frame peak of the margin trace, around bottom_frame_index
+    # Sub-frame bottom of the smoothed hip depth (set by the caller, needs fps). This is the
+    # depth signal's bottom, not the instant of the margin peak: the two can be frames apart.
+    bottom_time_s: Optional[float] = None
+
+    @property
+    def deciding_margin_px(self) -> float:
+        """Margin the verdict is based on: the sub-frame peak if interpolated, else the best sampled margin."""
+        return self.interpolated_margin_px if self.interpolated_margin_px is not None else self.best_margin_px
+
+def interpolate_peak(prev: float, peak: float, nxt: float) -> Tuple[float, float]:
+    """
+    Fits a parabola through three equally spaced samples around a sampled maximum.
+    
+    Returns:
+        Tuple of (offset in frames from the middle sample, in [-0.5, 0.5], interpolated peak value).
+    """
+    denom = prev - 2 * peak + nxt
+    if denom >= 0:
+        # Flat or not a local maximum: nothing to interpolate
+        return 0.0, peak
+    offset = 0.5 * (prev - nxt) / denom
+    return offset, peak - 0.25 * (prev - nxt) * offset
 
 def evaluate_dip(
     left_landmarks: List[Optional[RefinedLandmarks]],
     right_landmarks: List[Optional[RefinedLandmarks]],
     detected_bottom_idx: int,
     window_half_size: int = 5,
-    min_confidence: float = 0.3
+    min_confidence: float = 0.3,
+    interpolate: bool = True
 ) -> DipDecision:
     """
     Evaluates the dip depth based on refined landmarks.
@@ -29,6 +55,7 @@ def evaluate_dip(
         detected_bottom_idx: Index of the detected bottom frame (from phase detection).
         window_half_size: Half-size of the window to analyze for side selection.
         min_confidence: Minimum confidence threshold for warnings.
+        interpolate: Judge on the sub-frame (parabolic) peak of the margin instead of the best sampled frame.
         
     Returns:
         DipDecision: The final decision object.
@@ -74,19 +101,19 @@ def evaluate_dip(
     best_frame_idx = detected_bottom_idx # Default to detected bottom if no landmarks
     
     # We only care about frames where landmarks are present
-    frames_with_landmarks = []
+    has_landmarks = False
     
     for i, lm in enumerate(selected_landmarks):
         if lm:
             # y_D - y_E. Positive = D below E (VALID).
             margin = lm.deltoid_apex[1] - lm.elbow_tip[1]
-            frames_with_landmarks.append((i, margin))
+            has_landmarks = True
             
             if margin > max_margin:
                 max_margin = margin
                 best_frame_idx = i
                 
-    if not frames_with_landmarks:
+    if not has_landmarks:
         return DipDecision(
             valid=False,
             margin_px=0.0,
@@ -104,8 +131,18 @@ def evaluate_dip(
     if any(selected_landmarks[i] and selected_landmarks[i].angle_warning for i in range(warn_start, warn_end + 1)):
         warnings.append("angle_warning")
         
+    # Sub-frame margin: the true deepest point usually falls between two captured frames
+    interpolated_margin = max_margin
+    neighbours = [selected_landmarks[i] if 0 <= i < num_frames else None for i in (best_frame_idx - 1, best_frame_idx + 1)]
+    if interpolate and all(neighbours):
+        _, interpolated_margin = interpolate_peak(
+            neighbours[0].deltoid_apex[1] - neighbours[0].elbow_tip[1],
+            max_margin,
+            neighbours[1].deltoid_apex[1] - neighbours[1].elbow_tip[1]
+        )
+        
     # Decision: Valid if at ANY point margin >= 0 (strictly speaking > 0 or >= 0. Let's use >= -0.0 for float tolerance)
-    valid = max_margin >= 0.0
+    valid = interpolated_margin >= 0.0
     
     return DipDecision(
         valid=valid,
@@ -114,5 +151,92 @@ def evaluate_dip(
         selected_side=selected_side,
         bottom_frame_index=best_frame_idx,
         confidence=confidence,
-        warnings=list(set(warnings)) # unique warnings
-    )
\ No newline at end of file
+        warnings=list(set(warnings)), # unique warnings
+        interpolated_margin_px=float(interpolated_margin)
+    )
+
+class IncrementalDipEvaluator:
+    """
+    Causal, frame-by-frame counterpart of evaluate_dip, used to stop pose inference
+    once a VALID verdict can no longer change.
+    
+    Landmarks are refined and EMA-smoothed exactly as in the batch path; only running
+    maxima, per-frame confidences and the depth signal are kept, so each update is O(1).
+    Each settlement check smooths the depth so far and takes its argmax, the bottom
+    evaluate_dip is given in the batch path (a one-frame depth spike is not a bottom).
+    """
+    def __init__(
+        self,
+        window_half_size: int = 5,
+        conf_threshold: float = 0.3,
+        elbow_offset_ratio: float = 0.18,
+        deltoid_offset_ratio: float = 0.22,
+        ema_alpha: float = 0.4,
+        smoothing_window: int = 15,
+        smoothing_polyorder: int = 2
+    ):
+        self.window_half_size = window_half_size
+        self.smoothing_window = smoothing_window
+        self.smoothing_polyorder = smoothing_polyorder
+        self.conf_threshold = conf_threshold
+        self.ref_params = {"elbow_offset_ratio": elbow_offset_ratio, "deltoid_offset_ratio": deltoid_offset_ratio}
+        self.smoothers = {side: TemporalSmoother(alpha=ema_alpha) for side in ("left", "right")}
+        self.side_conf: Dict[str, List[Optional[float]]] = {"left": [], "right": []}
+        self.best_margin = {"left": -float('inf'), "right": -float('inf')}
+        self.depth: List[float] = []
+        
+    @property
+    def num_frames(self) -> int:
+        return len(self.depth)
+
+    @property
+    def bottom_idx(self) -> int:
+        """Bottom of the smoothed depth so far (detect_bottom_frame, as in phase detection)."""
+        return detect_bottom_frame(smooth_signal(np.asarray(self.depth), self.smoothing_window, self.smoothing_polyorder))
+        
+    def update(self, pose: Optional[PoseResult]) -> None:
+        """Feeds the next frame's pose (None if no pose was detected)."""
+        for side in ("left", "right"):
+            lm = self.smoothers[side].update(refine_landmarks(pose, side, **self.ref_params))
+            if lm:
+                self.side_conf[side].append((lm.elbow_confidence + lm.deltoid_confidence) / 2)
+                self.best_margin[side] = max(self.best_margin[side], lm.deltoid_apex[1] - lm.elbow_tip[1])
+            else:
+                self.side_conf[side].append(None)
+                
+        # Same carry-forward depth proxy as compute_depth_signal
+        value = depth_value(pose, self.conf_threshold)
+        self.depth.append(value if value is not None else (self.depth[-1] if self.depth else 0.0))
+            
+    def is_settled(
+        self,
+        margin_px: float = 5.0,
+        min_confidence: float = 0.6,
+        ascent_px: float = 10.0,
+        ascent_frames: int = 5
+    ) -> bool:
+        """
+        True once the verdict is VALID beyond doubt: the ascent has started and the side
+        evaluate_dip would select already has a margin >= margin_px with enough confidence.
+        
+        Args:
+            margin_px: Required running best margin.
+            min_confidence: Required mean E/D confidence of the selected side around the bottom.
+            ascent_px: Depth rise (pixels) below the running bottom that counts as ascending.
+            ascent_frames: Number of most recent frames that must all be ascending.
+        """
+        smoothed = smooth_signal(np.asarray(self.depth), self.smoothing_window, self.smoothing_polyorder)
+        b = detect_bottom_frame(smoothed)
+        # The side-selection window and the smoothing window after the bottom must be complete
+        if self.num_frames - 1 - b < max(ascent_frames, self.window_half_size, self.smoothing_window // 2):
+            return False
+        if any(d > smoothed[b] - ascent_px for d in self.depth[-ascent_frames:]):
+            return False
+            
+        start, end = max(0, b - self.window_half_size), b + self.window_half_size
+        confs = {}
+        for side in ("left", "right"):
+            window = [c for c in self.side_conf[side][start:end + 1] if c is not None]
+            confs[side] = float(np.mean(window)) if window else 0.0
+        side = "left" if confs["left"] >= confs["right"] else "right"
+        return confs[side] >= min_confidence and self.best_margin[side] >= margin_px
@@ -0,0 +1,210 @@
+import copy
+import itertools
+import json
+import math
+import os
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Dict, Any, Tuple
+
+# Relative accuracy cost of each degradation, used to rank the feasible plans.
+# The overlay does not affect the verdict and goes first; then frame stride
+# (interpolated frames), inference resolution, and finally the model itself.
+MODEL_PENALTY = {"rtmpose-l": 0.0, "rtmpose-m": 0.5, "rtmpose-s": 1.0}
+STRIDE_PENALTY = 0.3  # Per skipped frame between estimated frames
+SCALE_PENALTY = 1.2  # Per unit of resolution lost
+OVERLAY_PENALTY = 0.05
+
+# Cost priors (seconds per frame) used until a stage has been measured
+DEFAULT_COSTS = {
+    "decode": 0.003,
+    "pose:rtmpose-s": 0.025,
+    "pose:rtmpose-m": 0.060,
+    "pose:rtmpose-l": 0.150,
+    "analysis": 0.0005,
+    "overlay": 0.004
+}
+
+@dataclass
+class QualityPlan:
+    """Settings chosen for one job, and the latency they were predicted to take."""
+    model: str
+    inference_scale: float
+    frame_stride: int
+    overlay: bool
+    predicted_s: float
+    budget_s: Optional[float]  # Time this job was allowed (None: no deadline)
+    deadline_s: Optional[float]
+    queue_depth: int
+    meets_deadline: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["predicted_s"] = round(self.predicted_s, 3)
+        d["budget_s"] = None if self.budget_s is None else round(self.budget_s, 3)
+        return d
+
+class StageCosts:
+    """
+    Measured per-frame cost of each pipeline stage, as exponential moving averages of
+    the mean and of the absolute deviation (for a tail estimate), persisted as JSON.
+
+    Several workers may share one file: save() replays this instance's new observations
+    onto the file's current contents instead of overwriting them.
+    """
+    def __init__(self, path: Optional[str] = None, alpha: float = 0.2):
+        self.path = path
+        self.alpha = alpha
+        self.stats: Dict[str, Dict[str, float]] = self._load()
+        self.pending: List[Tuple[str, float]] = []  # Observed since the last save
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self.path and os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _update(self, stats: Dict[str, Dict[str, float]], key: str, value: float) -> None:
+        entry = stats.get(key)
+        if entry is None:
+            stats[key] = {"mean": value, "dev": 0.0, "n": 1}
+            return
+        entry["dev"] += self.alpha * (abs(value - entry["mean"]) - entry["dev"])
+        entry["mean"] += self.alpha * (value - entry["mean"])
+        entry["n"] += 1
+
+    def observe(self, key: str, value: float) -> None:
+        self._update(self.stats, key, value)
+        self.pending.append((key, value))
+
+    def estimate(self, key: str, tail_z: float = 0.0) -> float:
+        """Mean cost plus `tail_z` deviations; priors for stages not measured yet."""
+        entry = self.stats.get(key)
+        if entry is not None:
+            # 1.25 * mean absolute deviation ~ standard deviation for normal noise
+            return entry["mean"] + tail_z * 1.25 * entry["dev"]
+        base, _, scale = key.partition("@")
+        # Unmeasured resolution: assume half the cost scales with the pixel count
+        factor = 0.5 + 0.5 * float(scale) ** 2 if scale else 1.0
+        if base in self.stats:
+            return factor * self.estimate(base, tail_z)
+        return factor * DEFAULT_COSTS.get(base, 0.0)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        # Merged with what other workers saved since this one last read the file
+        stats = self._load()
+        for key, value in self.pending:
+            self._update(stats, key, value)
+        self.stats, self.pending = stats, []
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Written to a temporary file first so a reader never sees half a file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def pose_key(model: str, scale: float) -> str:
+    return f"pose:{model}" if scale == 1.0 else f"pose:{model}@{scale:g}"
+
+class QualityScheduler:
+    """
+    Picks model, inference resolution, frame stride and overlay for a job so that
+    its predicted tail latency fits its time budget, degrading accuracy as little as
+    possible.
+
+    The budget is what is left of the deadline once the job starts. With jobs queued
+    behind it, it is also capped at the deadline's share per job (deadline / (1 +
+    queue depth / workers)), so that a backlog is drained at lower quality instead of
+    making every later job miss its deadline.
+    """
+    def __init__(self, config: Dict[str, Any], costs: Optional[StageCosts] = None):
+        cfg = config.get('scheduler', {})
+        self.models = cfg.get('models', ["rtmpose-l", "rtmpose-m", "rtmpose-s"])
+        self.scales = cfg.get('inference_scales', [1.0, 0.75, 0.5])
+        self.strides = cfg.get('frame_strides', [1, 2, 3])
+        self.tail_z = cfg.get('tail_z', 2.33)  # ~p99 for normal noise
+        self.costs = costs or StageCosts(cfg.get('costs_path'))
+
+    def predict(self, num_frames: int, model: str, scale: float, stride: int, overlay: bool) -> float:
+        """Predicted tail latency of one job, in seconds."""
+        z = self.tail_z
+        estimated = math.ceil(num_frames / stride)
+        total = (self.costs.estimate("decode", z) + self.costs.estimate("analysis", z)) * num_frames
+        total += self.costs.estimate(pose_key(model, scale), z) * estimated
+        if overlay:
+            total += self.costs.estimate("overlay", z) * num_frames
+        return total
+
+    def budget(self, deadline_s: Optional[float], elapsed_s: float = 0.0, queue_depth: int = 0,
+               workers: int = 1) -> Optional[float]:
+        if deadline_s is None:
+            return None
+        budget = deadline_s - elapsed_s
+        if queue_depth > 0:
+            budget = min(budget, deadline_s / (1 + queue_depth / max(workers, 1)))
+        return budget
+
+    def plan(
+        self,
+        num_frames: int,
+        deadline_s: Optional[float],
+        elapsed_s: float = 0.0,
+        queue_depth: int = 0,
+        workers: int = 1
+    ) -> QualityPlan:
+        """
+        Best-quality settings whose predicted latency fits the budget; the cheapest
+        settings if none does. Without a deadline, the best quality.
+
+        Args:
+            num_frames: Frames in the video.
+            deadline_s: Latency deadline from submission, in seconds.
+            elapsed_s: Time already spent since submission (queue wait).
+            queue_depth: Jobs waiting behind this one.
+            workers: Workers sharing the queue.
+        """
+        budget = self.budget(deadline_s, elapsed_s, queue_depth, workers)
+        candidates = []
+        for model, scale, stride, overlay in itertools.product(self.models, self.scales, self.strides, (True, False)):
+            penalty = (MODEL_PENALTY.get(model, 0.0) + SCALE_PENALTY * (1.0 - scale)
+                       + STRIDE_PENALTY * (stride - 1) + (0.0 if overlay else OVERLAY_PENALTY))
+            predicted = self.predict(num_frames, model, scale, stride, overlay)
+            candidates.append((penalty, predicted, model, scale, stride, overlay))
+
+        feasible = [c for c in candidates if budget is None or c[1] <= budget]
+        if feasible:
+            penalty, predicted, model, scale, stride, overlay = min(feasible, key=lambda c: (c[0], c[1]))
+        else:
+            penalty, predicted, model, scale, stride, overlay = min(candidates, key=lambda c: (c[1], c[0]))
+        return QualityPlan(model, scale, stride, overlay, predicted, budget, deadline_s, queue_depth, bool(feasible))
+
+    def observe(self, plan: QualityPlan, num_frames: int, timings: Dict[str, float],
+                pose_frames: Optional[int] = None) -> None:
+        """
+        Updates the stage costs with a finished job's timings (seconds per stage).
+
+        pose_frames is the number of frames that went through the pose model when it is
+        not one per stride (e.g. with the motion gate).
+        """
+        estimated = math.ceil(num_frames / plan.frame_stride) if pose_frames is None else pose_frames
+        per_frame = {
+            "decode": ("decode", num_frames),
+            "pose": (pose_key(plan.model, plan.inference_scale), estimated),
+            "analysis": ("analysis", num_frames),
+            "overlay": ("overlay", num_frames)
+        }
+        for stage, seconds in timings.items():
+            if stage in per_frame and per_frame[stage][1] > 0:
+                key, frames = per_frame[stage]
+                self.costs.observe(key, seconds / frames)
+        self.costs.save()
+
+def apply_plan(config: Dict[str, Any], plan: QualityPlan) -> Dict[str, Any]:
+    """Copy of the config with the plan's settings."""
+    config = copy.deepcopy(config)
+    config['pose']['model'] = plan.model
+    config['pose']['inference_scale'] = plan.inference_scale
+    config['pose']['frame_stride'] = plan.frame_stride
+    config['output']['overlay'] = plan.overlay
+    return config
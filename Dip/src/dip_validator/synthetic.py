@@ -0,0 +1,167 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from .pose import PoseResult, arrays_to_poses
+
+# COCO keypoint indices, (left, right) pairs
+NOSE = 0
+EYES, EARS = (1, 2), (3, 4)
+SHOULDERS, ELBOWS, WRISTS = (5, 6), (7, 8), (9, 10)
+HIPS, KNEES, ANKLES = (11, 12), (13, 14), (15, 16)
+
+@dataclass
+class SyntheticClip:
+    """
+    Generated keypoint sequence with its known ground truth, in the layout of
+    poses_to_arrays (NaN keypoints and zero confidences where there is no pose).
+    """
+    keypoints: np.ndarray  # (T, 17, 2) float32
+    confidences: np.ndarray  # (T, 17) float32
+    fps: float
+    width: int
+    height: int
+    depth_px: float  # Depth reached on every rep (see synthetic_dip)
+    bottom_frames: np.ndarray  # (reps,) frame index of each rep's deepest point
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.keypoints)
+
+    @property
+    def meta(self):
+        return {"fps": self.fps, "width": self.width, "height": self.height, "frame_count": self.num_frames}
+
+    def poses(self) -> List[Optional[PoseResult]]:
+        return arrays_to_poses(self.keypoints, self.confidences)
+
+def motion_profile(
+    num_frames: Optional[int],
+    reps: int,
+    fps: float,
+    rep_s: float,
+    hold_s: float,
+    bottom_hold_s: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Depth fraction per frame (0 at the top, 1 at the bottom): a hold at the top, then
+    a cosine-eased descent and ascent, repeated.
+
+    Args:
+        num_frames: Total frames; the reps are repeated (or cut) to this length. None:
+            exactly `reps` reps followed by a final hold.
+        reps: Number of reps when num_frames is None.
+        fps: Frame rate.
+        rep_s: Duration of one descent plus ascent.
+        hold_s: Hold at the top before each rep (and after the last one).
+        bottom_hold_s: Pause at the bottom.
+
+    Returns:
+        Tuple of the (T,) depth fraction and the frame index of each complete rep's bottom.
+    """
+    hold = max(1, round(hold_s * fps))
+    half = max(2, round(rep_s * fps / 2))
+    pause = round(bottom_hold_s * fps)
+    ease = 0.5 - 0.5 * np.cos(np.linspace(0, math.pi, half, endpoint=False))
+    cycle = np.concatenate([np.zeros(hold), ease, np.ones(pause + 1), ease[::-1][:-1]])
+    if num_frames is None:
+        num_frames = reps * len(cycle) + hold
+    count = math.ceil(num_frames / len(cycle))
+    profile = np.zeros(count * len(cycle) + hold)
+    profile[:count * len(cycle)] = np.tile(cycle, count)
+    profile = profile[:num_frames]
+    bottoms = hold + half + pause // 2 + len(cycle) * np.arange(count)
+    return profile, bottoms[bottoms + half + pause - pause // 2 < num_frames]
+
+def finish_keypoints(
+    keypoints: np.ndarray,
+    near_conf: float,
+    rng: np.random.Generator,
+    noise_px: float,
+    dropout: float,
+    far_conf: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Adds far-side confidences, keypoint noise and dropped frames (shared by the clip generators)."""
+    num_frames = len(keypoints)
+    confidences = np.empty((num_frames, 17), dtype=np.float32)
+    confidences[:] = near_conf
+    for left, right in (EYES, EARS, SHOULDERS, ELBOWS, WRISTS, HIPS, KNEES, ANKLES):
+        confidences[:, right] = far_conf
+    if noise_px > 0:
+        keypoints += rng.normal(0.0, noise_px, keypoints.shape).astype(np.float32)
+    if dropout > 0:
+        dropped = rng.random(num_frames) < dropout
+        keypoints[dropped] = np.nan
+        confidences[dropped] = 0.0
+    return keypoints, confidences
+
+def synthetic_dip(
+    num_frames: Optional[int] = None,
+    reps: int = 1,
+    depth_px: float = 20.0,
+    fps: float = 30.0,
+    noise_px: float = 0.0,
+    dropout: float = 0.0,
+    rep_s: float = 2.0,
+    hold_s: float = 1.0,
+    bottom_hold_s: float = 0.0,
+    upper_arm: float = 110.0,
+    forearm: float = 100.0,
+    forearm_lean_deg: float = 15.0,
+    width: int = 1280,
+    height: int = 720,
+    seed: int = 0
+) -> SyntheticClip:
+    """
+    Dip filmed from the side (lifter facing +x): wrists fixed on the bars, the forearm
+    leans back and the upper arm rotates forward from vertical (straight arms) until
+    the shoulder is depth_px below the elbow.
+
+    After refinement, the deltoid/elbow margin at the bottom is
+    depth_px - (deltoid_offset_ratio - elbow_offset_ratio) * upper_arm * cos(forearm lean).
+
+    Args:
+        num_frames: Clip length (reps repeated to fill it); None for `reps` reps.
+        reps: Number of reps when num_frames is None.
+        depth_px: Shoulder joint below the elbow joint at the bottom of every rep
+            (negative: above it). Must be within +/- upper_arm.
+        fps: Frame rate.
+        noise_px: Standard deviation of Gaussian keypoint noise.
+        dropout: Fraction of frames without a pose.
+        rep_s, hold_s, bottom_hold_s: Rep timing (see motion_profile).
+        upper_arm, forearm: Segment lengths in pixels.
+        forearm_lean_deg: Backward lean of the forearm at the bottom.
+        width, height: Frame size.
+        seed: Random seed for noise and dropouts.
+
+    Returns:
+        SyntheticClip with the bottom frame of every rep.
+    """
+    if abs(depth_px) >= upper_arm:
+        raise ValueError(f"depth_px must be within +/- upper_arm ({upper_arm})")
+    rng = np.random.default_rng(seed)
+    profile, bottoms = motion_profile(num_frames, reps, fps, rep_s, hold_s, bottom_hold_s)
+
+    # Upper arm angle from vertical: 0 with straight arms, past 90 degrees once the
+    # shoulder is below the elbow
+    arm_angle = np.arccos(-depth_px / upper_arm) * profile
+    lean = np.radians(forearm_lean_deg) * profile
+    wrist = np.broadcast_to(np.array([width * 0.5, height * 0.7]), (len(profile), 2))
+    elbow = wrist + forearm * np.stack([-np.sin(lean), -np.cos(lean)], axis=1)
+    shoulder = elbow + upper_arm * np.stack([np.sin(arm_angle), -np.cos(arm_angle)], axis=1)
+    torso = 1.5 * upper_arm
+    thigh, shin = 1.3 * upper_arm, 1.2 * upper_arm
+    # Hips under the shoulders, knees bent with the feet crossed behind
+    hip = shoulder + [-0.1 * upper_arm, torso]
+    knee = hip + [0.2 * thigh, 0.95 * thigh]
+    ankle = knee + [-0.8 * shin, 0.6 * shin]
+    head = shoulder + [0.15 * upper_arm, -0.5 * upper_arm]
+
+    keypoints = np.empty((len(profile), 17, 2), dtype=np.float32)
+    keypoints[:, NOSE] = head + [0.15 * upper_arm, 0.0]
+    for joints, point in ((EYES, head + [0.1 * upper_arm, -0.05 * upper_arm]), (EARS, head), (SHOULDERS, shoulder),
+                          (ELBOWS, elbow), (WRISTS, wrist), (HIPS, hip), (KNEES, knee), (ANKLES, ankle)):
+        keypoints[:, joints[0]] = point
+        keypoints[:, joints[1]] = point + [3.0, 0.0]
+    keypoints, confidences = finish_keypoints(keypoints, 0.9, rng, noise_px, dropout, far_conf=0.6)
+    return SyntheticClip(keypoints, confidences, fps, width, height, depth_px, bottoms)
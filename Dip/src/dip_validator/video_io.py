@@ -1,50 +1,242 @@
 import cv2
+import json
 import numpy as np
 import os
+from dataclasses import dataclass, asdict
+from typing import Iterator, Optional
 
-def load_video(path: str) -> tuple[list[np.ndarray], dict]:
+# Forward gap (in frames) below which decoding through is cheaper than a seek
+SEEK_THRESHOLD = 16
+
+@dataclass
+class FrameIndex:
+    """Per-frame presentation timestamps of a video, keyed to the file it was built from."""
+    source_size: int
+    source_mtime: float
+    fps: float
+    width: int
+    height: int
+    timestamps_ms: list[float]
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.timestamps_ms)
+
+    def matches(self, path: str) -> bool:
+        """True if the index was built from the file currently at `path`."""
+        stat = os.stat(path)
+        return stat.st_size == self.source_size and abs(stat.st_mtime - self.source_mtime) < 1e-3
+
+def default_index_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".index.json"
+
+def _new_index(path: str, fps: float, width: int, height: int, timestamps_ms: list[float]) -> FrameIndex:
+    stat = os.stat(path)
+    return FrameIndex(stat.st_size, stat.st_mtime, fps, width, height, timestamps_ms)
+
+def save_frame_index(index: FrameIndex, index_path: str) -> str:
+    with open(index_path, 'w') as f:
+        json.dump(asdict(index), f)
+    return index_path
+
+def build_frame_index(path: str) -> FrameIndex:
     """
-    Load video frames using OpenCV.
+    Builds the index with one grab-only pass (frames are demuxed and decoded but
+    never converted to BGR arrays).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Video file not found: {path}")
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {path}")
+
+    timestamps = []
+    while cap.grab():
+        timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC))
+    index = _new_index(path, cap.get(cv2.CAP_PROP_FPS),
+                       int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), timestamps)
+    cap.release()
+    if not timestamps:
+        raise ValueError(f"No frames read from video: {path}")
+    return index
+
+def load_frame_index(path: str, index_path: Optional[str] = None) -> FrameIndex:
+    """
+    Loads the persisted index for a video, rebuilding (and saving) it if it is
+    missing or was built from a different file.
+    """
+    index_path = index_path or default_index_path(path)
+    if os.path.exists(index_path):
+        with open(index_path, 'r') as f:
+            index = FrameIndex(**json.load(f))
+        if index.matches(path):
+            return index
+    index = build_frame_index(path)
+    save_frame_index(index, index_path)
+    return index
+
+class _Cursor:
+    """VideoCapture positioned on a known frame, verified against the index timestamps."""
+    def __init__(self, path: str, index: FrameIndex):
+        self.path = path
+        self.index = index
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Could not open video: {path}")
+        self.pos = 0  # Index of the next frame read() returns
+        # Half a frame of tolerance when checking where a seek landed
+        self.tolerance_ms = 500.0 / index.fps if index.fps > 0 else 1.0
+
+    def seek(self, target: int):
+        if 0 <= target - self.pos < SEEK_THRESHOLD:
+            while self.pos < target:
+                self.cap.grab()
+                self.pos += 1
+            return
+        # The backend seeks to the preceding keyframe and decodes forward to the target
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        self.pos = target
+
+    def read(self) -> np.ndarray:
+        expected_ms = self.index.timestamps_ms[self.pos]
+        ret, frame = self.cap.read()
+        if not ret or abs(self.cap.get(cv2.CAP_PROP_POS_MSEC) - expected_ms) > self.tolerance_ms:
+            # Inexact seek (e.g. variable frame rate): reopen and grab sequentially
+            target = self.pos
+            self.cap.release()
+            self.cap = cv2.VideoCapture(self.path)
+            for _ in range(target):
+                self.cap.grab()
+            ret, frame = self.cap.read()
+            if not ret:
+                raise ValueError(f"Could not decode frame {target} of {self.path}")
+        self.pos += 1
+        return frame
+
+    def release(self):
+        self.cap.release()
+
+def get_frames(path: str, indices: list[int], index: Optional[FrameIndex] = None) -> dict[int, np.ndarray]:
+    """
+    Decodes only the requested frames.
+
+    Args:
+        path: Video path.
+        indices: Frame indices, in any order (duplicates allowed).
+        index: Frame index (default: load_frame_index(path)).
+
     Returns:
-        frames: list of numpy arrays (BGR)
-        metadata: dict with fps, width, height, frame_count, duration
+        Dict mapping frame index to BGR frame.
+    """
+    index = index or load_frame_index(path)
+    wanted = sorted(set(indices))
+    if wanted and not (0 <= wanted[0] and wanted[-1] < index.frame_count):
+        raise IndexError(f"Frame indices out of range [0, {index.frame_count})")
+
+    frames = {}
+    cursor = _Cursor(path, index)
+    try:
+        for i in wanted:
+            cursor.seek(i)
+            frames[i] = cursor.read()
+    finally:
+        cursor.release()
+    return frames
+
+def iter_range(path: str, start: int, stop: int, index: Optional[FrameIndex] = None) -> Iterator[tuple[int, np.ndarray]]:
+    """Yields (frame index, BGR frame) for frames start..stop-1, seeking once to `start`."""
+    index = index or load_frame_index(path)
+    start, stop = max(start, 0), min(stop, index.frame_count)
+    if start >= stop:
+        return
+    cursor = _Cursor(path, index)
+    try:
+        cursor.seek(start)
+        for i in range(start, stop):
+            yield i, cursor.read()
+    finally:
+        cursor.release()
+
+def probe_video(path: str) -> dict:
+    """
+    Container metadata without decoding: fps, width, height, frame_count (as reported
+    by the container, may be approximate).
     """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Video file not found: {path}")
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {path}")
+    meta = {
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    }
+    cap.release()
+    return meta
+
+def open_video(path: str) -> cv2.VideoCapture:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Video file not found: {path}")
 
     cap = cv2.VideoCapture(path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video: {path}")
+    return cap
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    # Note: CAP_PROP_FRAME_WIDTH/HEIGHT might be raw dimensions before rotation
-    # We will trust the dimensions of the read frames.
-    
-    frames = []
+def iter_video(cap: cv2.VideoCapture) -> Iterator[tuple[np.ndarray, float]]:
+    """Yields (BGR frame, timestamp in ms) until the end of the stream."""
     while True:
         ret, frame = cap.read()
         if not ret:
             break
-        frames.append(frame)
-    
-    cap.release()
-    
-    if not frames:
+        yield frame, cap.get(cv2.CAP_PROP_POS_MSEC)
+
+def video_metadata(path: str, fps: float, frame_shape: Optional[tuple], timestamps: list[float],
+                   index_path: Optional[str] = None) -> dict:
+    """
+    Metadata of a fully decoded video; persists its frame index if index_path is given.
+    """
+    if not timestamps:
         raise ValueError(f"No frames read from video: {path}")
 
-    # Update metadata based on actual read frames
-    height, width = frames[0].shape[:2]
-    frame_count = len(frames)
+    # Note: CAP_PROP_FRAME_WIDTH/HEIGHT might be raw dimensions before rotation
+    # We trust the dimensions of the read frames.
+    height, width = frame_shape[:2]
+    frame_count = len(timestamps)
     duration = frame_count / fps if fps > 0 else 0
+    if index_path:
+        save_frame_index(_new_index(path, fps, width, height, timestamps), index_path)
 
-    metadata = {
+    return {
         "fps": fps,
         "width": width,
         "height": height,
         "frame_count": frame_count,
         "duration": duration
     }
+
+def load_video(path: str, index_path: Optional[str] = None) -> tuple[list[np.ndarray], dict]:
+    """
+    Load video frames using OpenCV.
+    If index_path is given, the frame index is persisted there as a by-product of the decode.
+    Returns:
+        frames: list of numpy arrays (BGR)
+        metadata: dict with fps, width, height, frame_count, duration
+    """
+    cap = open_video(path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    
+    frames = []
+    timestamps = []
+    for frame, timestamp in iter_video(cap):
+        frames.append(frame)
+        timestamps.append(timestamp)
+    
+    cap.release()
     
+    metadata = video_metadata(path, fps, frames[0].shape if frames else None, timestamps, index_path)
     return frames, metadata
 
 def save_video(frames: list[np.ndarray], path: str, fps: float):
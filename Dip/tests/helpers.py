@@ -0,0 +1,28 @@
+# Poses and config shared by the judge, early-exit, calibration, multiview and scheduler tests
+import numpy as np
+from dip_validator.pose import PoseResult
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3},
+    "phases": {"smoothing_window": 5, "smoothing_polyorder": 2, "bottom_window": 2},
+    "landmarks": {"elbow_offset_ratio": 0.18, "deltoid_offset_ratio": 0.22, "ema_alpha": 0.4},
+    "decision": {"min_confidence": 0.3},
+    "lockout": {"min_elbow_angle_deg": 160}
+}
+
+def make_pose(shoulder, elbow, wrist):
+    kp = np.zeros((17, 2))
+    kp[5] = kp[6] = shoulder
+    kp[7] = kp[8] = elbow
+    kp[9] = kp[10] = wrist
+    kp[11] = kp[12] = [shoulder[0], shoulder[1] + 200]
+    return PoseResult(keypoints=kp, confidences=np.full(17, 0.9), bbox=(0, 0, 10, 10))
+
+def dip_poses(final_depth=0.0):
+    # Straight arms at the top, shoulder sinking below the bent elbow at the bottom, then back up
+    poses = []
+    for depth in list(np.linspace(0, 1, 8)) + list(np.linspace(1, final_depth, 11)):
+        shoulder = [100, 100 + 160 * depth]
+        elbow = [100 + 60 * depth, 200 + 20 * depth]
+        poses.append(make_pose(shoulder, elbow, [100, 300]))
+    return poses
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from dip_validator.batch import pad_clips, score_batch, to_decision, rescore_clips, DECISION_DTYPE
+from dip_validator.synthetic import synthetic_dip
+from dip_validator.judges import AnalysisContext, DipDepthJudge
+from dip_validator.pose import arrays_to_poses, save_pose_cache
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3},
+    "phases": {"smoothing_window": 15, "smoothing_polyorder": 2, "bottom_window": 5},
+    "landmarks": {"elbow_offset_ratio": 0.18, "deltoid_offset_ratio": 0.22, "ema_alpha": 0.4},
+    "decision": {"min_confidence": 0.3}
+}
+
+def make_clips():
+    clips = [synthetic_dip(num_frames=n, depth_px=d, noise_px=1.5, dropout=p, seed=i)
+             for i, (n, d, p) in enumerate([(120, 15.0, 0.0), (95, -10.0, 0.05), (200, 3.0, 0.1),
+                                            (61, -30.0, 0.0), (150, 0.5, 0.02)])]
+    keypoints = [c.keypoints.astype(np.float64) for c in clips]
+    confidences = [c.confidences.astype(np.float64) for c in clips]
+    # Right side more confident in one clip; a clip shorter than the smoothing window
+    confidences[3][:, [6, 8, 10]] = 0.95
+    keypoints.append(keypoints[0][50:59].copy())
+    confidences.append(confidences[0][50:59].copy())
+    # Nobody in frame at all
+    keypoints.append(np.full((40, 17, 2), np.nan))
+    confidences.append(np.zeros((40, 17)))
+    return keypoints, confidences
+
+def per_clip(keypoints, confidences, fps=30.0):
+    meta = {"fps": fps, "width": 1280, "height": 720, "frame_count": len(keypoints)}
+    return DipDepthJudge().evaluate(AnalysisContext(arrays_to_poses(keypoints, confidences), meta, CONFIG))
+
+def test_matches_per_clip_judge():
+    keypoints, confidences = make_clips()
+    batch_kp, batch_conf, lengths = pad_clips(keypoints, confidences)
+    decisions = score_batch(batch_kp, batch_conf, lengths, CONFIG, fps=np.full(len(lengths), 30.0))
+
+    assert decisions.dtype == DECISION_DTYPE
+    for kp, conf, record in zip(keypoints, confidences, decisions):
+        expected, got = per_clip(kp, conf), to_decision(record)
+        assert got.valid == expected.valid
+        assert got.selected_side == expected.selected_side
+        assert got.bottom_frame_index == expected.bottom_frame_index
+        assert got.margin_px == pytest.approx(expected.margin_px, abs=1e-6)
+        assert got.best_margin_px == pytest.approx(expected.best_margin_px, abs=1e-6)
+        assert got.confidence == pytest.approx(expected.confidence, abs=1e-9)
+        assert sorted(got.warnings) == sorted(expected.warnings)
+        if expected.interpolated_margin_px is None:
+            assert got.interpolated_margin_px is None
+        else:
+            assert got.interpolated_margin_px == pytest.approx(expected.interpolated_margin_px, abs=1e-6)
+        assert got.bottom_time_s == pytest.approx(expected.bottom_time_s, abs=1e-9)
+
+def test_padding_does_not_change_scores():
+    keypoints, confidences = make_clips()
+    together = score_batch(*pad_clips(keypoints, confidences), CONFIG)
+    for i in range(len(keypoints)):
+        alone = score_batch(*pad_clips(keypoints[i:i + 1], confidences[i:i + 1]), CONFIG)
+        for name in ("valid", "bottom_frame_index", "selected_side"):
+            assert alone[name][0] == together[name][i]
+        np.testing.assert_allclose(alone["margin_px"][0], together["margin_px"][i], atol=1e-9)
+
+def test_no_landmarks_and_no_fps():
+    keypoints, confidences = make_clips()
+    record = score_batch(*pad_clips(keypoints[-1:], confidences[-1:]), CONFIG)[0]
+    decision = to_decision(record)
+    assert not decision.valid and decision.margin_px == 0.0
+    assert decision.interpolated_margin_px is None and decision.bottom_time_s is None
+    assert "no_landmarks_for_decision" in decision.warnings
+
+def test_rescore_clips_keeps_input_order(tmp_path):
+    keypoints, confidences = make_clips()
+    paths = []
+    for i, (kp, conf) in enumerate(zip(keypoints, confidences)):
+        path = tmp_path / f"clip{i}.npz"
+        save_pose_cache(str(path), arrays_to_poses(kp, conf), {"fps": 30.0, "width": 1280, "height": 720})
+        paths.append(str(path))
+    decisions = rescore_clips(paths, CONFIG, batch_size=3)
+    for kp, conf, record in zip(keypoints, confidences, decisions):
+        assert to_decision(record).valid == per_clip(kp, conf).valid
+        assert int(record["bottom_frame_index"]) == per_clip(kp, conf).bottom_frame_index
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from dip_validator.calibration import (
+    apply_params,
+    calibration_tasks,
+    load_ground_truth,
+    load_clips,
+    parameter_grid,
+    random_parameter_sets,
+    run_calibration,
+    write_results
+)
+from dip_validator.pose import save_pose_cache, load_pose_cache
+from helpers import CONFIG, dip_poses
+
+META = {"fps": 30.0, "width": 640, "height": 480}
+
+def test_pose_cache_roundtrip(tmp_path):
+    poses = dip_poses()
+    poses[3] = None
+    path = save_pose_cache(str(tmp_path / "keypoints.npz"), poses, META)
+
+    loaded, meta = load_pose_cache(path)
+    assert loaded[3] is None
+    assert np.allclose(loaded[5].keypoints, poses[5].keypoints)
+    assert np.allclose(loaded[5].confidences, poses[5].confidences)
+    assert meta["fps"] == 30.0 and meta["frame_count"] == len(poses)
+
+def test_parameter_grid_and_random():
+    grid = parameter_grid({"ema_alpha": [0.3, 0.4], "bottom_window": [2, 3, 5]})
+    assert len(grid) == 6
+    assert {"ema_alpha": 0.4, "bottom_window": 5} in grid
+
+    sets = random_parameter_sets({"ema_alpha": {"min": 0.2, "max": 0.8}, "bottom_window": {"min": 2, "max": 6}}, 20)
+    assert all(0.2 <= p["ema_alpha"] <= 0.8 and isinstance(p["bottom_window"], int) for p in sets)
+
+def test_apply_params_sections():
+    config = apply_params(CONFIG, {"ema_alpha": 0.9, "phases.bottom_window": 7})
+    assert config["landmarks"]["ema_alpha"] == 0.9
+    assert config["phases"]["bottom_window"] == 7
+    assert CONFIG["landmarks"]["ema_alpha"] == 0.4
+
+    with pytest.raises(ValueError, match="Unknown parameter"):
+        apply_params(CONFIG, {"unknown": 1})
+
+def test_run_calibration(tmp_path):
+    for name, poses in [("deep", dip_poses()), ("shallow", dip_poses()[:3])]:
+        (tmp_path / "poses" / name).mkdir(parents=True)
+        save_pose_cache(str(tmp_path / "poses" / name / "keypoints.npz"), poses, META)
+    (tmp_path / "truth.csv").write_text("video,result,margin_px\ndeep.mp4,VALID,\nshallow.mp4,INVALID,\n")
+
+    truth = load_ground_truth(str(tmp_path / "truth.csv"))
+    clips = load_clips(str(tmp_path / "poses"), names=list(truth))
+    param_sets = parameter_grid({"ema_alpha": [0.4, 1.0], "bottom_window": [1, 2]})
+    results = run_calibration(clips, truth, CONFIG, param_sets, workers=1)
+
+    assert len(results) == 4
+    assert results[0]["accuracy"] == 1.0
+    assert results[0]["clips"] == 2
+
+    path = write_results(results, str(tmp_path / "calibration.csv"))
+    lines = open(path).read().splitlines()
+    assert lines[0].startswith("bottom_window,ema_alpha,accuracy")
+    assert len(lines) == 5
+
+def test_single_group_sweep_is_split_across_workers(tmp_path):
+    # Only phase parameters vary: one landmark group, still several pool tasks
+    param_sets = parameter_grid({"bottom_window": [1, 2, 3, 4, 5, 6, 7]})
+    tasks = calibration_tasks(param_sets, workers=3)
+    assert len(tasks) == 3
+    assert sorted(p["bottom_window"] for task in tasks for p in task) == list(range(1, 8))
+
+    tasks = calibration_tasks(parameter_grid({"ema_alpha": [0.4, 1.0], "bottom_window": [1, 2, 3]}), workers=4)
+    assert all(len({p["ema_alpha"] for p in task}) == 1 for task in tasks)
+
+    (tmp_path / "deep").mkdir()
+    save_pose_cache(str(tmp_path / "deep" / "keypoints.npz"), dip_poses(), META)
+    truth = {"deep": {"valid": True, "margin_px": None}}
+    clips = load_clips(str(tmp_path), names=list(truth))
+    pooled = run_calibration(clips, truth, CONFIG, param_sets, workers=3)
+    serial = run_calibration(clips, truth, CONFIG, param_sets, workers=1)
+    assert pooled == serial
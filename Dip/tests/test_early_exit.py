@@ -0,0 +1,90 @@
+import numpy as np
+from dip_validator.cli import estimate_video_poses
+from dip_validator.rules import IncrementalDipEvaluator, evaluate_dip
+from dip_validator.refinement import refine_landmarks, smooth_landmarks_temporal
+from dip_validator.phases import compute_depth_signal, smooth_signal, detect_bottom_frame
+from dip_validator.pose import PoseResult
+from helpers import dip_poses, make_pose
+
+class ReplayEstimator:
+    """Returns precomputed poses in order, counting inference calls."""
+    def __init__(self, poses):
+        self.poses = poses
+        self.calls = 0
+
+    def estimate_poses(self, frames, conf_threshold=0.3):
+        self.calls += 1
+        return [self.poses[self.calls - 1]]
+
+def long_clip(final_depth=0.0):
+    # Dip followed by a long lockout hold, as in meet footage
+    top = make_pose([100, 100 + 160 * final_depth], [100 + 60 * final_depth, 200], [100, 300])
+    return dip_poses(final_depth) + [top] * 40
+
+def test_incremental_evaluator_settles_after_ascent():
+    evaluator = IncrementalDipEvaluator(window_half_size=2)
+    settled_at = None
+    for i, pose in enumerate(long_clip()):
+        evaluator.update(pose)
+        if evaluator.is_settled(margin_px=5.0, min_confidence=0.6, ascent_px=10.0, ascent_frames=3):
+            settled_at = i
+            break
+
+    # Bottom is frame 7-8; settles a few frames into the ascent, long before the end
+    assert settled_at is not None
+    assert 8 < settled_at < 19
+
+def test_incremental_evaluator_uses_smoothed_bottom():
+    # One-frame hip glitch during the descent: the raw maximum, but not the bottom evaluate_dip gets
+    poses = long_clip()
+    keypoints = poses[4].keypoints.copy()
+    keypoints[[11, 12], 1] += 150
+    poses[4] = PoseResult(keypoints, poses[4].confidences, poses[4].bbox)
+    final_bottom = detect_bottom_frame(smooth_signal(compute_depth_signal(poses, 0.3), 15, 2))
+    assert int(np.argmax(compute_depth_signal(poses, 0.3))) == 4 != final_bottom
+
+    evaluator = IncrementalDipEvaluator(window_half_size=2)
+    for i, pose in enumerate(poses):
+        evaluator.update(pose)
+        if evaluator.is_settled(ascent_frames=3):
+            break
+    assert evaluator.bottom_idx == final_bottom
+    assert i > final_bottom
+
+def test_incremental_evaluator_never_settles_invalid():
+    # Shoulder never drops below the elbow line
+    poses = [make_pose([100, 100 + 40 * d], [100 + 30 * d, 200], [100, 300])
+             for d in list(np.linspace(0, 1, 8)) + list(np.linspace(1, 0, 30))]
+    evaluator = IncrementalDipEvaluator(window_half_size=2)
+    for pose in poses:
+        evaluator.update(pose)
+        assert not evaluator.is_settled()
+
+def test_incremental_matches_batch_margin():
+    poses = long_clip()
+    evaluator = IncrementalDipEvaluator()
+    for pose in poses:
+        evaluator.update(pose)
+
+    left = smooth_landmarks_temporal([refine_landmarks(p, "left") for p in poses])
+    decision = evaluate_dip(left, [None] * len(poses), evaluator.bottom_idx, interpolate=False)
+    assert evaluator.best_margin["left"] == decision.best_margin_px
+
+def test_estimate_video_poses_early_exit():
+    poses = long_clip()
+    frames = [np.zeros((4, 4, 3), dtype=np.uint8)] * len(poses)
+    estimator = ReplayEstimator(poses)
+    results, exit_frame = estimate_video_poses(
+        frames, estimator, 0.3,
+        evaluator=IncrementalDipEvaluator(window_half_size=2),
+        settle_params={"ascent_frames": 3}
+    )
+
+    assert exit_frame is not None
+    assert estimator.calls == exit_frame + 1
+    assert len(results) == len(poses)
+    assert all(r is None for r in results[exit_frame + 1:])
+
+    # The verdict from the truncated results is still VALID
+    left = smooth_landmarks_temporal([refine_landmarks(p, "left") for p in results])
+    assert evaluate_dip(left, [None] * len(results), 8).valid is True
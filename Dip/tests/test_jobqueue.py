@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+from dip_validator.jobqueue import JobQueue, run_worker, submit_main
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "jobs.db"), lease_s=60.0)
+    yield q
+    q.close()
+
+def test_submit_claim_complete(queue):
+    first = queue.submit("a.mp4", "out", {"early_exit": True})
+    queue.submit("b.mp4", "out")
+
+    job = queue.claim("w1")
+    assert job.id == first and job.options == {"early_exit": True} and job.attempts == 1
+    assert queue.heartbeat(job.id, "w1")
+    assert not queue.heartbeat(job.id, "w2")
+    assert queue.complete(job.id, "w1", {"report": "out/a/report.json"})
+
+    assert queue.claim("w2").video_path == "b.mp4"
+    assert queue.claim("w3") is None
+    assert queue.counts() == {"done": 1, "running": 1}
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    killed = JobQueue(path, lease_s=-1.0)  # Lease already expired: the worker "died"
+    killed.submit("a.mp4", "out", max_attempts=2)
+    job = killed.claim("dead")
+
+    survivor = JobQueue(path, lease_s=60.0)
+    retry = survivor.claim("alive")
+    assert retry.id == job.id and retry.attempts == 2
+    assert not killed.complete(job.id, "dead")  # Late result from the lost lease is rejected
+    assert survivor.complete(retry.id, "alive")
+
+def test_retry_then_fail(queue):
+    queue.submit("bad.mp4", "out", max_attempts=2)
+    for attempt in (1, 2):
+        job = queue.claim("w1")
+        assert job.attempts == attempt
+        queue.fail(job.id, "w1", "ValueError: broken")
+        # Only the last attempt finishes the job
+        assert (queue.get(job.id)["finished_at"] is None) == (attempt == 1)
+    assert queue.claim("w1") is None
+    assert queue.get(job.id)["status"] == "failed"
+
+def test_concurrent_claims_are_exclusive(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    setup = JobQueue(path)
+    for i in range(40):
+        setup.submit(f"{i}.mp4", "out")
+
+    claimed = []
+    def work(name):
+        q = JobQueue(path)
+        while (job := q.claim(name)) is not None:
+            claimed.append(job.id)
+            q.complete(job.id, name)
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == list(range(1, 41))
+    assert setup.counts() == {"done": 40}
+
+def test_run_worker(queue):
+    queue.submit("ok.mp4", "out")
+    queue.submit("bad.mp4", "out", max_attempts=1)
+
+    def process(job, checkpoint):
+        if job.video_path == "bad.mp4":
+            raise ValueError("unreadable")
+        return {"report": "out/ok/report.json"}
+
+    assert run_worker(queue, process, "w1", exit_when_idle=True) == 2
+    assert queue.counts() == {"done": 1, "failed": 1}
+    assert "unreadable" in queue.get(2)["error"]
+
+def test_lost_lease_aborts_before_outputs(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), lease_s=0.3)
+    queue.submit("a.mp4", "out")
+    written = []
+
+    def process(job, checkpoint):
+        # Another worker takes the job over while this one is still running it
+        queue._transaction(lambda cur: cur.execute("UPDATE jobs SET worker = 'w2' WHERE id = ?", (job.id,)))
+        time.sleep(0.3)
+        checkpoint()
+        written.append(job.id)
+        return {"report": "out/a/report.json"}
+
+    assert run_worker(queue, process, "w1", max_jobs=1) == 1
+    assert written == []
+    job = queue.get(1)
+    assert job["worker"] == "w2" and job["status"] == "running" and job["error"] is None
+    queue.close()
+
+def test_submit_requires_existing_videos(tmp_path, capsys):
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"")
+    db = str(tmp_path / "jobs.db")
+    with pytest.raises(SystemExit) as exc:
+        submit_main(["--queue", db])
+    assert exc.value.code != 0
+
+    with pytest.raises(SystemExit) as exc:
+        submit_main(["--queue", db, str(video), str(tmp_path / "typo.mp4")])
+    assert exc.value.code == 1
+    assert "typo.mp4" in capsys.readouterr().err
+
+    submit_main(["--queue", db, "--judges", "dip_depth, dip_lockout", str(video)])
+    queue = JobQueue(db)
+    assert queue.counts() == {"queued": 1}
+    assert queue.claim("w1").options["judges"] == ["dip_depth", "dip_lockout"]
+    queue.close()
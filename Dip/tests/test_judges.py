@@ -0,0 +1,76 @@
+import pytest
+from dip_validator.judges import (
+    AnalysisContext,
+    Judge,
+    JUDGES,
+    SIGNALS,
+    load_judges,
+    register_judge,
+    run_judges,
+    judges_report
+)
+from helpers import CONFIG, dip_poses
+
+def test_context_caches_signals(monkeypatch):
+    calls = []
+    original = SIGNALS["depth_signal"]
+    monkeypatch.setitem(SIGNALS, "depth_signal", lambda ctx: calls.append(1) or original(ctx))
+
+    context = AnalysisContext(dip_poses(), {"height": 480}, CONFIG)
+    run_judges(load_judges(["dip_depth", "dip_lockout"]), context)
+    context.signal("phases")
+
+    assert len(calls) == 1
+
+def test_run_judges_fans_out():
+    context = AnalysisContext(dip_poses(), {"height": 480}, CONFIG)
+    judges = load_judges(["dip_depth", "dip_lockout"])
+    verdicts = run_judges(judges, context)
+
+    assert verdicts["dip_depth"].valid is True
+    assert verdicts["dip_lockout"].valid is True
+    assert verdicts["dip_lockout"].elbow_angle_deg == pytest.approx(180.0)
+
+    report = judges_report(judges, verdicts, context)
+    assert report["dip_depth"]["result"] == "VALID"
+    assert report["dip_lockout"]["keypoint_coverage"] == 1.0
+
+def test_lockout_not_reached():
+    poses = dip_poses(final_depth=0.5)
+    context = AnalysisContext(poses, {"height": 480}, CONFIG)
+    verdict = run_judges(load_judges(["dip_lockout"]), context)["dip_lockout"]
+
+    assert verdict.valid is False
+    assert verdict.elbow_angle_deg < 160
+
+def test_load_judges_unknown():
+    with pytest.raises(ValueError, match="Unknown judge"):
+        load_judges(["bench_press"])
+
+def test_judge_must_implement_evaluate_and_to_dict():
+    class NoReport(Judge):
+        name = "no_report"
+
+        def evaluate(self, context):
+            return None
+
+    with pytest.raises(TypeError):
+        NoReport()
+
+def test_register_custom_judge(monkeypatch):
+    monkeypatch.setattr("dip_validator.judges.JUDGES", dict(JUDGES))
+
+    @register_judge
+    class FrameCountJudge(Judge):
+        name = "frame_count"
+        signals = ("depth_signal",)
+
+        def evaluate(self, context):
+            return len(context.signal("depth_signal"))
+
+        def to_dict(self, result):
+            return {"result": "VALID", "frames": result}
+
+    context = AnalysisContext(dip_poses(), {"height": 480}, CONFIG)
+    verdicts = run_judges(load_judges(["frame_count"]), context)
+    assert verdicts["frame_count"] == len(dip_poses())
@@ -0,0 +1,137 @@
+import copy
+import os
+import cv2
+import numpy as np
+import pytest
+from dip_validator.cli import load_config, analyze_video
+from dip_validator.manifest import Manifest, stage_key
+from dip_validator.reporting import ResultsStore
+from dip_validator.pose import PoseEstimator, PoseResult
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "configs", "default.yaml")
+NUM_FRAMES = 24
+
+class DipEstimator(PoseEstimator):
+    """Replays one dip (down then up), counting the frames it is run on."""
+    def __init__(self):
+        self.prev_bbox = None
+        self.calls = 0
+
+    def detect_lifter(self, frame):
+        return (0.0, 0.0, float(frame.shape[1]), float(frame.shape[0]))
+
+    def estimate_crop(self, frame, bbox, conf_threshold):
+        depth = 1 - abs(self.calls % NUM_FRAMES - NUM_FRAMES / 2) / (NUM_FRAMES / 2)
+        self.calls += 1
+        kp = np.zeros((17, 2))
+        kp[5] = kp[6] = [50, 20 + 40 * depth]
+        kp[7] = kp[8] = [50 + 15 * depth, 45 + 5 * depth]
+        kp[9] = kp[10] = [50, 75]
+        kp[11] = kp[12] = [50, 70 + 40 * depth]
+        return PoseResult(keypoints=kp, confidences=np.full(17, 0.9), bbox=bbox)
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "dip.mp4")
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (96, 128))
+    for i in range(NUM_FRAMES):
+        out.write(np.full((128, 96, 3), i * 8, dtype=np.uint8))
+    out.release()
+    return path
+
+def mtimes(out_dir):
+    return {name: os.stat(os.path.join(out_dir, name)).st_mtime_ns
+            for name in ("keypoints.npz", "report.json", "overlay.mp4")}
+
+def test_manifest_freshness(tmp_path):
+    manifest = Manifest(str(tmp_path))
+    (tmp_path / "report.json").write_text("{}")
+    manifest.record("report", "abc", ["report.json"])
+
+    reloaded = Manifest(str(tmp_path))
+    assert reloaded.fresh("report", "abc")
+    assert not reloaded.fresh("report", "abd")
+    assert not reloaded.fresh("overlay", "abc")
+    os.remove(tmp_path / "report.json")
+    assert not reloaded.fresh("report", "abc")
+
+def test_stage_key_depends_on_own_inputs_only():
+    config = load_config(CONFIG_PATH)
+    changed = copy.deepcopy(config)
+    changed['output']['overlay_show_margin'] = not config['output']['overlay_show_margin']
+    changed['pipeline']['queue_size'] = 2
+
+    assert stage_key(config, "report", "pose") == stage_key(changed, "report", "pose")
+    assert stage_key(config, "overlay", "report") != stage_key(changed, "overlay", "report")
+    assert stage_key(config, "report", "pose") != stage_key(config, "report", "other pose")
+    changed['motion_gate']['max_skip'] += 1
+    assert stage_key(config, "pose", "video") != stage_key(changed, "pose", "video")
+
+def test_rerun_rebuilds_only_stale_stages(video, tmp_path):
+    config = load_config(CONFIG_PATH)
+    config['motion_gate']['enabled'] = False  # Count one inference per frame
+    out = str(tmp_path / "out")
+    estimator = DipEstimator()
+    report_path = analyze_video(video, out, config, estimator=estimator)
+    assert estimator.calls == NUM_FRAMES
+    video_dir = os.path.dirname(report_path)
+    first = mtimes(video_dir)
+
+    # Nothing changed: nothing is rebuilt
+    assert analyze_video(video, out, config, estimator=estimator) == report_path
+    assert estimator.calls == NUM_FRAMES
+    assert mtimes(video_dir) == first
+
+    # Overlay setting: only the overlay is rendered again
+    config['output']['overlay_show_margin'] = not config['output']['overlay_show_margin']
+    analyze_video(video, out, config, estimator=estimator)
+    second = mtimes(video_dir)
+    assert estimator.calls == NUM_FRAMES
+    assert second['keypoints.npz'] == first['keypoints.npz'] and second['report.json'] == first['report.json']
+    assert second['overlay.mp4'] != first['overlay.mp4']
+
+    # Phase setting: report and overlay, still no pose inference
+    config['phases']['bottom_window'] += 1
+    analyze_video(video, out, config, estimator=estimator)
+    third = mtimes(video_dir)
+    assert estimator.calls == NUM_FRAMES
+    assert third['keypoints.npz'] == first['keypoints.npz']
+    assert third['report.json'] != second['report.json'] and third['overlay.mp4'] != second['overlay.mp4']
+
+    analyze_video(video, out, config, estimator=estimator, force=True)
+    assert estimator.calls == 2 * NUM_FRAMES
+
+def test_results_db_written_when_report_is_fresh(video, tmp_path):
+    config = load_config(CONFIG_PATH)
+    out = str(tmp_path / "out")
+    estimator = DipEstimator()
+    report_path = analyze_video(video, out, config, estimator=estimator)
+    first = mtimes(os.path.dirname(report_path))
+
+    db = str(tmp_path / "results.db")
+    analyze_video(video, out, config, estimator=estimator, results_db=db)
+    assert mtimes(os.path.dirname(report_path)) == first
+    # Re-processing the same clip replaces its row rather than adding a duplicate
+    analyze_video(video, out, config, estimator=estimator, results_db=db)
+    store = ResultsStore(db)
+    rows = store.query()
+    store.close()
+    assert len(rows) == 1 and rows[0]['report_path'] == report_path
+    assert os.path.exists(rows[0]['trace_path'])
+
+def test_checkpoint_aborts_before_outputs(video, tmp_path):
+    config = load_config(CONFIG_PATH)
+    out_dir = str(tmp_path / "out")
+    calls = []
+
+    def checkpoint():
+        calls.append(len(calls))
+        if len(calls) == 2:
+            raise RuntimeError("lease lost")
+
+    with pytest.raises(RuntimeError):
+        analyze_video(video, out_dir, config, estimator=DipEstimator(), checkpoint=checkpoint)
+    # Poses were cached before the abort, nothing after it was written
+    files = os.listdir(os.path.join(out_dir, "dip"))
+    assert "keypoints.npz" in files
+    assert "report.json" not in files and "overlay.mp4" not in files
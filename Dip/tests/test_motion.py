@@ -0,0 +1,166 @@
+import cv2
+import numpy as np
+import pytest
+from dip_validator.motion import MotionGate, create_motion_gate
+from dip_validator.synthetic import synthetic_dip
+from dip_validator.judges import AnalysisContext, DipDepthJudge
+from dip_validator.pose import PoseEstimator, PoseResult, save_pose_cache, load_pose_cache
+from dip_validator.pipeline import run_pose_pipeline
+from dip_validator.cli import estimate_video_poses, create_landmarks_trace
+from dip_validator.refinement import refine_landmarks, smooth_landmarks_temporal
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3, "inference_scale": 1.0},
+    "phases": {"smoothing_window": 15, "smoothing_polyorder": 2, "bottom_window": 5},
+    "landmarks": {"elbow_offset_ratio": 0.18, "deltoid_offset_ratio": 0.22, "ema_alpha": 0.4},
+    "decision": {"min_confidence": 0.3},
+    "motion_gate": {"enabled": True}
+}
+
+BONES = [(0, 5), (5, 7), (7, 9), (5, 11), (11, 13), (13, 15), (6, 8), (8, 10), (6, 12), (12, 14), (14, 16)]
+
+def small_dip(**kwargs):
+    params = {"reps": 1, "hold_s": 2.0, "width": 480, "height": 270, "upper_arm": 45.0, "forearm": 40.0}
+    return synthetic_dip(**{**params, **kwargs})
+
+def render(clip, seed=0):
+    """Stick figure of the clip's keypoints over a textured background, with sensor noise."""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(60, 120, (clip.height, clip.width, 3), dtype=np.uint8), (21, 21), 0)
+    for kp in clip.keypoints:
+        frame = background.copy()
+        if not np.isnan(kp).any():
+            for a, b in BONES:
+                cv2.line(frame, tuple(int(v) for v in kp[a]), tuple(int(v) for v in kp[b]), (220, 200, 180), 6)
+        noise = rng.integers(-5, 6, frame.shape, dtype=np.int16)
+        yield np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+class ClipEstimator(PoseEstimator):
+    """Returns the ground-truth pose of the clip frame whose index is drawn in pixel (0, 0)."""
+    def __init__(self, poses):
+        self.poses = poses
+        self.prev_bbox = None
+        self.calls = 0
+
+    def detect_lifter(self, frame):
+        return (0.0, 0.0, float(frame.shape[1]), float(frame.shape[0]))
+
+    def estimate_crop(self, frame, bbox, conf_threshold):
+        self.calls += 1
+        return self.poses[int(frame[0, 0, 0]) + 256 * int(frame[0, 0, 1])]
+
+def tagged(frames):
+    for i, frame in enumerate(frames):
+        frame[0, 0, :2] = (i % 256, i // 256)
+        yield frame
+
+def test_static_frames_skip_until_max_skip():
+    rng = np.random.default_rng(0)
+    still = np.full((72, 128, 3), 100, dtype=np.uint8)
+    gate = MotionGate(max_skip=4)
+    flags = [gate.update(np.clip(still + rng.normal(0, 3.0, still.shape), 0, 255).astype(np.uint8)) for _ in range(11)]
+    assert flags == [False, True, True, True, True, False, True, True, True, True, False]
+
+def test_motion_is_measured_against_last_estimated_frame():
+    gate = MotionGate(width=64)
+    frames = []
+    for x in range(0, 40, 2):
+        frame = np.zeros((36, 64), dtype=np.uint8)
+        frame[10:20, x:x + 6] = 255
+        frames.append(frame)
+    flags = [gate.update(f) for f in frames]
+    # A slowly moving block is not skipped for long: its drift adds up to a change
+    assert not flags[0] and flags.count(False) >= len(flags) // 3
+    assert gate.update(frames[-1]) is True
+
+def test_finish_estimates_around_bottom_and_interpolates_the_rest():
+    # Keypoint noise is the model's, not motion in the image
+    clip = small_dip(depth_px=6.0)
+    truth = small_dip(depth_px=6.0, noise_px=1.0).poses()
+    gate = MotionGate(bottom_guard=10)
+    poses = [None if gate.update(frame) else truth[i] for i, frame in enumerate(render(clip))]
+    filled = gate.finish(poses, lambda i, nearest: truth[i])
+    stats = gate.to_dict()
+
+    bottom = int(clip.bottom_frames[0])
+    assert stats['skip_rate'] >= 0.4
+    assert stats['estimated'] + stats['skipped'] == clip.num_frames
+    assert not any(p.interpolated for p in filled[bottom - 10:bottom + 11])
+    assert not filled[-1].interpolated
+    assert sum(p.interpolated for p in filled) == stats['skipped']
+
+    expected = DipDepthJudge().evaluate(AnalysisContext(truth, clip.meta, CONFIG))
+    decision = DipDepthJudge().evaluate(AnalysisContext(filled, clip.meta, CONFIG))
+    assert decision.valid == expected.valid
+    assert decision.bottom_frame_index == expected.bottom_frame_index
+    assert decision.interpolated_margin_px == pytest.approx(expected.interpolated_margin_px, abs=0.1)
+
+def test_estimate_video_poses_runs_model_only_on_gated_frames():
+    clip = small_dip()
+    estimator = ClipEstimator(small_dip(noise_px=1.0).poses())
+    gate = create_motion_gate(CONFIG)
+    results, exit_frame = estimate_video_poses(list(tagged(render(clip))), estimator, 0.3, gate=gate)
+
+    assert exit_frame is None and len(results) == clip.num_frames
+    assert estimator.calls == gate.to_dict()['estimated'] < 0.6 * clip.num_frames
+    assert all(p is not None for p in results)
+
+class TrackingEstimator(ClipEstimator):
+    """Tracks a box holding the index of the frame it was detected on; logs the box each detection starts from."""
+    def __init__(self, poses):
+        super().__init__(poses)
+        self.seeds = {}
+
+    def detect_lifter(self, frame):
+        i = int(frame[0, 0, 0]) + 256 * int(frame[0, 0, 1])
+        self.seeds[i] = self.prev_bbox
+        self.prev_bbox = (float(i), 0.0, float(i + 1), 1.0)
+        return self.prev_bbox
+
+def test_refills_track_lifter_from_nearest_estimated_frame():
+    clip = small_dip()
+    estimator = TrackingEstimator(clip.poses())
+    gate = create_motion_gate(CONFIG)
+    frames = list(tagged(render(clip)))
+    first_pass = MotionGate()
+    passed = [i for i, frame in enumerate(frames) if not first_pass.update(frame)]
+    estimate_video_poses(frames, estimator, 0.3, gate=gate)
+
+    refilled = sorted(set(estimator.seeds) - set(passed))
+    assert len(refilled) == gate.to_dict()['refilled'] > 0
+    estimated = set(passed)
+    for i in refilled:
+        nearest = min(estimated, key=lambda j: (abs(j - i), j))
+        assert estimator.seeds[i] == (float(nearest), 0.0, float(nearest + 1), 1.0)
+        estimated.add(i)
+
+def test_pipeline_with_gate_refines_filled_frames(tmp_path):
+    clip = small_dip(width=240, height=136, upper_arm=22.0, forearm=20.0)
+    path = str(tmp_path / "clip.avi")
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'FFV1'), clip.fps, (clip.width, clip.height))
+    for frame in tagged(render(clip)):
+        out.write(frame[..., ::-1])
+    out.release()
+
+    estimator = ClipEstimator(clip.poses())
+    gate = MotionGate()
+    result = run_pose_pipeline(path, estimator, CONFIG, gate=gate)
+    assert estimator.calls == gate.to_dict()['estimated'] < clip.num_frames
+    raw_l, _ = result.raw_landmarks
+    for pose, lm in zip(result.poses, raw_l):
+        assert lm is not None and lm.interpolated == pose.interpolated
+
+def test_interpolated_frames_are_marked_in_trace_and_cache(tmp_path):
+    clip = synthetic_dip(reps=1, hold_s=2.0)
+    poses = clip.poses()
+    poses[3] = PoseResult(poses[3].keypoints, poses[3].confidences, poses[3].bbox, interpolated=True)
+
+    trace = create_landmarks_trace(smooth_landmarks_temporal([refine_landmarks(p, "left") for p in poses]))
+    assert [e['frame'] for e in trace if e['interpolated']] == [3]
+
+    save_pose_cache(str(tmp_path / "keypoints.npz"), poses, clip.meta)
+    loaded, _ = load_pose_cache(str(tmp_path / "keypoints.npz"))
+    assert [i for i, p in enumerate(loaded) if p.interpolated] == [3]
+
+def test_gate_is_off_unless_enabled():
+    assert create_motion_gate({"pose": {"confidence_threshold": 0.3}}) is None
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from dip_validator.multiview import analyze_view, estimate_time_offset, fuse_views, alignment_signal
+from helpers import CONFIG, dip_poses
+
+def delayed(poses, frames, confidence=0.9):
+    # Same lift seen by a camera that started recording `frames` earlier
+    poses = [poses[0]] * frames + poses + [poses[-1]] * 5
+    for pose in poses:
+        pose.confidences = np.full(17, confidence)
+    return poses
+
+def test_estimate_time_offset_recovers_shift():
+    t = np.arange(120)
+    reference = 100 + 80 * np.exp(-((t - 50) / 12.0) ** 2)
+    other = 300 + 150 * np.exp(-((t - 62) / 12.0) ** 2)  # Different scale, 12 frames later
+    assert estimate_time_offset(reference, other, 30.0, 30.0) == pytest.approx(12 / 30, abs=0.01)
+    assert estimate_time_offset(other, reference, 30.0, 30.0) == pytest.approx(-12 / 30, abs=0.01)
+
+def test_estimate_time_offset_across_frame_rates():
+    t_ref, t_other = np.arange(90) / 30.0, np.arange(180) / 60.0
+    reference = np.exp(-((t_ref - 1.5) / 0.3) ** 2)
+    other = np.exp(-((t_other - 1.7) / 0.3) ** 2)
+    assert estimate_time_offset(reference, other, 30.0, 60.0) == pytest.approx(0.2, abs=0.02)
+
+def test_fuse_views_picks_most_confident():
+    meta = {"fps": 30.0, "height": 480}
+    views = [
+        analyze_view("side.mp4", delayed(dip_poses(), 0, confidence=0.5), meta, CONFIG),
+        analyze_view("front.mp4", delayed(dip_poses(), 10, confidence=0.9), meta, CONFIG)
+    ]
+    views[1].offset_s = estimate_time_offset(alignment_signal(views[0].context), alignment_signal(views[1].context), 30.0, 30.0)
+    assert views[1].offset_s == pytest.approx(10 / 30, abs=0.02)
+
+    decision, selected = fuse_views(views)
+    assert selected == 1
+    assert decision.valid is True
+    assert "views_disagree_on_bottom" not in decision.warnings
+
+    views[1].offset_s = 0.0
+    assert "views_disagree_on_bottom" in fuse_views(views)[0].warnings
+
+def test_unusable_view_is_reported_not_selected():
+    meta = {"fps": 30.0, "height": 480}
+    assert estimate_time_offset(np.array([]), np.arange(10.0), 30.0, 60.0) is None
+    assert estimate_time_offset(np.arange(10.0), np.zeros(10), 30.0, 30.0) is None
+
+    views = [
+        analyze_view("empty.mp4", [], meta, CONFIG),
+        analyze_view("missed.mp4", [None] * 20, meta, CONFIG),
+        analyze_view("side.mp4", delayed(dip_poses(), 0, confidence=0.5), meta, CONFIG)
+    ]
+    assert [v.usable for v in views] == [False, False, True]
+    views[0].offset_s = views[1].offset_s = None
+    decision, selected = fuse_views(views)
+    assert selected == 2 and decision.valid is True
+    assert "unusable_view" in decision.warnings
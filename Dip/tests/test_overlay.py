@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+import pytest
+from dip_validator.overlay import SpriteCache, render_text_sprite, blit
+
+def random_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(120, 320, 3), dtype=np.uint8)
+
+@pytest.mark.parametrize("text,org,scale,color,thickness", [
+    ("PHASE: DESCENDING", (10, 30), 1, (0, 165, 255), 2),
+    ("INVALID", (10, 70), 1.5, (0, 0, 255), 3),
+    ("VALID", (-20, 5), 1.5, (0, 255, 0), 3),  # clipped at the frame edge
+])
+def test_draw_text_matches_put_text(text, org, scale, color, thickness):
+    expected = random_frame()
+    cv2.putText(expected, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+
+    canvas = random_frame()
+    SpriteCache().draw_text(canvas, text, org, scale, color, thickness)
+
+    assert np.array_equal(canvas, expected)
+
+@pytest.mark.parametrize("text", ["+12.3px", "-0.7px", "+105.9px"])
+def test_draw_glyphs_matches_put_text(text):
+    expected = random_frame()
+    cv2.putText(expected, text, (40, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+    canvas = random_frame()
+    SpriteCache().draw_glyphs(canvas, text, (40, 60), 0.6, (0, 255, 0), 2)
+
+    assert np.array_equal(canvas, expected)
+
+def test_sprite_cache_reuses_sprites():
+    cache = SpriteCache()
+    first = cache.sprite("VALID", 1.5, (0, 255, 0), 3)
+    assert cache.sprite("VALID", 1.5, (0, 255, 0), 3) is first
+
+def test_blit_outside_frame_is_noop():
+    canvas = random_frame()
+    before = canvas.copy()
+    blit(canvas, render_text_sprite("VALID", 1, (0, 255, 0), 2), (1000, 1000))
+    assert np.array_equal(canvas, before)
+
+def test_antialiased_sprite_alpha_composite():
+    sprite = render_text_sprite("VALID", 1, (0, 255, 0), 2, line_type=cv2.LINE_AA)
+    assert not sprite.binary
+
+    canvas = np.zeros((60, 200, 3), dtype=np.uint8)
+    blit(canvas, sprite, (10, 40))
+    expected = np.zeros((60, 200, 3), dtype=np.uint8)
+    cv2.putText(expected, "VALID", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
+
+    # Blending onto black reproduces the anti-aliased coverage up to rounding
+    assert np.abs(canvas.astype(int) - expected.astype(int)).max() <= 1
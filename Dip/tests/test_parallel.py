@@ -0,0 +1,112 @@
+import time
+import cv2
+import numpy as np
+import pytest
+from dip_validator.parallel import FrameRing, run_parallel_poses
+from dip_validator.pose import PoseEstimator, PoseResult
+from dip_validator.cli import estimate_video_poses
+
+NUM_FRAMES = 40
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3, "inference_scale": 1.0},
+    "landmarks": {"elbow_offset_ratio": 0.1, "deltoid_offset_ratio": 0.1}
+}
+
+def shade(i):
+    return (i * 6) % 240
+
+class LevelEstimator(PoseEstimator):
+    """Keypoints encode the frame's grey level, so results can be matched to frames."""
+    def __init__(self, fail=False):
+        self.prev_bbox = None
+        self.fail = fail
+
+    def detect_people(self, frame):
+        return np.array([[0.0, 0.0, float(frame.shape[1]), float(frame.shape[0])]])
+
+    def detect_lifter(self, frame):
+        return (0.0, 0.0, float(frame.shape[1]), float(frame.shape[0]))
+
+    def estimate_crop(self, frame, bbox, conf_threshold):
+        if self.fail:
+            raise RuntimeError("inference failed")
+        keypoints = np.tile([[20.0, float(frame.mean())]], (17, 1)).astype(np.float32)
+        return PoseResult(keypoints=keypoints, confidences=np.full(17, 0.9, dtype=np.float32), bbox=bbox)
+
+class TwoPeopleEstimator(LevelEstimator):
+    """
+    The lifter is alone in the first frame; from then on a larger person, closer to the
+    frame centre, stands next to them. Only box tracking from the first frame keeps the lifter.
+    """
+    LIFTER, BYSTANDER = (8.0, 8.0, 24.0, 40.0), (28.0, 6.0, 48.0, 42.0)
+    detect_people = PoseEstimator.detect_people
+    detect_lifter = PoseEstimator.detect_lifter
+
+    def __init__(self, delay_s=0.0):
+        super().__init__()
+        self.model = self
+        self.lifter_weights = {}
+        self.delay_s = delay_s
+
+    def det_model(self, frame):
+        return np.array([self.LIFTER] if frame.mean() < shade(1) / 2 else [self.BYSTANDER, self.LIFTER])
+
+    def estimate_crop(self, frame, bbox, conf_threshold):
+        time.sleep(self.delay_s)  # Keeps every worker busy, so that they all get frames
+        keypoints = np.tile([[bbox[0], float(frame.mean())]], (17, 1)).astype(np.float32)
+        return PoseResult(keypoints=keypoints, confidences=np.full(17, 0.9, dtype=np.float32), bbox=bbox)
+
+# Module-level so that spawned workers can unpickle them
+def level_factory(config):
+    return LevelEstimator()
+
+def two_people_factory(config):
+    return TwoPeopleEstimator(delay_s=0.02)
+
+def failing_factory(config):
+    return LevelEstimator(fail=True)
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (64, 48))
+    for i in range(NUM_FRAMES):
+        out.write(np.full((48, 64, 3), shade(i), dtype=np.uint8))
+    out.release()
+    return path
+
+def test_frame_ring_shared_by_name():
+    ring = FrameRing(3, (4, 5, 3))
+    try:
+        view = FrameRing(3, (4, 5, 3), name=ring.name)
+        ring.frames[1] = 7
+        assert view.frames[1].sum() == 7 * 60 and view.frames[0].sum() == 0
+        view.close()
+    finally:
+        ring.close()
+
+def test_parallel_poses_in_frame_order(video, tmp_path):
+    result = run_parallel_poses(video, CONFIG, processes=2, index_path=str(tmp_path / "index.json"),
+                                ring_slots=3, estimator_factory=level_factory)
+
+    assert len(result.frames) == len(result.poses) == NUM_FRAMES == result.meta['frame_count']
+    expected = [float(frame.mean()) for frame in result.frames]
+    assert [pose.keypoints[0, 1] for pose in result.poses] == pytest.approx(expected, abs=1e-3)
+    assert len(result.raw_landmarks[0]) == NUM_FRAMES
+
+    stages = result.stats['stages']
+    assert stages['decode']['items'] == NUM_FRAMES
+    assert stages['pose[0]']['items'] + stages['pose[1]']['items'] == NUM_FRAMES
+
+def test_parallel_poses_raises_worker_error(video):
+    with pytest.raises(RuntimeError, match="inference failed"):
+        run_parallel_poses(video, CONFIG, processes=2, estimator_factory=failing_factory)
+
+def test_parallel_tracks_lifter_like_sequential(video):
+    result = run_parallel_poses(video, CONFIG, processes=3, ring_slots=4, estimator_factory=two_people_factory)
+    sequential, _ = estimate_video_poses(result.frames, TwoPeopleEstimator(), 0.3)
+
+    parallel_x = [pose.keypoints[0, 0] for pose in result.poses]
+    assert parallel_x == [pose.keypoints[0, 0] for pose in sequential]
+    assert set(parallel_x) == {TwoPeopleEstimator.LIFTER[0]}
@@ -1,6 +1,13 @@
 import numpy as np
 import pytest
-from dip_validator.phases import smooth_signal, detect_bottom_frame, segment_phases, compute_depth_signal
+from dip_validator.phases import (
+    smooth_signal,
+    smooth_signal_with_derivative,
+    detect_bottom_frame,
+    detect_bottom_subframe,
+    segment_phases,
+    compute_depth_signal
+)
 from dip_validator.pose import PoseResult
 
 def test_smooth_signal():
@@ -22,6 +29,22 @@ def test_detect_bottom_frame():
     bottom_idx = detect_bottom_frame(signal)
     assert bottom_idx == 5
 
+def test_detect_bottom_subframe():
+    # True peak between frames 10 and 11
+    t = np.arange(21, dtype=float)
+    signal = -(t - 10.3) ** 2
+    smoothed, derivative = smooth_signal_with_derivative(signal, window=7, polyorder=2)
+    bottom_idx = detect_bottom_frame(smoothed)
+    
+    assert bottom_idx == 10
+    assert derivative[5] == pytest.approx(-2 * (5 - 10.3))
+    assert detect_bottom_subframe(derivative, bottom_idx) == pytest.approx(10.3)
+
+def test_detect_bottom_subframe_edge():
+    # Monotonic signal: no zero crossing, fall back to the integer bottom
+    derivative = np.ones(10)
+    assert detect_bottom_subframe(derivative, 9) == 9.0
+
 def test_segment_phases():
     # 21 frames: 0-10 ascending y (descending dip), 10 is bottom, 11-20 descending y (ascending dip)
     signal = np.concatenate([
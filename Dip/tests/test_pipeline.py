@@ -0,0 +1,68 @@
+import time
+import cv2
+import numpy as np
+import pytest
+from dip_validator.pipeline import run_pose_pipeline
+from dip_validator.pose import PoseEstimator, PoseResult
+
+NUM_FRAMES = 24
+STAGE_S = 0.01
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3, "inference_scale": 1.0},
+    "landmarks": {"elbow_offset_ratio": 0.1, "deltoid_offset_ratio": 0.1}
+}
+
+def shade(i):
+    return (i * 10) % 240
+
+class SlowEstimator(PoseEstimator):
+    """Detector and pose model that take a fixed time; keypoints encode the frame's grey level."""
+    def __init__(self, fail_at=None):
+        self.prev_bbox = None
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def detect_lifter(self, frame):
+        time.sleep(STAGE_S)
+        return [0, 0, frame.shape[1], frame.shape[0]]
+
+    def estimate_crop(self, frame, bbox, conf_threshold):
+        time.sleep(STAGE_S)
+        self.calls += 1
+        if self.fail_at is not None and self.calls > self.fail_at:
+            raise RuntimeError("inference failed")
+        level = float(frame.mean())
+        keypoints = np.tile([[20.0, level]], (17, 1)).astype(np.float32)
+        return PoseResult(keypoints=keypoints, confidences=np.full(17, 0.9, dtype=np.float32), bbox=bbox)
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (64, 48))
+    for i in range(NUM_FRAMES):
+        out.write(np.full((48, 64, 3), shade(i), dtype=np.uint8))
+    out.release()
+    return path
+
+def test_pipeline_preserves_order_and_reports_stats(video, tmp_path):
+    result = run_pose_pipeline(video, SlowEstimator(), CONFIG, index_path=str(tmp_path / "index.json"), queue_size=4)
+
+    assert len(result.frames) == len(result.poses) == NUM_FRAMES == result.meta['frame_count']
+    levels = [pose.keypoints[0, 1] for pose in result.poses]
+    assert levels == pytest.approx([shade(i) for i in range(NUM_FRAMES)], abs=4)
+    raw_l, raw_r = result.raw_landmarks
+    assert len(raw_l) == len(raw_r) == NUM_FRAMES
+    assert (tmp_path / "index.json").exists()
+
+    stats = result.stats
+    assert set(stats['stages']) == {"decode", "detect", "pose", "refine"}
+    assert stats['stages']['pose']['items'] == NUM_FRAMES
+    assert stats['bottleneck'] in ("detect", "pose")
+    # Detect and pose overlap: the wall time is well below their summed busy time
+    busy = sum(s['busy_s'] for s in stats['stages'].values())
+    assert stats['wall_s'] < 0.8 * busy
+
+def test_pipeline_raises_stage_error(video):
+    with pytest.raises(RuntimeError, match="inference failed"):
+        run_pose_pipeline(video, SlowEstimator(fail_at=5), CONFIG, queue_size=2)
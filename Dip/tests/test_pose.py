@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from dip_validator.pose import PoseEstimator, bbox_iou, select_lifter_bbox
+
+FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+LIFTER = [220, 60, 420, 460]
+SPOTTER = [20, 40, 200, 470]
+SPECTATOR = [560, 300, 620, 400]
+
+class FakeBody:
+    """Detector returning fixed boxes; the pose model records the boxes it is given."""
+    def __init__(self, detections):
+        self.detections = iter(detections)
+        self.pose_calls = []
+
+    def det_model(self, image):
+        return np.array(next(self.detections), dtype=np.float32).reshape(-1, 4)
+
+    def pose_model(self, image, bboxes):
+        self.pose_calls.append(bboxes)
+        x1, y1, x2, y2 = bboxes[0]
+        kp = np.tile([[(x1 + x2) / 2, (y1 + y2) / 2]], (17, 1))
+        return kp[None], np.full((1, 17), 0.9)
+
+def make_estimator(detections):
+    estimator = PoseEstimator.__new__(PoseEstimator)
+    estimator.model = FakeBody(detections)
+    estimator.lifter_weights = {}
+    estimator.prev_bbox = None
+    return estimator
+
+def test_bbox_iou():
+    assert bbox_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert bbox_iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0.0
+    assert bbox_iou((0, 0, 10, 10), (5, 0, 15, 10)) == pytest.approx(1 / 3)
+
+def test_select_prefers_large_central_box():
+    boxes = np.array([SPECTATOR, SPOTTER, LIFTER])
+    assert select_lifter_bbox(boxes, FRAME.shape) == 2
+    assert select_lifter_bbox(np.zeros((0, 4)), FRAME.shape) is None
+
+def test_select_keeps_continuity():
+    # The lifter drifted off-centre and a similar-sized person is now central
+    boxes = np.array([[300, 60, 500, 460], [40, 50, 240, 460]])
+    assert select_lifter_bbox(boxes, FRAME.shape) == 0
+    assert select_lifter_bbox(boxes, FRAME.shape, prev_bbox=(50, 50, 250, 460)) == 1
+
+def test_pose_runs_on_lifter_crop_only():
+    estimator = make_estimator([[SPOTTER, LIFTER, SPECTATOR], [LIFTER, SPOTTER], []])
+    results = estimator.estimate_poses([FRAME] * 3)
+
+    assert [len(call) for call in estimator.model.pose_calls] == [1, 1, 1]
+    assert all(call[0] == tuple(map(float, LIFTER)) for call in estimator.model.pose_calls)
+    assert results[0].keypoints[0] == pytest.approx([320, 260])
+
+    estimator.reset()
+    assert estimator.prev_bbox is None
+
+def test_interpolate_poses_fills_skipped_frames_only():
+    from dip_validator.pose import PoseResult, interpolate_poses
+
+    def pose(x, conf):
+        return PoseResult(keypoints=np.full((17, 2), float(x)), confidences=np.full(17, conf), bbox=(x, x, x, x))
+
+    poses = [pose(0, 0.9), None, None, pose(30, 0.6), None, None]
+    filled = interpolate_poses(poses, [False, True, True, False, False, True])
+    assert filled[1].keypoints[0] == pytest.approx([10, 10]) and filled[1].interpolated
+    assert filled[2].confidences[0] == pytest.approx(0.6)
+    assert filled[4] is None  # Estimated, nobody found
+    assert filled[5] is None  # Skipped, no pose after it
@@ -1,7 +1,8 @@
 import json
 import os
+import sqlite3
 import pytest
-from dip_validator.reporting import generate_report
+from dip_validator.reporting import generate_report, RESULTS_SCHEMA
 from dip_validator.rules import DipDecision
 
 def test_generate_report(tmp_path):
@@ -15,7 +16,9 @@ def test_generate_report(tmp_path):
         selected_side="right",
         bottom_frame_index=50,
         confidence=0.85,
-        warnings=["angle_warning"]
+        warnings=["angle_warning"],
+        interpolated_margin_px=15.8,
+        bottom_time_s=1.6833
     )
     
     report_path = generate_report(
@@ -42,3 +45,80 @@ def test_generate_report(tmp_path):
     assert "angle_warning" in data["warnings"]
     assert data["frames_analyzed"] == 100
     assert data["fps"] == 30.0
+    assert data["interpolated_margin_px"] == 15.8
+    assert data["bottom_time_s"] == 1.6833
+
+def make_decision(valid, margin, confidence=0.8, warnings=None):
+    return DipDecision(valid=valid, margin_px=margin, best_margin_px=margin, selected_side="left",
+                       bottom_frame_index=10, confidence=confidence, warnings=warnings or [],
+                       interpolated_margin_px=margin + 0.1)
+
+def test_results_store_queries(tmp_path):
+    from dip_validator.reporting import ResultsStore, config_hash
+
+    config = {"pose": {"model": "rtmpose-m"}, "phases": {"bottom_window": 5}}
+    store = ResultsStore(str(tmp_path / "results.db"))
+    store.add("a.mp4", make_decision(False, -2.0, 0.9), 100, 30.0, config, camera="side", timings={"pose": 1.5})
+    store.add("b.mp4", make_decision(False, -8.0, 0.7, ["angle_warning"]), 100, 30.0, config, camera="front")
+    store.add("c.mp4", make_decision(True, 1.0, 0.5), 100, 30.0, config, camera="side")
+
+    close_invalid = store.query(result="INVALID", max_abs_margin=3.0)
+    assert [r["video"] for r in close_invalid] == ["a.mp4"]
+    assert close_invalid[0]["deciding_margin_px"] == pytest.approx(-1.9)
+    assert json.loads(close_invalid[0]["timings"]) == {"pose": 1.5}
+    assert close_invalid[0]["config_hash"] == config_hash(config)
+    assert [r["video"] for r in store.query(warning="angle_warning")] == ["b.mp4"]
+
+    per_camera = {r["camera"]: r for r in store.summary("camera")}
+    assert per_camera["side"]["attempts"] == 2
+    assert per_camera["side"]["avg_confidence"] == pytest.approx(0.7)
+    assert per_camera["side"]["valid_rate"] == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        store.summary("warnings; DROP TABLE results")
+
+    plan = " ".join(str(row[-1]) for row in store.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM results WHERE result = 'INVALID' AND deciding_margin_px BETWEEN -3 AND 3"))
+    assert "results_result_margin" in plan
+
+def test_results_store_one_row_per_video_and_config(tmp_path):
+    from dip_validator.reporting import ResultsStore
+
+    config = {"pose": {"model": "rtmpose-m"}, "phases": {"bottom_window": 5}}
+    path = str(tmp_path / "results.db")
+    # A store written before rows were unique, with a duplicate
+    legacy = sqlite3.connect(path)
+    legacy.executescript(RESULTS_SCHEMA.replace(
+        "CREATE UNIQUE INDEX IF NOT EXISTS results_video_config ON results (video_path, config_hash);", ""))
+    for confidence in (0.5, 0.6):
+        legacy.execute("INSERT INTO results (video, video_path, result, deciding_margin_px, confidence, "
+                       "config_hash, created_at) VALUES ('a.mp4', 'a.mp4', 'VALID', 1.0, ?, 'old', 0)", (confidence,))
+    legacy.commit()
+    legacy.close()
+
+    store = ResultsStore(path)
+    assert [r["confidence"] for r in store.query()] == [0.6]
+    first = store.add("b.mp4", make_decision(False, -2.0, 0.9), 100, 30.0, config)
+    assert store.add("b.mp4", make_decision(True, 1.0, 0.7), 100, 30.0, config) == first
+    other = dict(config, phases={"bottom_window": 7})
+    store.add("b.mp4", make_decision(True, 1.0, 0.7), 100, 30.0, other)
+
+    rows = store.query()
+    assert len(rows) == 3
+    assert [r["result"] for r in rows if r["id"] == first] == ["VALID"]
+    assert store.summary("video")[1]["attempts"] == 2
+    store.close()
+
+def test_config_hash_is_order_independent():
+    from dip_validator.reporting import config_hash
+    assert config_hash({"a": 1, "b": {"c": 2}}) == config_hash({"b": {"c": 2}, "a": 1})
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+def test_trace_columns_roundtrip(tmp_path):
+    from dip_validator.reporting import save_trace_columns, load_trace_columns
+
+    trace = [{"frame": i, "deltoid": [10.0, 20.0 + i], "elbow": [12.0, 25.0], "margin_px": i - 5.0,
+              "deltoid_conf": 0.9, "elbow_conf": 0.8} for i in range(10)]
+    path = save_trace_columns(trace, str(tmp_path / "trace.npz"))
+    columns = load_trace_columns(path, ["frame", "margin_px"])
+    assert list(columns) == ["frame", "margin_px"]
+    assert columns["margin_px"][7] == pytest.approx(2.0)
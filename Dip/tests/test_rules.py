@@ -1,6 +1,7 @@
 import pytest
-from dip_validator.rules import evaluate_dip, DipDecision
+from dip_validator.rules import evaluate_dip, interpolate_peak, DipDecision
 from dip_validator.refinement import RefinedLandmarks
+from dip_validator.reporting import decision_to_dict
 
 def create_mock_landmark(y_d, y_e, conf=0.8, angle_warn=False):
     return RefinedLandmarks(
@@ -82,4 +83,32 @@ def test_evaluate_dip_angle_warning():
     landmarks[10] = create_mock_landmark(120, 110, angle_warn=True)
         
     decision = evaluate_dip(landmarks, [None]*20, detected_bottom_idx=10)
-    assert "angle_warning" in decision.warnings
\ No newline at end of file
+    assert "angle_warning" in decision.warnings
+
+def test_interpolate_peak():
+    offset, peak = interpolate_peak(-1.0, 0.0, -1.0)
+    assert offset == 0.0
+    assert peak == 0.0
+    
+    # Samples of -(t - 0.25)^2 at t = -1, 0, 1
+    offset, peak = interpolate_peak(-1.5625, -0.0625, -0.5625)
+    assert offset == pytest.approx(0.25)
+    assert peak == pytest.approx(0.0)
+
+def test_evaluate_dip_subframe_margin():
+    # Deepest point falls between frames 10 and 11: every sampled margin is negative
+    landmarks = [None] * 20
+    for i in range(5, 16):
+        landmarks[i] = create_mock_landmark(y_d=110.2 - 2.0 * (i - 10.45) ** 2, y_e=110)
+        
+    decision = evaluate_dip(landmarks, [None]*20, detected_bottom_idx=10)
+    assert decision.best_margin_px < 0
+    assert decision.interpolated_margin_px == pytest.approx(0.2)
+    assert decision.valid is True
+    # What is shown with the verdict is the margin that decided it
+    assert decision.deciding_margin_px == pytest.approx(0.2)
+    assert decision_to_dict(decision)["deciding_margin_px"] == pytest.approx(0.2)
+    
+    decision = evaluate_dip(landmarks, [None]*20, detected_bottom_idx=10, interpolate=False)
+    assert decision.valid is False
+    assert decision.deciding_margin_px == decision.best_margin_px
\ No newline at end of file
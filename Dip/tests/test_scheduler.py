@@ -0,0 +1,105 @@
+import os
+import numpy as np
+import pytest
+from dip_validator.cli import estimate_video_poses
+from dip_validator.scheduler import QualityScheduler, StageCosts, apply_plan
+from helpers import dip_poses
+
+def scheduler(tmp_path=None):
+    config = {"scheduler": {"costs_path": str(tmp_path / "costs.json") if tmp_path else None}}
+    return QualityScheduler(config)
+
+def test_no_deadline_is_full_quality():
+    plan = scheduler().plan(300, None)
+    assert (plan.model, plan.inference_scale, plan.frame_stride, plan.overlay) == ("rtmpose-l", 1.0, 1, True)
+    assert plan.budget_s is None and plan.meets_deadline
+
+def test_degrades_gracefully_as_deadline_tightens():
+    s = scheduler()
+    full = s.predict(300, "rtmpose-l", 1.0, 1, True)
+    overlay_off = s.plan(300, full - 0.1)
+    assert (overlay_off.model, overlay_off.frame_stride, overlay_off.overlay) == ("rtmpose-l", 1, False)
+
+    plans = [s.plan(300, deadline) for deadline in (full, full / 2, full / 4, full / 8)]
+    predicted = [p.predicted_s for p in plans]
+    assert predicted == sorted(predicted, reverse=True)
+    assert all(p.meets_deadline and p.predicted_s <= p.budget_s for p in plans)
+
+def test_infeasible_deadline_picks_cheapest():
+    plan = scheduler().plan(300, 0.01)
+    assert not plan.meets_deadline
+    assert (plan.model, plan.inference_scale, plan.frame_stride, plan.overlay) == ("rtmpose-s", 0.5, 3, False)
+
+def test_queue_depth_and_wait_shrink_budget():
+    s = scheduler()
+    assert s.plan(300, 60.0).budget_s == 60.0
+    assert s.plan(300, 60.0, elapsed_s=15.0).budget_s == 45.0
+    assert s.plan(300, 60.0, queue_depth=4, workers=2).budget_s == pytest.approx(20.0)
+
+def test_observed_costs_drive_plans(tmp_path):
+    s = scheduler(tmp_path)
+    plan = s.plan(100, None)
+    # The large model turns out much faster than the prior on this machine
+    for _ in range(3):
+        s.observe(plan, 100, {"decode": 0.1, "pose": 1.0, "analysis": 0.05, "overlay": 0.2})
+
+    reloaded = StageCosts(str(tmp_path / "costs.json"))
+    assert reloaded.estimate("pose:rtmpose-l") == pytest.approx(0.01)
+    assert reloaded.estimate("pose:rtmpose-l@0.5") == pytest.approx(0.01 * 0.625)
+    assert scheduler(tmp_path).plan(100, 2.0).model == "rtmpose-l"
+
+def test_observe_counts_only_estimated_pose_frames(tmp_path):
+    s = scheduler(tmp_path)
+    plan = s.plan(100, None)
+    # Motion gate: 40 of the 100 frames went through the model
+    s.observe(plan, 100, {"pose": 1.0}, pose_frames=40)
+    assert StageCosts(str(tmp_path / "costs.json")).estimate("pose:rtmpose-l") == pytest.approx(0.025)
+
+def test_workers_sharing_costs_file_merge(tmp_path):
+    path = str(tmp_path / "costs.json")
+    first, second = StageCosts(path), StageCosts(path)
+    first.observe("decode", 0.002)
+    second.observe("pose:rtmpose-l", 0.1)
+    second.observe("decode", 0.004)
+    first.save()
+    second.save()
+
+    merged = StageCosts(path)
+    assert merged.stats["pose:rtmpose-l"]["n"] == 1
+    assert merged.stats["decode"]["n"] == 2
+    assert merged.estimate("decode") == pytest.approx(0.002 + 0.2 * 0.002)
+    assert os.listdir(tmp_path) == ["costs.json"]
+
+def test_apply_plan():
+    plan = scheduler().plan(300, 0.01)
+    config = apply_plan({"pose": {"model": "rtmpose-m"}, "output": {}}, plan)
+    assert config["pose"] == {"model": "rtmpose-s", "inference_scale": 0.5, "frame_stride": 3}
+    assert config["output"]["overlay"] is False
+
+class ScaledReplayEstimator:
+    """Returns the poses of the original-size frames, scaled to the frame it is given."""
+    def __init__(self, poses, width):
+        self.poses = iter(poses)
+        self.width = width
+        self.calls = 0
+
+    def estimate_poses(self, frames, conf_threshold=0.3):
+        self.calls += 1
+        pose = next(self.poses)
+        factor = frames[0].shape[1] / self.width
+        pose.keypoints = pose.keypoints * factor
+        return [pose]
+
+def test_stride_and_scale():
+    poses = dip_poses()
+    expected = [p.keypoints.copy() for p in dip_poses()]
+    frames = [np.zeros((48, 64, 3), dtype=np.uint8)] * len(poses)
+    stride = 3
+    estimated = [poses[i] for i in range(len(poses)) if i % stride == 0 or i == len(poses) - 1]
+    estimator = ScaledReplayEstimator(estimated, 64)
+
+    results, _ = estimate_video_poses(frames, estimator, 0.3, stride=stride, scale=0.5)
+    assert estimator.calls == len(estimated)
+    assert results[0].keypoints == pytest.approx(expected[0])
+    assert results[1].interpolated and not results[3].interpolated
+    assert results[1].keypoints == pytest.approx((2 * expected[0] + expected[3]) / 3)
@@ -0,0 +1,101 @@
+import math
+import timeit
+import tracemalloc
+import numpy as np
+import pytest
+from dip_validator.synthetic import synthetic_dip, motion_profile
+from dip_validator.judges import AnalysisContext, DipDepthJudge
+from dip_validator.phases import compute_depth_signal, smooth_signal, detect_bottom_frame, segment_phases
+from dip_validator.refinement import refine_landmarks, smooth_landmarks_temporal
+from dip_validator.rules import evaluate_dip
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3},
+    "phases": {"smoothing_window": 15, "smoothing_polyorder": 2, "bottom_window": 5},
+    "landmarks": {"elbow_offset_ratio": 0.18, "deltoid_offset_ratio": 0.22, "ema_alpha": 0.4},
+    "decision": {"min_confidence": 0.3}
+}
+
+# Clip lengths for the scaling checks. The memory bounds are deterministic; the time
+# bound (slow marker) allows 10x the frames 40x the time, where quadratic would be 100x
+SIZES = (800, 8000)
+RATIO = SIZES[1] / SIZES[0]
+
+def test_motion_profile_reps_and_length():
+    profile, bottoms = motion_profile(None, reps=3, fps=30, rep_s=2.0, hold_s=1.0)
+    assert len(bottoms) == 3
+    assert np.all(profile[bottoms] == 1.0)
+    assert profile[0] == profile[-1] == 0.0
+
+    profile, bottoms = motion_profile(1000, reps=1, fps=30, rep_s=2.0, hold_s=1.0)
+    assert len(profile) == 1000 and len(bottoms) == 11
+
+def test_generated_depth_is_exact():
+    clip = synthetic_dip(reps=2, depth_px=17.0)
+    shoulder_y = clip.keypoints[clip.bottom_frames, 5, 1]
+    elbow_y = clip.keypoints[clip.bottom_frames, 7, 1]
+    assert shoulder_y - elbow_y == pytest.approx([17.0, 17.0], abs=1e-3)
+
+@pytest.mark.parametrize("depth_px", [-25.0, -12.0, 12.0, 25.0])
+def test_verdict_matches_generated_depth(depth_px):
+    clip = synthetic_dip(reps=3, depth_px=depth_px, noise_px=1.0, dropout=0.05, seed=1)
+    decision = DipDepthJudge().evaluate(AnalysisContext(clip.poses(), clip.meta, CONFIG))
+
+    # Deltoid and elbow tip offsets shift the margin by a known amount (see synthetic_dip)
+    offsets = CONFIG['landmarks']['deltoid_offset_ratio'] - CONFIG['landmarks']['elbow_offset_ratio']
+    expected = depth_px - offsets * 110.0 * math.cos(math.radians(15.0))
+    assert decision.valid == (depth_px > 0)
+    assert decision.interpolated_margin_px == pytest.approx(expected, abs=3.0)
+    assert np.min(np.abs(clip.bottom_frames - decision.bottom_frame_index)) <= 5
+
+def stage_inputs(num_frames):
+    clip = synthetic_dip(num_frames=num_frames, noise_px=1.0, dropout=0.02)
+    poses = clip.poses()
+    smoothed = smooth_signal(compute_depth_signal(poses))
+    raw = [refine_landmarks(p, "left") for p in poses]
+    return {"poses": poses, "depth": compute_depth_signal(poses), "smoothed": smoothed,
+            "bottom": detect_bottom_frame(smoothed), "raw": raw, "refined": smooth_landmarks_temporal(raw)}
+
+STAGES = {
+    "compute_depth_signal": lambda x: compute_depth_signal(x["poses"]),
+    "smooth_signal": lambda x: smooth_signal(x["depth"]),
+    "segment_phases": lambda x: segment_phases(x["smoothed"], x["bottom"]),
+    "refine_landmarks": lambda x: [refine_landmarks(p, "left") for p in x["poses"]],
+    "smooth_landmarks_temporal": lambda x: smooth_landmarks_temporal(x["raw"]),
+    "evaluate_dip": lambda x: evaluate_dip(x["refined"], x["refined"], x["bottom"])
+}
+
+@pytest.fixture(scope="module")
+def inputs():
+    return [stage_inputs(n) for n in SIZES]
+
+def seconds_per_call(fn, min_total_s=0.02):
+    # Enough calls per sample for timer resolution, best of three samples
+    timer = timeit.Timer(fn)
+    number = max(1, math.ceil(min_total_s / max(timer.timeit(1), 1e-6)))
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+def peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.slow
+@pytest.mark.parametrize("stage", list(STAGES))
+def test_stage_time_is_linear(stage, inputs):
+    small, large = (seconds_per_call(lambda x=x: STAGES[stage](x)) for x in inputs)
+    assert large / small < 4.0 * RATIO
+
+@pytest.mark.parametrize("stage", list(STAGES))
+def test_stage_memory_is_linear(stage, inputs):
+    small, large = (peak_bytes(lambda x=x: STAGES[stage](x)) for x in inputs)
+    # Stages that return per-frame results are O(T), with a small constant; the rest O(1)
+    assert large / SIZES[1] < 2048  # bytes per frame
+    assert large <= 2.0 * RATIO * small + 65536
+
+def test_decision_memory_is_constant(inputs):
+    # evaluate_dip only scans the landmarks: no per-frame allocations
+    assert peak_bytes(lambda: STAGES["evaluate_dip"](inputs[1])) < 65536
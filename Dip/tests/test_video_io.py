@@ -0,0 +1,85 @@
+import json
+import cv2
+import numpy as np
+import pytest
+from dip_validator.video_io import (
+    load_video,
+    build_frame_index,
+    load_frame_index,
+    get_frames,
+    iter_range
+)
+from dip_validator.review import regenerate_review, main as review_main
+
+NUM_FRAMES = 60
+
+def shade(i):
+    # Frame i is filled with a distinct grey level, far enough apart to survive compression
+    return (i * 20) % 240
+
+def frame_id(frame):
+    return int(np.argmin([abs(float(frame.mean()) - shade(i)) for i in range(12)]))
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (64, 48))
+    for i in range(NUM_FRAMES):
+        out.write(np.full((48, 64, 3), shade(i), dtype=np.uint8))
+    out.release()
+    return path
+
+def test_index_persisted_and_reused(video, tmp_path):
+    index_path = str(tmp_path / "frame_index.json")
+    index = load_frame_index(video, index_path)
+    assert index.frame_count == NUM_FRAMES
+    assert index.timestamps_ms[1] == pytest.approx(1000 / 30, abs=1)
+
+    with open(index_path) as f:
+        json.load(f)
+    assert load_frame_index(video, index_path) == index
+
+def test_load_video_writes_index(video, tmp_path):
+    index_path = str(tmp_path / "frame_index.json")
+    frames, meta = load_video(video, index_path=index_path)
+    index = load_frame_index(video, index_path)
+    assert index.frame_count == len(frames) == meta['frame_count']
+    assert index == build_frame_index(video)
+
+def test_get_frames_random_access(video):
+    wanted = [45, 3, 27, 28, 3]
+    frames = get_frames(video, wanted)
+    assert sorted(frames) == [3, 27, 28, 45]
+    for i, frame in frames.items():
+        assert frame_id(frame) == i % 12
+
+    with pytest.raises(IndexError):
+        get_frames(video, [NUM_FRAMES])
+
+def test_iter_range(video):
+    got = list(iter_range(video, 50, 100))
+    assert [i for i, _ in got] == list(range(50, NUM_FRAMES))
+    assert [frame_id(f) for _, f in got] == [i % 12 for i in range(50, NUM_FRAMES)]
+
+def test_regenerate_review(video, tmp_path):
+    report_dir = tmp_path / "output"
+    report_dir.mkdir()
+    trace = [{"frame": 20, "deltoid": [30, 20], "elbow": [30, 25], "margin_px": -5.0}]
+    (report_dir / "report.json").write_text(json.dumps({"bottom_frame_index": 20, "landmarks_trace": trace}))
+
+    paths = regenerate_review(video, str(report_dir), pad=4)
+    assert cv2.imread(paths[0]).shape == (48, 64, 3)
+    frames, _ = load_video(paths[1])
+    assert len(frames) == 9
+
+def test_review_without_depth_decision(video, tmp_path, capsys):
+    report_dir = tmp_path / "output" / "clip"
+    report_dir.mkdir(parents=True)
+    (report_dir / "report.json").write_text(json.dumps({"judges": {"dip_lockout": {"result": "VALID"}}}))
+
+    with pytest.raises(ValueError, match="No depth decision"):
+        regenerate_review(video, str(report_dir))
+    with pytest.raises(SystemExit) as exc:
+        review_main([video, "--output-dir", str(tmp_path / "output")])
+    assert exc.value.code == 1
+    assert "No depth decision" in capsys.readouterr().err
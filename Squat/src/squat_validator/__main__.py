@@ -0,0 +1,4 @@
+from squat_validator.cli import main
+
+if __name__ == "__main__":
+    main()
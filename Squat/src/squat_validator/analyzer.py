@@ -0,0 +1,219 @@
+import warnings
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict
+from numpy.lib.stride_tricks import sliding_window_view
+from dip_validator.pose import PoseResult, poses_to_arrays
+from dip_validator.phases import compute_depth_signal, smooth_signal, detect_bottom_frame, segment_phases
+
+# COCO keypoint indices (rtmlib Body, shared with dip_validator)
+L_SHOULDER, R_SHOULDER = 5, 6
+HIP = {"left": 11, "right": 12}
+KNEE = {"left": 13, "right": 14}
+ANKLE = {"left": 15, "right": 16}
+
+@dataclass
+class SquatTrace:
+    """Per-frame arrays for the selected side (NaN where keypoints are unreliable)."""
+    hip: np.ndarray  # (T, 2)
+    knee: np.ndarray  # (T, 2)
+    ankle: np.ndarray  # (T, 2)
+    depth_ratio: np.ndarray  # (T,) - rolling-median filtered
+
+@dataclass
+class SquatResult:
+    valid: bool
+    depth_ratio: float  # Filtered depth ratio at the deepest frame
+    selected_side: str  # "left" or "right"
+    bottom_frame_index: int  # Frame index where the deepest ratio occurred
+    confidence: float
+    warnings: List[str]
+    phases: Dict[int, str] = field(default_factory=dict)
+    trace: Optional[SquatTrace] = None
+
+def rolling_median(values: np.ndarray, window: int = 3) -> np.ndarray:
+    """
+    Centered rolling median over a 1D signal, computed over the whole clip at once.
+
+    Args:
+        values: 1D array, NaN marks unreliable samples.
+        window: Window length (rounded up to the next odd number).
+
+    Returns:
+        np.ndarray: Filtered signal. Samples that were NaN stay NaN.
+    """
+    if window <= 1 or len(values) == 0:
+        return values.astype(float)
+
+    half = window // 2
+    padded = np.pad(values.astype(float), half, mode="edge")
+    windows = sliding_window_view(padded, 2 * half + 1)
+    with warnings.catch_warnings():
+        # All-NaN windows (long detection gaps) are expected and stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        filtered = np.nanmedian(windows, axis=1)
+    filtered[np.isnan(values)] = np.nan
+    return filtered
+
+class SquatAnalyzer:
+    """Hip-below-knee depth judge operating on whole-clip keypoint arrays."""
+    def __init__(
+        self,
+        conf_threshold: float = 0.3,
+        smoothing_window: int = 15,
+        smoothing_polyorder: int = 2,
+        bottom_window: int = 5,
+        median_window: int = 3,
+        depth_threshold: float = 0.0,
+        min_confidence: float = 0.3
+    ):
+        self.conf_threshold = conf_threshold
+        self.smoothing_window = smoothing_window
+        self.smoothing_polyorder = smoothing_polyorder
+        self.bottom_window = bottom_window
+        self.median_window = median_window
+        self.depth_threshold = depth_threshold
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "SquatAnalyzer":
+        return cls(
+            conf_threshold=config['pose']['confidence_threshold'],
+            smoothing_window=config['phases']['smoothing_window'],
+            smoothing_polyorder=config['phases']['smoothing_polyorder'],
+            bottom_window=config['phases']['bottom_window'],
+            median_window=config['decision']['median_window'],
+            depth_threshold=config['decision']['depth_threshold'],
+            min_confidence=config['decision']['min_confidence']
+        )
+
+    def side_confidences(self, confidences: np.ndarray, start: int, end: int) -> Dict[str, float]:
+        """Mean hip/knee confidence per side over frames [start, end]."""
+        window = confidences[start:end + 1]
+        scores = {}
+        for side in ("left", "right"):
+            side_conf = (window[:, HIP[side]] + window[:, KNEE[side]]) / 2
+            # Frames without a pose have zero confidence and are excluded, as in evaluate_dip
+            detected = side_conf > 0
+            scores[side] = float(side_conf[detected].mean()) if detected.any() else 0.0
+        return scores
+
+    def depth_ratios(self, keypoints: np.ndarray, confidences: np.ndarray, side: str, frame_height: int) -> np.ndarray:
+        """
+        Computes depth_ratio = (hip_y - knee_y) / frame_height for every frame.
+        Positive means the hip is below the knee (y increases downwards).
+        """
+        hip, knee = HIP[side], KNEE[side]
+        reliable = (confidences[:, hip] > self.conf_threshold) & (confidences[:, knee] > self.conf_threshold)
+        raw = (keypoints[:, hip, 1] - keypoints[:, knee, 1]) / float(frame_height)
+        return np.where(reliable, raw, np.nan)
+
+    def is_lateral_view(self, keypoints: np.ndarray, confidences: np.ndarray) -> bool:
+        """Shoulder width collapses relative to torso height in a lateral view (ADR-004)."""
+        shoulder_width = np.abs(keypoints[:, L_SHOULDER, 0] - keypoints[:, R_SHOULDER, 0])
+        torso_height = np.abs(keypoints[:, L_SHOULDER, 1] - keypoints[:, HIP["left"], 1])
+        usable = (confidences[:, L_SHOULDER] > 0) & (torso_height > 0)
+        if not usable.any():
+            return True
+        return float(np.median(shoulder_width[usable] / torso_height[usable])) < 0.5
+
+    def analyze(self, poses: List[Optional[PoseResult]], frame_height: int) -> SquatResult:
+        """
+        Judges squat depth over a whole clip.
+
+        Args:
+            poses: List of PoseResult objects (or None if no pose was detected).
+            frame_height: Frame height in pixels, used to normalise depth_ratio.
+
+        Returns:
+            SquatResult: The final decision, phases and per-frame trace.
+        """
+        keypoints, confidences = poses_to_arrays(poses)
+
+        # Phases from the shared dip pipeline (the hip y signal is the squat depth proxy)
+        depth_signal = compute_depth_signal(poses, conf_threshold=self.conf_threshold)
+        smoothed = smooth_signal(depth_signal, window=self.smoothing_window, polyorder=self.smoothing_polyorder)
+        phase_bottom_idx = detect_bottom_frame(smoothed)
+        phases = segment_phases(smoothed, phase_bottom_idx, bottom_window=self.bottom_window)
+
+        return self.decide(keypoints, confidences, frame_height, phase_bottom_idx, phases)
+
+    def decide(
+        self,
+        keypoints: np.ndarray,
+        confidences: np.ndarray,
+        frame_height: int,
+        phase_bottom_idx: int,
+        phases: Dict[int, str]
+    ) -> SquatResult:
+        """
+        Applies the depth rule to precomputed keypoint arrays and phases.
+
+        Args:
+            keypoints: (T, 17, 2) keypoints, NaN where no pose.
+            confidences: (T, 17) confidences, 0 where no pose.
+            frame_height: Frame height in pixels.
+            phase_bottom_idx: Bottom frame from phase detection.
+            phases: Mapping from frame index to phase name.
+
+        Returns:
+            SquatResult: The final decision, phases and per-frame trace.
+        """
+        num_frames = len(keypoints)
+
+        # 1. Side Selection around the detected bottom
+        start_idx = max(0, phase_bottom_idx - self.bottom_window)
+        end_idx = min(num_frames - 1, phase_bottom_idx + self.bottom_window)
+        side_conf = self.side_confidences(confidences, start_idx, end_idx)
+
+        warnings_list = []
+        if abs(side_conf["left"] - side_conf["right"]) < 0.1:
+            warnings_list.append("low_side_confidence_diff")
+
+        selected_side = "left" if side_conf["left"] >= side_conf["right"] else "right"
+        confidence = side_conf[selected_side]
+        if confidence < self.min_confidence:
+            warnings_list.append("low_overall_confidence")
+        if not self.is_lateral_view(keypoints, confidences):
+            warnings_list.append("non_lateral_view")
+
+        # 2. Depth ratio over the clip, 3-frame rolling median (ADR-003); the verdict is taken
+        # at the deepest frame of the bottom phase only, so a deep frame elsewhere (walk-out,
+        # re-rack, a second rep) cannot decide it
+        ratio = rolling_median(
+            self.depth_ratios(keypoints, confidences, selected_side, frame_height),
+            window=self.median_window
+        )
+        trace = SquatTrace(
+            hip=keypoints[:, HIP[selected_side]],
+            knee=keypoints[:, KNEE[selected_side]],
+            ankle=keypoints[:, ANKLE[selected_side]],
+            depth_ratio=ratio
+        )
+
+        bottom_ratio = ratio[start_idx:end_idx + 1]
+        if np.all(np.isnan(bottom_ratio)):
+            return SquatResult(
+                valid=False,
+                depth_ratio=0.0,
+                selected_side=selected_side,
+                bottom_frame_index=phase_bottom_idx,
+                confidence=confidence,
+                warnings=warnings_list + ["no_landmarks_for_decision"],
+                phases=phases,
+                trace=trace
+            )
+
+        best_frame_idx = start_idx + int(np.nanargmax(bottom_ratio))
+        best_ratio = float(ratio[best_frame_idx])
+
+        return SquatResult(
+            valid=best_ratio > self.depth_threshold,
+            depth_ratio=best_ratio,
+            selected_side=selected_side,
+            bottom_frame_index=best_frame_idx,
+            confidence=confidence,
+            warnings=warnings_list,
+            phases=phases,
+            trace=trace
+        )
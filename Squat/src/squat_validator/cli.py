@@ -0,0 +1,103 @@
+import argparse
+import sys
+import os
+import numpy as np
+from typing import List, Dict, Any, Optional
+from dip_validator.cli import load_config, estimate_video_poses
+from dip_validator.video_io import load_video, save_video
+from dip_validator.pose import PoseEstimator, PoseResult, MODEL_MODES
+from dip_validator.motion import create_motion_gate
+from dip_validator.reporting import write_report
+from squat_validator.analyzer import SquatAnalyzer, SquatResult
+from squat_validator.renderer import SquatRenderer
+
+def create_depth_trace(result: SquatResult, poses: List[Optional[PoseResult]]) -> List[Dict[str, Any]]:
+    """Creates a serializable trace of the selected-side hip/knee data."""
+    trace = result.trace
+    return [
+        {
+            "frame": int(i),
+            "hip": [round(float(trace.hip[i, 0]), 2), round(float(trace.hip[i, 1]), 2)],
+            "knee": [round(float(trace.knee[i, 0]), 2), round(float(trace.knee[i, 1]), 2)],
+            "depth_ratio": round(float(trace.depth_ratio[i]), 4),
+            "interpolated": poses[i].interpolated
+        }
+        for i in np.flatnonzero(~np.isnan(trace.depth_ratio))
+    ]
+
+def build_report(video_path: str, result: SquatResult, num_frames: int, fps: float) -> Dict[str, Any]:
+    return {
+        "video": os.path.basename(video_path),
+        "lift": "squat",
+        "result": "VALID" if result.valid else "INVALID",
+        "depth_ratio": round(result.depth_ratio, 4),
+        "selected_side": result.selected_side,
+        "bottom_frame_index": result.bottom_frame_index,
+        "confidence": round(result.confidence, 2),
+        "warnings": result.warnings,
+        "frames_analyzed": num_frames,
+        "fps": round(fps, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Squat Validator CLI")
+    parser.add_argument("video_path", help="Path to input video")
+    parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument("--config", default="configs/default.yaml", help="Path to config file")
+    parser.add_argument("--motion-gate", action="store_true", help="Skip pose on frames without motion (interpolated)")
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config)
+        if args.motion_gate:
+            config.setdefault('motion_gate', {})['enabled'] = True
+        video_basename = os.path.splitext(os.path.basename(args.video_path))[0]
+        video_output_dir = os.path.join(args.output_dir, video_basename)
+        os.makedirs(video_output_dir, exist_ok=True)
+
+        print(f"Processing: {os.path.basename(args.video_path)}")
+        frames, meta = load_video(args.video_path)
+        num_frames = len(frames)
+
+        # 1. Pose Estimation (same backend and per-frame loop as the dip pipeline)
+        print("Starting pose estimation...")
+        mode = MODEL_MODES.get(config['pose']['model'], "balanced")
+        estimator = PoseEstimator(device=config['pose']['device'], mode=mode,
+                                  lifter_weights=config['pose'].get('lifter_selection'))
+
+        # Frames without motion (setup, holds) skip the model and are interpolated
+        gate = create_motion_gate(config)
+        results, _ = estimate_video_poses(frames, estimator, config['pose']['confidence_threshold'], gate=gate)
+        print("\nPose estimation complete.")
+
+        # 2. Phases + Decision over the whole clip
+        print("Evaluating squat depth...")
+        analyzer = SquatAnalyzer.from_config(config)
+        result = analyzer.analyze(results, frame_height=meta['height'])
+
+        # 3. Reporting & Trace
+        report_data = build_report(args.video_path, result, num_frames, meta['fps'])
+        if gate is not None:
+            report_data["motion_gate"] = gate.to_dict()
+        if config['output']['save_landmarks_trace']:
+            report_data["landmarks_trace"] = create_depth_trace(result, results)
+        report_path = write_report(report_data, video_output_dir)
+
+        print(f"\n{'VALID LIFT' if result.valid else 'INVALID LIFT'} (Depth ratio: {result.depth_ratio:+.4f})")
+        print(f"Report saved: {report_path}")
+
+        # 4. Overlay
+        print("Generating overlay video...")
+        renderer = SquatRenderer(show_ratio=config['output']['overlay_show_ratio'])
+        overlay_frames = renderer.render(frames, result)
+        save_video(overlay_frames, os.path.join(video_output_dir, "overlay.mp4"), meta['fps'])
+        print(f"\nOverlay saved to {video_output_dir}")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from typing import Dict, Any
+from dip_validator.judges import Judge, AnalysisContext, register_judge
+from .analyzer import SquatAnalyzer, SquatResult, HIP, KNEE
+
+@register_judge
+class SquatDepthJudge(Judge):
+    """Hip crease below the top of the knee, on the shared pose pass of the dip pipeline."""
+    name = "squat_depth"
+    keypoints = (HIP["left"], HIP["right"], KNEE["left"], KNEE["right"])
+    signals = ("keypoint_arrays", "bottom_index", "phases")
+
+    def evaluate(self, context: AnalysisContext) -> SquatResult:
+        config = context.config
+        squat_cfg = config.get('squat', {})
+        analyzer = SquatAnalyzer(
+            conf_threshold=config['pose']['confidence_threshold'],
+            bottom_window=config['phases']['bottom_window'],
+            median_window=squat_cfg.get('median_window', 3),
+            depth_threshold=squat_cfg.get('depth_threshold', 0.0),
+            min_confidence=config['decision']['min_confidence']
+        )
+        keypoints, confidences = context.signal("keypoint_arrays")
+        return analyzer.decide(keypoints, confidences, context.meta['height'],
+                               context.signal("bottom_index"), context.signal("phases"))
+
+    def to_dict(self, result: SquatResult) -> Dict[str, Any]:
+        return {
+            "result": "VALID" if result.valid else "INVALID",
+            "depth_ratio": round(result.depth_ratio, 4),
+            "selected_side": result.selected_side,
+            "bottom_frame_index": result.bottom_frame_index,
+            "confidence": round(result.confidence, 2),
+            "warnings": result.warnings
+        }
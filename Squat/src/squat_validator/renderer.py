@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+from typing import List
+from dip_validator.overlay import SpriteCache, PHASE_COLORS
+from .analyzer import SquatResult
+
+class SquatRenderer:
+    """Draws the lower-body skeleton, knee reference line, phase and verdict on each frame."""
+    def __init__(self, show_ratio: bool = True):
+        self.show_ratio = show_ratio
+        self.sprites = SpriteCache()
+
+    def render(self, frames: List[np.ndarray], result: SquatResult) -> List[np.ndarray]:
+        """Generates frames with analysis overlay."""
+        overlay_frames = []
+        num_frames = len(frames)
+        width = frames[0].shape[1]
+        trace = result.trace
+
+        # Per-frame geometry is resolved for the whole clip up front
+        visible = ~np.isnan(trace.depth_ratio)
+        hip_pts = np.nan_to_num(trace.hip).astype(int)
+        knee_pts = np.nan_to_num(trace.knee).astype(int)
+        ankle_pts = np.nan_to_num(trace.ankle).astype(int)
+        res_txt = "VALID LIFT" if result.valid else "INVALID LIFT"
+        res_col = (0, 255, 0) if result.valid else (0, 0, 255)
+
+        for i, frame in enumerate(frames):
+            canvas = frame.copy()
+
+            # 1. Draw Skeleton + Depth Reference
+            if visible[i]:
+                hip, knee, ankle = tuple(hip_pts[i]), tuple(knee_pts[i]), tuple(ankle_pts[i])
+                ratio = trace.depth_ratio[i]
+                color = (0, 255, 0) if ratio > 0 else (0, 0, 255)
+
+                cv2.line(canvas, hip, knee, (255, 255, 255), 2)
+                cv2.line(canvas, knee, ankle, (255, 255, 255), 2)
+                cv2.line(canvas, (0, knee[1]), (width, knee[1]), (255, 0, 0), 1)
+                cv2.circle(canvas, knee, 6, (255, 0, 0), -1)
+                cv2.circle(canvas, hip, 8, color, -1)
+                if self.show_ratio:
+                    self.sprites.draw_glyphs(canvas, f"{ratio:+.3f}", (hip[0] + 12, hip[1]), 0.6, color, 2)
+
+            # 2. Draw Phase
+            phase = result.phases.get(i, "unknown")
+            self.sprites.draw_text(canvas, f"PHASE: {phase.upper()}", (10, 30), 1,
+                                   PHASE_COLORS.get(phase, (255, 255, 255)), 2)
+
+            # 3. Draw Decision (locked at the deepest frame)
+            if i >= result.bottom_frame_index:
+                self.sprites.draw_text(canvas, res_txt, (10, 70), 1.5, res_col, 3)
+
+            overlay_frames.append(canvas)
+            if (i + 1) % 50 == 0 or (i + 1) == num_frames:
+                print(f"\rOverlay generation: {(i + 1) / num_frames * 100:.1f}%", end="", flush=True)
+
+        return overlay_frames
@@ -0,0 +1,71 @@
+import numpy as np
+from typing import Optional
+from dip_validator.synthetic import (
+    SyntheticClip, motion_profile, finish_keypoints,
+    NOSE, EYES, EARS, SHOULDERS, ELBOWS, WRISTS, HIPS, KNEES, ANKLES
+)
+
+def synthetic_squat(
+    num_frames: Optional[int] = None,
+    reps: int = 1,
+    depth_px: float = 20.0,
+    fps: float = 30.0,
+    noise_px: float = 0.0,
+    dropout: float = 0.0,
+    rep_s: float = 2.5,
+    hold_s: float = 1.0,
+    bottom_hold_s: float = 0.0,
+    thigh: float = 160.0,
+    shin: float = 150.0,
+    width: int = 1280,
+    height: int = 720,
+    seed: int = 0
+) -> SyntheticClip:
+    """
+    Squat filmed from the side (lifter facing +x): ankles fixed, the hip travels down
+    and back from standing until it is depth_px below the knee.
+
+    Args:
+        num_frames: Clip length (reps repeated to fill it); None for `reps` reps.
+        reps: Number of reps when num_frames is None.
+        depth_px: Hip joint below the knee joint at the bottom of every rep
+            (negative: above it); the squat depth_ratio is depth_px / height.
+        fps: Frame rate.
+        noise_px: Standard deviation of Gaussian keypoint noise.
+        dropout: Fraction of frames without a pose.
+        rep_s, hold_s, bottom_hold_s: Rep timing (see dip_validator.synthetic.motion_profile).
+        thigh, shin: Segment lengths in pixels.
+        width, height: Frame size.
+        seed: Random seed for noise and dropouts.
+
+    Returns:
+        SyntheticClip with the bottom frame of every rep.
+    """
+    if abs(depth_px) >= thigh:
+        raise ValueError(f"depth_px must be within +/- thigh ({thigh})")
+    rng = np.random.default_rng(seed)
+    profile, bottoms = motion_profile(num_frames, reps, fps, rep_s, hold_s, bottom_hold_s)
+    n = len(profile)
+
+    ankle = np.broadcast_to(np.array([width * 0.5, height * 0.9]), (n, 2))
+    # Knee ends up over the toes: the shin leans forward as the hip drops
+    shin_angle = np.radians(5 + 35 * profile)
+    knee = ankle + shin * np.stack([np.sin(shin_angle), -np.cos(shin_angle)], axis=1)
+    # Hip height relative to the knee: -thigh (standing) down to depth_px
+    hip_dy = -thigh + (depth_px + thigh) * profile
+    hip = knee + np.stack([-np.sqrt(thigh ** 2 - hip_dy ** 2), hip_dy], axis=1)
+    torso = 1.6 * thigh
+    lean = np.radians(10 + 35 * profile)
+    shoulder = hip + torso * np.stack([np.sin(lean), -np.cos(lean)], axis=1)
+    elbow = shoulder + [-0.1 * thigh, 0.3 * thigh]
+    wrist = shoulder + [0.05 * thigh, 0.05 * thigh]
+    head = shoulder + [0.2 * thigh, -0.4 * thigh]
+
+    keypoints = np.empty((n, 17, 2), dtype=np.float32)
+    keypoints[:, NOSE] = head + [0.12 * thigh, 0.0]
+    for joints, point in ((EYES, head + [0.08 * thigh, -0.04 * thigh]), (EARS, head), (SHOULDERS, shoulder),
+                          (ELBOWS, elbow), (WRISTS, wrist), (HIPS, hip), (KNEES, knee), (ANKLES, ankle)):
+        keypoints[:, joints[0]] = point
+        keypoints[:, joints[1]] = point + [3.0, 0.0]
+    keypoints, confidences = finish_keypoints(keypoints, 0.9, rng, noise_px, dropout, far_conf=0.5)
+    return SyntheticClip(keypoints, confidences, fps, width, height, depth_px, bottoms)
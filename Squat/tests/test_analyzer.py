@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from dip_validator.pose import PoseResult
+from squat_validator.analyzer import SquatAnalyzer, rolling_median
+
+FRAME_HEIGHT = 1000
+
+def make_pose(hip_y, knee_y=500.0, side_conf=(0.9, 0.4)):
+    kp = np.zeros((17, 2))
+    conf = np.zeros(17)
+    # Lateral view: shoulders overlap in x
+    kp[5] = [300, 200]
+    kp[6] = [305, 200]
+    conf[5:7] = 0.9
+    for (hip, knee), c in zip(((11, 13), (12, 14)), side_conf):
+        kp[hip] = [300, hip_y]
+        kp[knee] = [400, knee_y]
+        conf[hip] = c
+        conf[knee] = c
+    return PoseResult(keypoints=kp, confidences=conf, bbox=(0, 0, 10, 10))
+
+def squat_poses(bottom_hip_y, num_frames=41):
+    # Hip travels down to bottom_hip_y at the middle frame and back up
+    t = np.linspace(-1, 1, num_frames)
+    hip_y = 350 + (bottom_hip_y - 350) * (1 - t ** 2)
+    return [make_pose(y) for y in hip_y]
+
+def test_rolling_median_removes_single_frame_spike():
+    values = np.array([0.0, 0.0, 1.0, 0.0, 0.0])
+    filtered = rolling_median(values, window=3)
+    assert np.all(filtered == 0.0)
+
+def test_rolling_median_keeps_gaps():
+    values = np.array([1.0, np.nan, 3.0, 4.0])
+    filtered = rolling_median(values, window=3)
+    assert np.isnan(filtered[1])
+    assert filtered[2] == 3.5
+
+def test_analyze_valid_squat():
+    decision = SquatAnalyzer().analyze(squat_poses(bottom_hip_y=520), FRAME_HEIGHT)
+
+    assert decision.valid is True
+    # The median flattens the peak over the neighbouring frames
+    assert abs(decision.bottom_frame_index - 20) <= 1
+    assert decision.depth_ratio == pytest.approx(0.02, abs=1e-3)
+    assert decision.selected_side == "left"
+    assert decision.phases[20] == "bottom"
+    assert "non_lateral_view" not in decision.warnings
+
+def test_analyze_invalid_squat():
+    decision = SquatAnalyzer().analyze(squat_poses(bottom_hip_y=480), FRAME_HEIGHT)
+
+    assert decision.valid is False
+    assert decision.depth_ratio == pytest.approx(-0.02, abs=1e-3)
+
+def test_analyze_ignores_outlier_frame():
+    # A single noisy frame below the knee must not flip the verdict (ADR-003)
+    poses = squat_poses(bottom_hip_y=480)
+    poses[10] = make_pose(hip_y=560)
+    decision = SquatAnalyzer().analyze(poses, FRAME_HEIGHT)
+
+    assert decision.valid is False
+
+def test_analyze_judges_bottom_phase_only():
+    # Knee mis-detected above the hip for a few frames of the walk-out (long enough for
+    # the median to keep it); the hip signal, and so the bottom, is unaffected
+    poses = [make_pose(hip_y=350, knee_y=300)] * 5 + squat_poses(bottom_hip_y=480)
+    decision = SquatAnalyzer().analyze(poses, FRAME_HEIGHT)
+
+    assert decision.valid is False
+    assert decision.phases[decision.bottom_frame_index] == "bottom"
+    assert abs(decision.bottom_frame_index - 25) <= 1
+
+def test_analyze_side_selection_and_gaps():
+    poses = [make_pose(y, side_conf=(0.2, 0.9)) for y in np.linspace(350, 520, 21)]
+    poses[3] = None
+    decision = SquatAnalyzer().analyze(poses, FRAME_HEIGHT)
+
+    assert decision.selected_side == "right"
+    assert decision.confidence == pytest.approx(0.9)
+    assert np.isnan(decision.trace.depth_ratio[3])
+
+def test_analyze_no_landmarks():
+    decision = SquatAnalyzer().analyze([None] * 10, FRAME_HEIGHT)
+
+    assert decision.valid is False
+    assert "no_landmarks_for_decision" in decision.warnings
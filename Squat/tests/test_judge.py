@@ -0,0 +1,19 @@
+import numpy as np
+from dip_validator.judges import AnalysisContext, load_judges, run_judges, judges_report
+from test_analyzer import squat_poses, FRAME_HEIGHT
+
+CONFIG = {
+    "pose": {"confidence_threshold": 0.3},
+    "phases": {"smoothing_window": 15, "smoothing_polyorder": 2, "bottom_window": 5},
+    "decision": {"min_confidence": 0.3}
+}
+
+def test_squat_judge_plugin_shares_pose_pass():
+    context = AnalysisContext(squat_poses(bottom_hip_y=520), {"height": FRAME_HEIGHT}, CONFIG)
+    judges = load_judges(["squat_depth"], plugins=["squat_validator.judge"])
+    verdicts = run_judges(judges, context)
+
+    assert verdicts["squat_depth"].valid is True
+    report = judges_report(judges, verdicts, context)
+    assert report["squat_depth"]["result"] == "VALID"
+    assert report["squat_depth"]["keypoint_coverage"] == 1.0
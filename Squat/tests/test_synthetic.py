@@ -0,0 +1,26 @@
+import timeit
+import numpy as np
+import pytest
+from squat_validator.synthetic import synthetic_squat
+from squat_validator.analyzer import SquatAnalyzer
+
+@pytest.mark.parametrize("depth_px", [-20.0, -8.0, 8.0, 20.0])
+def test_verdict_matches_generated_depth(depth_px):
+    clip = synthetic_squat(reps=3, depth_px=depth_px, noise_px=1.0, dropout=0.05, seed=2)
+    decision = SquatAnalyzer().analyze(clip.poses(), clip.height)
+
+    assert decision.valid == (depth_px > 0)
+    assert decision.depth_ratio * clip.height == pytest.approx(depth_px, abs=3.0)
+    assert np.min(np.abs(clip.bottom_frames - decision.bottom_frame_index)) <= 5
+    assert "non_lateral_view" not in decision.warnings
+
+@pytest.mark.slow
+def test_decide_time_is_linear():
+    analyzer = SquatAnalyzer()
+    costs = []
+    for num_frames in (8000, 80000):
+        clip = synthetic_squat(num_frames=num_frames, noise_px=1.0, dropout=0.02)
+        timer = timeit.Timer(lambda: analyzer.decide(clip.keypoints, clip.confidences, clip.height,
+                                                     int(clip.bottom_frames[0]), {}))
+        costs.append(min(timer.repeat(repeat=5, number=1)))
+    assert costs[1] / costs[0] < 40.0  # 10x the frames